@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of moon skips, patrols and saving, with a small, a medium and a huge Clan.
+
+Each fixture Clan is generated from a fixed seed, so two runs on the same commit do the same work. The Clans are
+created in the saves folder and deleted again afterwards. No display is needed.
+
+Examples:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --fixtures small medium --output new.json
+    python benchmarks/run_benchmarks.py --compare old.json --tolerance 0.25
+
+With --compare, the exit code is 1 if any benchmark got slower by more than the tolerance, so it can be used to
+check for regressions.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# has to be set before pygame is imported, so no display is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(directory)
+sys.path.insert(0, directory)
+
+from scripts.housekeeping.datadir import setup_data_dir  # pylint: disable=wrong-import-position
+
+# name: (number of cats, moons to skip, patrols to send out)
+FIXTURES = {
+    "small": (15, 20, 20),
+    "medium": (100, 20, 20),
+    "huge": (300, 10, 20),
+}
+
+
+def run_fixture(fixture: str, seed: int) -> dict:
+    """Runs all benchmarks with one fixture Clan. Returns the seconds each benchmark took."""
+    from scripts.game_structure.game_essentials import game
+    from scripts.housekeeping import simulation
+
+    size, moons, patrols = FIXTURES[fixture]
+    name = f"Benchmark{fixture.capitalize()}"
+    clan_list = game.read_clans()
+    current_clan = clan_list[0] if clan_list else None
+
+    random.seed(seed)
+    results = {}
+    simulation.generate_clan(name, size)
+    try:
+        # patrols go first, after some moons there may be no cats left who can patrol
+        # the first patrol reads the patrol files, it's not part of the benchmark
+        patrol_times = simulation.run_patrols(patrols + 1)[1:]
+        results["patrol"] = sum(patrol_times) / len(patrol_times) if patrol_times else None
+        moon_times = simulation.run_moons(moons)
+        results["moon_skip"] = sum(moon_times) / len(moon_times)
+        results["save"] = simulation.time_call(simulation.save_clan)
+        results["load"] = simulation.time_call(simulation.load_clan, name)
+    finally:
+        simulation.remove_clan(name, current_clan)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Returns a line for each benchmark which got slower than the baseline by more than the tolerance."""
+    regressions = []
+    for fixture, benchmarks in results.items():
+        for benchmark, seconds in benchmarks.items():
+            old = baseline.get(fixture, {}).get(benchmark)
+            if not old or seconds is None:
+                continue
+            if seconds > old * (1 + tolerance):
+                regressions.append(f"{fixture} {benchmark}: {old * 1000:.1f} ms -> {seconds * 1000:.1f} ms "
+                                   f"(+{(seconds / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of moon skips, patrols and saving.")
+    parser.add_argument("--fixtures", nargs="+", choices=tuple(FIXTURES), default=list(FIXTURES),
+                        help="fixture Clans to run the benchmarks with")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the random numbers")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="JSON file of an older run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="how much slower than the older run a benchmark may be, 0.2 is 20%%")
+    args = parser.parse_args()
+
+    setup_data_dir()
+    import ujson
+    from scripts.cat.sprites import sprites
+    sprites.load_all()
+
+    results = {}
+    for fixture in args.fixtures:
+        start = time.perf_counter()
+        results[fixture] = run_fixture(fixture, args.seed)
+        print(f"{fixture} done in {time.perf_counter() - start:.1f} s")
+
+    print()
+    print(f"{'fixture':<10}{'benchmark':<12}{'ms':>12}")
+    for fixture, benchmarks in results.items():
+        for benchmark, seconds in benchmarks.items():
+            print(f"{fixture:<10}{benchmark:<12}{'-' if seconds is None else f'{seconds * 1000:.1f}':>12}")
+
+    if args.output:
+        with open(args.output, 'w') as write_file:
+            write_file.write(ujson.dumps(results, indent=4))
+
+    if args.compare:
+        with open(args.compare, 'r') as read_file:
+            regressions = compare(results, ujson.loads(read_file.read()), args.tolerance)
+        if regressions:
+            print("\nSlower than before:")
+            print("\n".join(regressions))
+            sys.exit(1)
+        print("\nNo benchmark got slower.")
+
+
+if __name__ == "__main__":
+    main()
@@ -217,6 +217,8 @@ def loading_animation():
         im.blit(color, (0,0), special_flags=pygame.BLEND_RGBA_MULT)
         images.append(im)
         
+    bar_color = color.get_at((0, 0))
+
     #Cleanup
     del im
     del color
@@ -235,6 +237,14 @@ def loading_animation():
             screen.fill(game.config["theme"]["light_mode_background"])
         
         screen.blit(images[i], (x - images[i].get_width() / 2 , y - images[i].get_height() / 2))
+
+        # progress bar below the animation, once the cats are being loaded
+        if game.loading_progress is not None:
+            bar_width = 200
+            bar_rect = pygame.Rect(x - bar_width / 2, y + images[i].get_height() / 2 + 20, bar_width, 8)
+            pygame.draw.rect(screen, bar_color, bar_rect, width=1)
+            bar_rect.width = round(bar_width * min(game.loading_progress, 1))
+            pygame.draw.rect(screen, bar_color, bar_rect)
         
         i += 1
         if i >= total_frames:
@@ -0,0 +1,212 @@
+"""
+Live indexes of the cats in Cat.all_cats, by where they are and by status.
+
+Every cat is in exactly one group:
+ - CLAN: living cats of the Clan
+ - OUTSIDE: living cats outside the Clan, lost and exiled cats included
+ - STARCLAN, DARK_FOREST and UNKNOWN_RESIDENCE: dead cats
+The living Clan cats are also indexed by their status.
+
+Cat.all_cats and the setters of Cat.dead, outside, exiled, df and status keep the indexes up to date, so finding
+the cats of a group doesn't need to look at all cats. Each group is a CatPool, a list with the position of each cat
+in it. A cat is taken out by moving the last cat into its place, so the order of the cats isn't kept, but adding,
+removing and picking a random cat don't depend on the number of cats.
+"""
+from random import randrange
+from typing import Dict, List, Optional
+
+CLAN = "clan"
+OUTSIDE = "outside"
+STARCLAN = "starclan"
+DARK_FOREST = "dark_forest"
+UNKNOWN_RESIDENCE = "unknown_residence"
+GROUPS = (CLAN, OUTSIDE, STARCLAN, DARK_FOREST, UNKNOWN_RESIDENCE)
+
+
+def get_group(cat) -> str:
+    """Returns the group the cat belongs in. Dead cats are sorted the same way as for their thoughts."""
+    if not cat.dead:
+        return OUTSIDE if cat.outside or cat.exiled else CLAN
+    if cat.df:
+        return DARK_FOREST
+    if cat.outside:
+        return UNKNOWN_RESIDENCE
+    return STARCLAN
+
+
+class CatPool():
+    """A list of cats, where cats can be added, removed and picked at random in constant time."""
+
+    def __init__(self):
+        self.cats = []
+        # ID: position in self.cats
+        self.positions: Dict[str, int] = {}
+
+    def add(self, cat):
+        if cat.ID in self.positions:
+            return
+        self.positions[cat.ID] = len(self.cats)
+        self.cats.append(cat)
+
+    def remove(self, cat_id: str):
+        position = self.positions.pop(cat_id, None)
+        if position is None:
+            return
+        last_cat = self.cats.pop()
+        if position < len(self.cats):
+            self.cats[position] = last_cat
+            self.positions[last_cat.ID] = position
+
+    def clear(self):
+        self.cats.clear()
+        self.positions.clear()
+
+    def __len__(self):
+        return len(self.cats)
+
+    def __iter__(self):
+        return iter(self.cats)
+
+    def __contains__(self, cat):
+        position = self.positions.get(cat.ID)
+        return position is not None and self.cats[position] is cat
+
+
+class CatIndex():
+
+    def __init__(self):
+        self.groups: Dict[str, CatPool] = {group: CatPool() for group in GROUPS}
+        # living Clan cats by status
+        self.by_status: Dict[str, CatPool] = {}
+        # ID: (group, status) of the cats in the index, the status is None outside the Clan
+        self._placed = {}
+
+    def update(self, cat):
+        """Moves the cat into the group and status it belongs in now."""
+        group = get_group(cat)
+        placed = (group, cat.status if group == CLAN else None)
+        old_placed = self._placed.get(cat.ID)
+        if old_placed == placed:
+            return
+        if old_placed:
+            self._take_out(cat.ID, old_placed)
+
+        self.groups[group].add(cat)
+        if placed[1] is not None:
+            self.by_status.setdefault(placed[1], CatPool()).add(cat)
+        self._placed[cat.ID] = placed
+
+    def remove(self, cat_id: str):
+        """Takes the cat out of the index."""
+        placed = self._placed.pop(cat_id, None)
+        if placed:
+            self._take_out(cat_id, placed)
+
+    def _take_out(self, cat_id: str, placed: tuple):
+        group, status = placed
+        self.groups[group].remove(cat_id)
+        if status is not None:
+            self.by_status[status].remove(cat_id)
+
+    def clear(self):
+        for cats in self.groups.values():
+            cats.clear()
+        self.by_status.clear()
+        self._placed.clear()
+
+    def cats(self, group: str) -> CatPool:
+        """Returns the cats of the group. This is the pool itself, make a list of it before changing any cat in it."""
+        return self.groups[group]
+
+    def count(self, group: str) -> int:
+        return len(self.groups[group])
+
+    def with_status(self, *statuses: str) -> List:
+        """Returns the living Clan cats which have one of the statuses."""
+        found = []
+        for status in statuses:
+            if status in self.by_status:
+                found.extend(self.by_status[status])
+        return found
+
+    def sample(self, *groups: str, exclude=None) -> Optional[object]:
+        """Returns a random cat of the groups, or None if there is none. If exclude is a cat, it's never picked.
+        All cats have the same chance, and it takes the same time however many cats there are."""
+        pools = [self.groups[group] for group in groups]
+        total = sum(len(pool) for pool in pools)
+
+        # the position of the excluded cat in all pools one after another
+        excluded_at = None
+        if exclude is not None:
+            offset = 0
+            for pool in pools:
+                if exclude in pool:
+                    excluded_at = offset + pool.positions[exclude.ID]
+                    total -= 1
+                    break
+                offset += len(pool)
+        if total <= 0:
+            return None
+
+        # pick from all positions but the excluded one, by skipping over it
+        position = randrange(total)
+        if excluded_at is not None and position >= excluded_at:
+            position += 1
+        for pool in pools:
+            if position < len(pool):
+                return pool.cats[position]
+            position -= len(pool)
+        return None
+
+
+class IndexedCatDict(dict):
+    """The dict used for Cat.all_cats. Adds and removes the cats in the index and the family graph along with the
+    dict."""
+
+    def __init__(self, index: CatIndex, family_graph=None):
+        super().__init__()
+        self.index = index
+        self.family_graph = family_graph
+
+    def __setitem__(self, cat_id, cat):
+        old_cat = self.get(cat_id)
+        if old_cat is not None and old_cat is not cat:
+            self.index.remove(cat_id)
+        super().__setitem__(cat_id, cat)
+        self.index.update(cat)
+        if self.family_graph is not None:
+            self.family_graph.update(cat)
+
+    def __delitem__(self, cat_id):
+        super().__delitem__(cat_id)
+        self._remove(cat_id)
+
+    def _remove(self, cat_id):
+        self.index.remove(cat_id)
+        if self.family_graph is not None:
+            self.family_graph.remove(cat_id)
+
+    def pop(self, cat_id, *default):
+        if cat_id in self:
+            self._remove(cat_id)
+        return super().pop(cat_id, *default)
+
+    def popitem(self):
+        cat_id, cat = super().popitem()
+        self._remove(cat_id)
+        return cat_id, cat
+
+    def setdefault(self, cat_id, cat=None):
+        if cat_id not in self:
+            self[cat_id] = cat
+        return self[cat_id]
+
+    def update(self, *args, **kwargs):
+        for cat_id, cat in dict(*args, **kwargs).items():
+            self[cat_id] = cat
+
+    def clear(self):
+        super().clear()
+        self.index.clear()
+        if self.family_graph is not None:
+            self.family_graph.clear()
@@ -5,6 +5,7 @@ import os.path
 import itertools
 import sys
 
+from .cat_index import CatIndex, IndexedCatDict, CLAN, OUTSIDE, GROUPS
 from .history import History
 from .skills import CatSkills
 from ..housekeeping.datadir import get_save_dir
@@ -18,13 +19,14 @@ from scripts.conditions import Illness, Injury, PermanentCondition, get_amount_c
     medical_cats_condition_fulfilled
 import bisect
 
-from scripts.utility import get_med_cats, get_personality_compatibility, event_text_adjust, update_sprite, \
+from scripts.utility import get_med_cats, get_personality_compatibility, event_text_adjust, generate_sprite, \
     leader_ceremony_text_adjust
 from scripts.game_structure.game_essentials import game, screen
 from scripts.cat_relations.relationship import Relationship
 from scripts.game_structure import image_cache
 from scripts.event_class import Single_Event
 from .thoughts import Thoughts
+from scripts.cat_relations.family_graph import FamilyGraph
 from scripts.cat_relations.inheritance import Inheritance
 
 
@@ -102,7 +104,11 @@ class Cat():
         }
     ]
 
-    all_cats: Dict[str, Cat] = {}  # ID: object
+    # live indexes of the cats by group and status, see cat_index.py
+    index = CatIndex()
+    # parent -> child edges, see family_graph.py
+    family_graph = FamilyGraph()
+    all_cats: Dict[str, Cat] = IndexedCatDict(index, family_graph)  # ID: object
     outside_cats: Dict[str, Cat] = {}  # cats outside the clan
     id_iter = itertools.count()
 
@@ -188,6 +194,8 @@ class Cat():
         self.apprentice = []
         self.former_apprentices = []
         self.relationships = {}
+        # set when a relationship of this cat changes, so only changed relationships are saved again
+        self.relationships_changed = True
         self.mate = []
         self.previous_mates = []
         self.pronouns = [self.default_pronouns[0].copy()]
@@ -374,7 +382,7 @@ class Cat():
             self.name = Name(status, prefix, suffix, eyes=self.pelt.eye_colour, specsuffix_hidden=self.specsuffix_hidden,
                              load_existing_name = loading_cat)
 
-        # Private Sprite
+        # Private Sprite, only used for faded cats. The sprites of all other cats are generated when needed.
         self._sprite = None
 
         # SAVE CAT INTO ALL_CATS DICTIONARY IN CATS-CLASS
@@ -409,6 +417,105 @@ class Cat():
             print(f"Mentor ID {mentor_id} of type {type(mentor_id)} isn't valid :("
                   "\nCat.mentor has to be either None (no mentor) or the mentor's ID as a string.")
 
+    # The state which decides the group of the cat in Cat.index. Changing it moves the cat to its new group.
+    @property
+    def dead(self) -> bool:
+        return self._dead
+
+    @dead.setter
+    def dead(self, dead: bool):
+        self._dead = dead
+        self._update_index()
+
+    @property
+    def outside(self) -> bool:
+        return self._outside
+
+    @outside.setter
+    def outside(self, outside: bool):
+        self._outside = outside
+        self._update_index()
+
+    @property
+    def exiled(self) -> bool:
+        return self._exiled
+
+    @exiled.setter
+    def exiled(self, exiled: bool):
+        self._exiled = exiled
+        self._update_index()
+
+    @property
+    def df(self) -> bool:
+        return self._df
+
+    @df.setter
+    def df(self, df: bool):
+        self._df = df
+        self._update_index()
+
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @status.setter
+    def status(self, status: str):
+        self._status = status
+        self._update_index()
+
+    def _update_index(self):
+        # cats are only indexed once they're in all_cats, which is the last thing done when they're created
+        if Cat.all_cats.get(getattr(self, "ID", None)) is self:
+            Cat.index.update(self)
+
+    # The parents of the cat, as edges in Cat.family_graph. Changing them moves the edges.
+    @property
+    def parent1(self):
+        return self._parent1
+
+    @parent1.setter
+    def parent1(self, parent1):
+        self._parent1 = parent1
+        self.update_family_graph()
+
+    @property
+    def parent2(self):
+        return self._parent2
+
+    @parent2.setter
+    def parent2(self, parent2):
+        self._parent2 = parent2
+        self.update_family_graph()
+
+    @property
+    def adoptive_parents(self) -> list:
+        return self._adoptive_parents
+
+    @adoptive_parents.setter
+    def adoptive_parents(self, adoptive_parents: list):
+        self._adoptive_parents = adoptive_parents
+        self.update_family_graph()
+
+    def update_family_graph(self):
+        """Reads the parents of the cat into Cat.family_graph again.
+        Needed after adoptive_parents was changed in place, the setters cover everything else."""
+        if Cat.all_cats.get(getattr(self, "ID", None)) is self:
+            Cat.family_graph.update(self)
+
+    @property
+    def inheritance(self) -> Inheritance:
+        """The inheritance of the cat. It's only worked out the first time it's needed, and again when the family
+        graph changed since then."""
+        if self._inheritance is None:
+            self._inheritance = Inheritance(self)
+        elif not self._inheritance.is_current():
+            self._inheritance.update_inheritance()
+        return self._inheritance
+
+    @inheritance.setter
+    def inheritance(self, inheritance: Inheritance):
+        self._inheritance = inheritance
+
     def is_alive(self):
         return not self.dead
 
@@ -889,10 +996,14 @@ class Cat():
             print('WARNING: History failed to load, no Clan in game.switches?')
             return
 
-        history_directory = get_save_dir() + '/' + clanname + '/history/'
-        cat_history_directory = history_directory + self.ID + '_history.json'
+        try:
+            history_data = game.get_clan_storage(clanname).read("history", self.ID)
+        except Exception:
+            self.history = None
+            print(f'WARNING: There was an error reading the history file of cat #{self}.')
+            return
 
-        if not os.path.exists(cat_history_directory):
+        if history_data is None:
             self.history = History(
                 beginning={},
                 mentor_influence={},
@@ -903,48 +1014,27 @@ class Cat():
                 scar_events=[],
                 murder={},
             )
+            game.history_store.loaded(self, None)
             return
         try:
-            with open(cat_history_directory, 'r') as read_file:
-                history_data = ujson.loads(read_file.read())
-                self.history = History(
-                    beginning=history_data["beginning"] if "beginning" in history_data else {},
-                    mentor_influence=history_data[
-                        'mentor_influence'] if "mentor_influence" in history_data else {},
-                    app_ceremony=history_data['app_ceremony'] if "app_ceremony" in history_data else {},
-                    lead_ceremony=history_data['lead_ceremony'] if "lead_ceremony" in history_data else None,
-                    possible_history=history_data['possible_history'] if "possible_history" in history_data else {},
-                    died_by=history_data['died_by'] if "died_by" in history_data else [],
-                    scar_events=history_data['scar_events'] if "scar_events" in history_data else [],
-                    murder=history_data['murder'] if "murder" in history_data else {},
-                )
+            self.history = History(
+                beginning=history_data["beginning"] if "beginning" in history_data else {},
+                mentor_influence=history_data[
+                    'mentor_influence'] if "mentor_influence" in history_data else {},
+                app_ceremony=history_data['app_ceremony'] if "app_ceremony" in history_data else {},
+                lead_ceremony=history_data['lead_ceremony'] if "lead_ceremony" in history_data else None,
+                possible_history=history_data['possible_history'] if "possible_history" in history_data else {},
+                died_by=history_data['died_by'] if "died_by" in history_data else [],
+                scar_events=history_data['scar_events'] if "scar_events" in history_data else [],
+                murder=history_data['murder'] if "murder" in history_data else {},
+            )
+            game.history_store.loaded(self, history_data)
         except:
             self.history = None
             print(f'WARNING: There was an error reading the history file of cat #{self} or their history file was '
                   f'empty. Default history info was given. Close game without saving if you have save information '
                   f'you\'d like to preserve!')
 
-    def save_history(self, history_dir):
-        if not os.path.exists(history_dir):
-            os.makedirs(history_dir)
-
-        history_dict = History.make_dict(self)
-        try:
-            game.safe_save(history_dir + '/' + self.ID + '_history.json', history_dict)
-        except:
-            self.history = History(
-                beginning={},
-                mentor_influence={},
-                app_ceremony={},
-                lead_ceremony=None,
-                possible_history={},
-                died_by=[],
-                scar_events=[],
-                murder={},
-            )
-
-            print(f"WARNING: saving history of cat #{self.ID} didn't work")
-
     def generate_lead_ceremony(self):
         """
         here we create a leader ceremony and add it to the history
@@ -1287,8 +1377,6 @@ class Cat():
 
     def thoughts(self):
         """ Generates a thought for the cat, which displays on their profile. """
-        all_cats = self.all_cats
-        other_cat = choice(list(all_cats.keys()))
         game_mode = game.switches['game_mode']
         biome = game.switches['biome']
         camp = game.switches['camp_bg']
@@ -1311,38 +1399,20 @@ class Cat():
         elif not self.dead and self.outside:
             where_kitty = 'outside'
         # get other cat
-        i = 0
+        # the cats are picked from the pools of Cat.index, without making a list of all cats for each try
+        other_cat = None
         # for cats inside the clan
         if where_kitty == 'inside':
-            while other_cat == self.ID and len(all_cats) > 1 \
-                    or (all_cats.get(other_cat).dead and dead_chance != 1) \
-                    or (other_cat not in self.relationships):
-                other_cat = choice(list(all_cats.keys()))
-                i += 1
-                if i > 100:
-                    other_cat = None
-                    break
+            # dead cats are only thought about if the dead chance hits
+            groups = GROUPS if dead_chance == 1 else (CLAN, OUTSIDE)
+            other_cat = self.sample_cat_with_relationship(groups)
         # for dead cats
         elif where_kitty in ['starclan', 'hell', 'UR']:
-            while other_cat == self.ID and len(all_cats) > 1:
-                other_cat = choice(list(all_cats.keys()))
-                i += 1
-                if i > 100:
-                    other_cat = None
-                    break
+            other_cat = Cat.index.sample(*GROUPS, exclude=self)
         # for cats currently outside
         # it appears as for now, kittypets and loners can only think about outsider cats
         elif where_kitty == 'outside':
-            while other_cat == self.ID and len(all_cats) > 1 \
-                    or (other_cat not in self.relationships):
-                '''or (self.status in ['kittypet', 'loner'] and not all_cats.get(other_cat).outside):'''
-                other_cat = choice(list(all_cats.keys()))
-                i += 1
-                if i > 100:
-                    other_cat = None
-                    break
-
-        other_cat = all_cats.get(other_cat)
+            other_cat = self.sample_cat_with_relationship(GROUPS)
 
         # get chosen thought
         chosen_thought = Thoughts.get_chosen_thought(self, other_cat, game_mode, biome, season, camp)
@@ -1352,15 +1422,24 @@ class Cat():
         # insert thought
         self.thought = str(chosen_thought)
 
+    def sample_cat_with_relationship(self, groups, tries: int = 100):
+        """Returns a random cat of the groups which this cat has a relationship with, or None if none was found
+        within the given number of tries."""
+        for _ in range(tries):
+            other_cat = Cat.index.sample(*groups, exclude=self)
+            if other_cat is None:
+                return None
+            if other_cat.ID in self.relationships:
+                return other_cat
+        return None
+
     def relationship_interaction(self):
         """Randomly choose a cat of the Clan and have a interaction with them."""
-        cats_to_choose = [iter_cat for iter_cat in Cat.all_cats.values() if iter_cat.ID != self.ID and \
-                          not iter_cat.outside and not iter_cat.exiled and not iter_cat.dead]
+        chosen_cat = Cat.index.sample(CLAN, exclude=self)
         # if there are not cats to interact, stop
-        if len(cats_to_choose) < 1:
+        if chosen_cat is None:
             return
 
-        chosen_cat = choice(cats_to_choose)
         if chosen_cat.ID not in self.relationships:
             self.create_one_relationship(chosen_cat)
         relevant_relationship = self.relationships[chosen_cat.ID]
@@ -1564,8 +1643,8 @@ class Cat():
         if not self.inheritance:
             self.inheritance = Inheritance(self)
         if cousin_allowed:
-            return other_cat.ID in self.inheritance.all_but_cousins
-        return other_cat.ID in self.inheritance.all_involved
+            return other_cat.ID in self.inheritance.but_cousins_ids
+        return other_cat.ID in self.inheritance.involved_ids
 
     def get_relatives(self, cousin_allowed=True) -> list:
         """Returns a list of ids of all nearly related ancestors."""
@@ -1611,7 +1690,7 @@ class Cat():
 
         amount_per_med = get_amount_cat_for_one_medic(game.clan)
 
-        if medical_cats_condition_fulfilled(Cat.all_cats.values(), amount_per_med):
+        if medical_cats_condition_fulfilled(None, amount_per_med):
             duration = med_duration
         if severity != 'minor':
             duration += randrange(-1, 1)
@@ -1677,7 +1756,7 @@ class Cat():
         else:
             injury_severity = severity
 
-        if medical_cats_condition_fulfilled(Cat.all_cats.values(), get_amount_cat_for_one_medic(game.clan)):
+        if medical_cats_condition_fulfilled(None, get_amount_cat_for_one_medic(game.clan)):
             duration = med_duration
         if severity != 'minor':
             duration += randrange(-1, 1)
@@ -1923,23 +2002,10 @@ class Cat():
                 game.cur_events_list.append(Single_Event(text, "health", [self.ID, cat.ID]))
                 self.get_ill(illness_name)
 
-    def save_condition(self):
-        # save conditions for each cat
-        clanname = None
-        if game.switches['clan_name'] != '':
-            clanname = game.switches['clan_name']
-        elif len(game.switches['clan_name']) > 0:
-            clanname = game.switches['clan_list'][0]
-        elif game.clan is not None:
-            clanname = game.clan.name
-
-        condition_directory = get_save_dir() + '/' + clanname + '/conditions'
-        condition_file_path = condition_directory + '/' + self.ID + '_conditions.json'
-
+    def get_condition_save_dict(self):
+        """Returns the conditions of the cat to save them, or None if the cat has none which need to be saved."""
         if (not self.is_ill() and not self.is_injured() and not self.is_disabled()) or self.dead or self.outside:
-            if os.path.exists(condition_file_path):
-                os.remove(condition_file_path)
-            return
+            return None
 
         conditions = {}
 
@@ -1952,7 +2018,7 @@ class Cat():
         if self.is_disabled():
             conditions["permanent conditions"] = self.permanent_condition
 
-        game.safe_save(condition_file_path, conditions)
+        return conditions
 
     def load_conditions(self):
         if game.switches['clan_name'] != '':
@@ -1960,17 +2026,14 @@ class Cat():
         else:
             clanname = game.switches['clan_list'][0]
 
-        condition_directory = get_save_dir() + '/' + clanname + '/conditions/'
-        condition_cat_directory = condition_directory + self.ID + '_conditions.json'
-        if not os.path.exists(condition_cat_directory):
-            return
-
         try:
-            with open(condition_cat_directory, 'r') as read_file:
-                rel_data = ujson.loads(read_file.read())
-                self.illnesses = rel_data.get("illnesses", {})
-                self.injuries = rel_data.get("injuries", {})
-                self.permanent_condition = rel_data.get("permanent conditions", {})
+            rel_data = game.get_clan_storage(clanname).read("conditions", self.ID)
+            if rel_data is None:
+                return
+
+            self.illnesses = rel_data.get("illnesses", {})
+            self.injuries = rel_data.get("injuries", {})
+            self.permanent_condition = rel_data.get("permanent conditions", {})
 
             if "paralyzed" in self.permanent_condition and not self.pelt.paralyzed:
                 self.pelt.paralyzed = True
@@ -2193,10 +2256,12 @@ class Cat():
         if self.ID not in other_cat.previous_mates:
             other_cat.previous_mates.append(self.ID)
 
-        if other_cat.inheritance:
-            other_cat.inheritance.update_all_mates()
-        if self.inheritance:
-            self.inheritance.update_all_mates()
+        for mate_cat in (other_cat, self):
+            if mate_cat._inheritance:
+                mate_cat._inheritance.update_all_mates()
+            else:
+                # not worked out yet, but the inheritances of other cats might list the cat
+                Inheritance.update_inheritances_involving(mate_cat.ID)
 
     def set_mate(self, other_cat: Cat):
         """Sets up a mate relationship between self and other_cat."""
@@ -2211,10 +2276,12 @@ class Cat():
         if self.ID in other_cat.previous_mates:
             other_cat.previous_mates.remove(self.ID)
 
-        if other_cat.inheritance:
-            other_cat.inheritance.update_all_mates()
-        if self.inheritance:
-            self.inheritance.update_all_mates()
+        for mate_cat in (other_cat, self):
+            if mate_cat._inheritance:
+                mate_cat._inheritance.update_all_mates()
+            else:
+                # not worked out yet, but the inheritances of other cats might list the cat
+                Inheritance.update_inheritances_involving(mate_cat.ID)
 
         # Set starting relationship values
         if not self.dead:
@@ -2358,9 +2425,8 @@ class Cat():
                                    trust=trust)
                 self.relationships[the_cat.ID] = rel
 
-    def save_relationship_of_cat(self, relationship_dir):
-        # save relationships for each cat
-
+    def get_relationship_save_list(self):
+        """Returns the relationships of the cat in the format they are saved in."""
         rel = []
         for r in self.relationships.values():
             r_data = {
@@ -2375,11 +2441,11 @@ class Cat():
                 "comfortable": r.comfortable,
                 "jealousy": r.jealousy,
                 "trust": r.trust,
-                "log": r.log
+                "log": r.log.get_save_list()
             }
             rel.append(r_data)
 
-        game.safe_save(f"{relationship_dir}/{self.ID}_relations.json", rel)
+        return rel
 
     def load_relationship_of_cat(self):
         if game.switches['clan_name'] != '':
@@ -2387,37 +2453,41 @@ class Cat():
         else:
             clanname = game.switches['clan_list'][0]
 
-        relation_directory = get_save_dir() + '/' + clanname + '/relationships/'
-        relation_cat_directory = relation_directory + self.ID + '_relations.json'
+        storage = game.get_clan_storage(clanname)
 
         self.relationships = {}
-        if os.path.exists(relation_directory):
-            if not os.path.exists(relation_cat_directory):
+        if storage.has_kind("relationships"):
+            try:
+                rel_data = storage.read("relationships", self.ID)
+            except Exception:
+                print(f'WARNING: There was an error reading the relationship file of cat #{self}.')
+                return
+            if rel_data is None:
                 self.init_all_relationships()
                 for cat in Cat.all_cats.values():
                     cat.create_one_relationship(self)
                 return
             try:
-                with open(relation_cat_directory, 'r') as read_file:
-                    rel_data = ujson.loads(read_file.read())
-                    for rel in rel_data:
-                        cat_to = self.all_cats.get(rel['cat_to_id'])
-                        if cat_to is None or rel['cat_to_id'] == self.ID:
-                            continue
-                        new_rel = Relationship(
-                            cat_from=self,
-                            cat_to=cat_to,
-                            mates=rel['mates'] if rel['mates'] else False,
-                            family=rel['family'] if rel['family'] else False,
-                            romantic_love=rel['romantic_love'] if rel['romantic_love'] else 0,
-                            platonic_like=rel['platonic_like'] if rel['platonic_like'] else 0,
-                            dislike=rel['dislike'] if rel['dislike'] else 0,
-                            admiration=rel['admiration'] if rel['admiration'] else 0,
-                            comfortable=rel['comfortable'] if rel['comfortable'] else 0,
-                            jealousy=rel['jealousy'] if rel['jealousy'] else 0,
-                            trust=rel['trust'] if rel['trust'] else 0,
-                            log=rel['log'])
-                        self.relationships[rel['cat_to_id']] = new_rel
+                for rel in rel_data:
+                    cat_to = self.all_cats.get(rel['cat_to_id'])
+                    if cat_to is None or rel['cat_to_id'] == self.ID:
+                        continue
+                    new_rel = Relationship(
+                        cat_from=self,
+                        cat_to=cat_to,
+                        mates=rel['mates'] if rel['mates'] else False,
+                        family=rel['family'] if rel['family'] else False,
+                        romantic_love=rel['romantic_love'] if rel['romantic_love'] else 0,
+                        platonic_like=rel['platonic_like'] if rel['platonic_like'] else 0,
+                        dislike=rel['dislike'] if rel['dislike'] else 0,
+                        admiration=rel['admiration'] if rel['admiration'] else 0,
+                        comfortable=rel['comfortable'] if rel['comfortable'] else 0,
+                        jealousy=rel['jealousy'] if rel['jealousy'] else 0,
+                        trust=rel['trust'] if rel['trust'] else 0,
+                        log=rel['log'])
+                    self.relationships[rel['cat_to_id']] = new_rel
+                # the relationships are the same as the saved ones, unless old log entries were taken out
+                self.relationships_changed = any(rel.log.spilled for rel in self.relationships.values())
             except:
                 print(f'WARNING: There was an error reading the relationship file of cat #{self}.')
 
@@ -2866,9 +2936,12 @@ class Cat():
         
     @property
     def sprite(self):
-        # Update the sprite
-        update_sprite(self)
-        return self._sprite
+        """The sprite is only put together when it's shown. It isn't kept on the cat: generate_sprite returns
+        the cached sprite as long as nothing which changes the look of the cat changed, and puts it together
+        again otherwise. Faded cats keep their silhouette."""
+        if self.faded:
+            return self._sprite
+        return generate_sprite(self)
 
     @sprite.setter
     def sprite(self, new_sprite):
@@ -129,6 +129,8 @@ class History:
         """
         if not cat.history:
             cat.load_history()
+        else:
+            game.history_store.touch(cat)
 
     @staticmethod
     def make_dict(cat):
@@ -0,0 +1,68 @@
+"""
+The histories of the cats which are kept in memory.
+
+The history of a cat is read from the save the first time it's needed, see History.check_load. It used to be thrown
+away with every save, so the next profile or event which needed it had to read it again. Now the store keeps the
+loaded histories, the most recently used last, and only remembers how each one looked when it was read or saved.
+
+Changed histories stay in memory until the next save, which writes all of them at once. Histories which didn't
+change aren't written again. After the save, the least recently used histories are thrown away if there are more
+than "history_cache_size" (save_load section of game_config.json). They are read again when they are needed.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import ujson
+
+
+class HistoryStore():
+
+    def __init__(self):
+        # cat ID: the cat, for the cats whose history is loaded, the most recently used last
+        self._cats = OrderedDict()
+        # cat ID: the history as it is in the save, as JSON text. None if the cat has no saved history.
+        self._saved_texts: Dict[str, Optional[str]] = {}
+
+    def loaded(self, cat, history_data):
+        """Keeps the history the cat just read. history_data is what was read from the save, None if nothing."""
+        self._saved_texts[cat.ID] = ujson.dumps(history_data) if history_data is not None else None
+        self.touch(cat)
+
+    def touch(self, cat):
+        """Marks the history of the cat as the most recently used one."""
+        self._cats[cat.ID] = cat
+        self._cats.move_to_end(cat.ID)
+
+    def is_changed(self, cat, history_data: dict) -> bool:
+        """Returns True if history_data, the save dict of the history of the cat, isn't what is in the save."""
+        return self._saved_texts.get(cat.ID) != ujson.dumps(history_data)
+
+    def saved(self, cat, history_data: dict):
+        """Remembers that history_data, the save dict of the history of the cat, was saved."""
+        self._saved_texts[cat.ID] = ujson.dumps(history_data)
+        self.touch(cat)
+
+    def evict(self, all_cats: dict, cache_size: int):
+        """Throws away the least recently used histories which didn't change, until at most cache_size are left.
+        The histories of cats which are gone, e.g. faded cats, are always thrown away."""
+        for cat_id, cat in list(self._cats.items()):
+            if all_cats.get(cat_id) is not cat or cat.history is None:
+                self._forget(cat_id)
+
+        for cat_id, cat in list(self._cats.items()):
+            if len(self._cats) <= cache_size:
+                break
+            if not self.is_changed(cat, cat.history.make_dict(cat)):
+                cat.history = None
+                self._forget(cat_id)
+
+    def _forget(self, cat_id: str):
+        self._cats.pop(cat_id, None)
+        self._saved_texts.pop(cat_id, None)
+
+    def clear(self):
+        self._cats.clear()
+        self._saved_texts.clear()
+
+    def __len__(self):
+        return len(self._cats)
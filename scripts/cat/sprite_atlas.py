@@ -0,0 +1,106 @@
+"""
+The sprites of the sprite sheets, as regions of the sheets.
+
+Every sprite sheet is loaded once into one Surface. make_group used to cut every group of a sheet into its sprites
+right away, one subsurface per pose, for every colour, white patch, eye colour, scar and accessory. That is tens of
+thousands of Surfaces at start up, while a Clan only ever uses a few hundred of them.
+
+Now a group only remembers where it is on its sheet. The subsurface of a pose, which shares the pixels of the sheet,
+is made the first time the pose is used and kept after that. Sprites are found by the name of their group and the
+pose as an int, see SpriteAtlas.get_sprite. The old names, the group name with the pose put after it like "lines12",
+still work through SpriteAtlas[name].
+"""
+from collections.abc import Mapping
+from typing import Dict, Optional
+
+import pygame
+
+
+class SpriteGroup():
+    """The sprites of one group, sprites_x * sprites_y sprites on a sprite sheet."""
+
+    __slots__ = ("sheet", "x", "y", "sprites_x", "size", "count", "no_index", "_sprites")
+
+    def __init__(self, sheet: pygame.Surface, x, y, sprites_x: int, sprites_y: int, size, no_index=False):
+        self.sheet = sheet
+        # pixel offset of the group on the sheet
+        self.x = x
+        self.y = y
+        self.sprites_x = sprites_x
+        self.size = size
+        self.count = sprites_x * sprites_y
+        self.no_index = no_index
+        # pose: its subsurface, for the poses which were used
+        self._sprites: Dict[int, pygame.Surface] = {}
+
+    def rect(self, index: int) -> pygame.Rect:
+        """Returns where the sprite is on the sheet."""
+        return pygame.Rect(self.x + index % self.sprites_x * self.size,
+                           self.y + index // self.sprites_x * self.size,
+                           self.size, self.size)
+
+    def set_placeholder(self, index: int, sprite: pygame.Surface):
+        """Puts in the sprite for a pose which isn't on the sheet."""
+        self._sprites[index] = sprite
+
+    def get(self, index: int) -> pygame.Surface:
+        sprite = self._sprites.get(index)
+        if sprite is None:
+            if not 0 <= index < self.count:
+                raise IndexError(index)
+            sprite = self.sheet.subsurface(self.rect(index))
+            self._sprites[index] = sprite
+        return sprite
+
+
+class SpriteAtlas(Mapping):
+    """All sprites, by the name of their group and their pose."""
+
+    def __init__(self):
+        self._groups: Dict[str, SpriteGroup] = {}
+
+    def add_group(self, name: str, group: SpriteGroup):
+        self._groups[name] = group
+
+    def get_sprite(self, name: str, pose: int = 0) -> pygame.Surface:
+        """Returns the sprite of the group with the pose. Raises a KeyError if there is no such sprite."""
+        try:
+            return self._groups[name].get(pose)
+        except IndexError:
+            raise KeyError(f"{name}{pose}") from None
+
+    def _find(self, full_name: str) -> Optional[pygame.Surface]:
+        group = self._groups.get(full_name)
+        if group is not None and group.no_index:
+            return group.get(0)
+
+        # the pose is the number at the end, the group name the longest part before it which is a group
+        split = len(full_name) - 1
+        while split > 0 and full_name[split].isdigit():
+            pose = full_name[split:]
+            group = self._groups.get(full_name[:split])
+            if group is not None and not group.no_index and (pose == "0" or pose[0] != "0") \
+                    and int(pose) < group.count:
+                return group.get(int(pose))
+            split -= 1
+        return None
+
+    def __getitem__(self, full_name: str) -> pygame.Surface:
+        sprite = self._find(full_name)
+        if sprite is None:
+            raise KeyError(full_name)
+        return sprite
+
+    def __contains__(self, full_name) -> bool:
+        return isinstance(full_name, str) and self._find(full_name) is not None
+
+    def __iter__(self):
+        for name, group in self._groups.items():
+            if group.no_index:
+                yield name
+            else:
+                for index in range(group.count):
+                    yield f"{name}{index}"
+
+    def __len__(self):
+        return sum(1 if group.no_index else group.count for group in self._groups.values())
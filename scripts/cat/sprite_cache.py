@@ -0,0 +1,151 @@
+"""
+Cache for the composited cat sprites.
+
+Putting a cat sprite together takes 10-20 blits and several copies of the sprite sheet images. The result only
+depends on the look of the cat, so the composited sprites are kept in a cache keyed by everything that changes
+the look: the pelt, the sprite index, dead/Dark Forest state, shaders, scars, accessory, fading stage and
+reversal. Cats which look the same share one sprite.
+
+There are two tiers:
+ - an in-memory LRU, sized with "cache_size" in the cat_sprites section of game_config.json
+ - an optional PNG tier in the cache folder ("disk_cache"), so the sprites of a large Clan don't have to be
+   put together again when the game is started. The PNGs are kept in a folder named after a stamp of the sprite
+   sheets, so they are thrown away as soon as any sprite sheet changes.
+"""
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+
+import pygame
+
+from scripts.cat.sprites import sprites
+from scripts.game_structure.game_essentials import game
+from scripts.housekeeping.datadir import get_cache_dir
+
+
+class SpriteCache():
+
+    def __init__(self, max_size: int = 512, use_disk: bool = False):
+        self.max_size = max_size
+        self.use_disk = use_disk
+        self._sprites = OrderedDict()
+        # folder of the PNG tier, set up the first time it's used
+        self._disk_dir = None
+
+    @staticmethod
+    def make_key(pelt, cat_sprite: str, dead: bool, df: bool, shaders: bool, fade_stage, scars_hidden: bool,
+                 acc_hidden: bool) -> tuple:
+        """Returns the key for a sprite. It has to contain everything which is used to put the sprite together."""
+        return (
+            cat_sprite,
+            pelt.name,
+            pelt.colour,
+            pelt.tortiebase,
+            pelt.tortiecolour,
+            pelt.tortiepattern,
+            pelt.pattern,
+            pelt.white_patches,
+            pelt.white_patches_tint,
+            pelt.points,
+            pelt.vitiligo,
+            pelt.eye_colour,
+            pelt.eye_colour2,
+            pelt.eye_pattern,
+            pelt.skin,
+            pelt.reverse,
+            () if scars_hidden else tuple(pelt.scars),
+            None if acc_hidden else pelt.accessory,
+            dead,
+            df,
+            shaders,
+            fade_stage
+        )
+
+    def get(self, key: tuple):
+        """Returns the cached sprite, or None if it isn't cached."""
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+
+        if self.use_disk:
+            sprite = self._load_from_disk(key)
+            if sprite is not None:
+                self._add(key, sprite)
+        return sprite
+
+    def put(self, key: tuple, sprite: pygame.Surface):
+        """Adds a sprite to the cache. The sprite is shared, so it must not be changed afterwards."""
+        self._add(key, sprite)
+        if self.use_disk:
+            self._save_to_disk(key, sprite)
+
+    def clear(self):
+        """Empties the in-memory tier."""
+        self._sprites.clear()
+
+    def _add(self, key: tuple, sprite: pygame.Surface):
+        self._sprites[key] = sprite
+        self._sprites.move_to_end(key)
+        while len(self._sprites) > self.max_size:
+            self._sprites.popitem(last=False)
+
+    # ---------------------------------------------------------------------------- #
+    #                                   disk tier                                  #
+    # ---------------------------------------------------------------------------- #
+
+    @staticmethod
+    def _get_sprite_sheet_stamp() -> str:
+        """Returns a stamp which changes whenever a sprite sheet, the tints or the sprite size change."""
+        stamp = hashlib.sha1(repr((sprites.size, game.config['fun']['april_fools'])).encode())
+        for folder in ("sprites", "sprites/dicts"):
+            if not os.path.isdir(folder):
+                continue
+            for file_name in sorted(os.listdir(folder)):
+                if not file_name.endswith((".png", ".json")):
+                    continue
+                stat = os.stat(f"{folder}/{file_name}")
+                stamp.update(f"{folder}/{file_name}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+        return stamp.hexdigest()[:16]
+
+    def _get_disk_dir(self) -> str:
+        if self._disk_dir is None:
+            cache_dir = f"{get_cache_dir()}/sprites"
+            stamp = self._get_sprite_sheet_stamp()
+            # sprites of older sprite sheets can't be used anymore
+            if os.path.isdir(cache_dir):
+                for old_stamp in os.listdir(cache_dir):
+                    if old_stamp != stamp:
+                        shutil.rmtree(f"{cache_dir}/{old_stamp}", ignore_errors=True)
+            self._disk_dir = f"{cache_dir}/{stamp}"
+            os.makedirs(self._disk_dir, exist_ok=True)
+        return self._disk_dir
+
+    def _disk_path(self, key: tuple) -> str:
+        return f"{self._get_disk_dir()}/{hashlib.sha1(repr(key).encode()).hexdigest()}.png"
+
+    def _load_from_disk(self, key: tuple):
+        try:
+            path = self._disk_path(key)
+            if not os.path.exists(path):
+                return None
+            sprite = pygame.image.load(path)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            return sprite
+        except (OSError, pygame.error) as e:
+            print(f"WARNING: Could not read the sprite cache, it is turned off. {e}")
+            self.use_disk = False
+            return None
+
+    def _save_to_disk(self, key: tuple, sprite: pygame.Surface):
+        try:
+            pygame.image.save(sprite, self._disk_path(key))
+        except (OSError, pygame.error) as e:
+            print(f"WARNING: Could not write the sprite cache, it is turned off. {e}")
+            self.use_disk = False
+
+
+sprite_cache = SpriteCache(max_size=game.config["cat_sprites"].get("cache_size", 512),
+                           use_disk=game.config["cat_sprites"].get("disk_cache", False))
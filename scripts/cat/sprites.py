@@ -4,6 +4,7 @@ import pygame
 
 import ujson
 
+from scripts.cat.sprite_atlas import SpriteAtlas, SpriteGroup
 from scripts.cat.names import names
 from scripts.game_structure.game_essentials import game
 
@@ -22,7 +23,7 @@ class Sprites():
         self.size = None
         self.spritesheets = {}
         self.images = {}
-        self.sprites = {}
+        self.sprites = SpriteAtlas()
 
         # Shared empty sprite for placeholders
         self.blank_sprite = None
@@ -72,37 +73,33 @@ class Sprites():
 
         group_x_ofs = pos[0] * sprites_x * self.size
         group_y_ofs = pos[1] * sprites_y * self.size
-        i = 0
-
-
-        # splitting group into singular sprites and storing into self.sprites section
-        for y in range(sprites_y):
-            for x in range(sprites_x):
-                if no_index:
-                    full_name = f"{name}"
-                else:
-                    full_name = f"{name}{i}"
-
-                try:
-                    new_sprite = pygame.Surface.subsurface(
-                        self.spritesheets[spritesheet],
-                        group_x_ofs + x * self.size,
-                        group_y_ofs + y * self.size,
-                        self.size, self.size
+
+        # the sprites are only cut out of the sheet when they are used, see SpriteAtlas
+        sheet = self.spritesheets[spritesheet]
+        group = SpriteGroup(sheet, group_x_ofs, group_y_ofs, sprites_x, sprites_y, self.size, no_index)
+        sheet_rect = sheet.get_rect()
+        if not sheet_rect.contains((group_x_ofs, group_y_ofs, sprites_x * self.size, sprites_y * self.size)):
+            for i in range(group.count):
+                if sheet_rect.contains(group.rect(i)):
+                    continue
+                # Fallback for non-existent sprites
+                print(f"WARNING: nonexistent sprite - {name if no_index else f'{name}{i}'}")
+                if not self.blank_sprite:
+                    self.blank_sprite = pygame.Surface(
+                        (self.size, self.size),
+                        pygame.HWSURFACE | pygame.SRCALPHA
                     )
+                group.set_placeholder(i, self.blank_sprite)
+
+        self.sprites.add_group(name, group)
 
-                except ValueError:
-                    # Fallback for non-existent sprites
-                    print(f"WARNING: nonexistent sprite - {full_name}")
-                    if not self.blank_sprite:
-                        self.blank_sprite = pygame.Surface(
-                            (self.size, self.size),
-                            pygame.HWSURFACE | pygame.SRCALPHA
-                        )
-                    new_sprite = self.blank_sprite
-
-                self.sprites[full_name] = new_sprite
-                i += 1
+    def get_sprite(self, name, pose=0):
+        """
+        Returns a sprite of a group
+        :param name: Name of the group, as given to make_group
+        :param pose: Index of the cat pose, an int. Leave it at 0 for groups made with no_index
+        """
+        return self.sprites.get_sprite(name, pose)
 
     def load_all(self):
         # get the width and height of the spritesheet
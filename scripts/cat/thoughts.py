@@ -5,6 +5,12 @@ from random import choice
 import ujson
 
 class Thoughts():
+    # Parsed thought files, key is the file path. Each file is only read once.
+    _loaded_files = {}
+    # Thoughts of a set of files which fit the Clan-wide constraints, key is (file paths, biome, season, camp).
+    # These are the same for every cat in a moon, so only the checks for the single cats are done per cat.
+    _pools = {}
+
     @staticmethod
     def thought_fulfill_rel_constraints(main_cat, random_cat, constraint) -> bool:
         """Check if the relationship fulfills the interaction relationship constraints."""
@@ -47,9 +53,8 @@ class Thoughts():
         return True
 
     @staticmethod
-    def cats_fulfill_thought_constraints(main_cat, random_cat, thought, game_mode, biome, season, camp) -> bool:
-        """Check if the two cats fulfills the thought constraints."""
-
+    def thought_fulfill_clan_constraints(thought, biome, season, camp) -> bool:
+        """Check if the thought fits the biome, season and camp of the Clan."""
         # This is for checking biome
         if "biome" in thought:
             if biome not in thought["biome"]:
@@ -67,6 +72,20 @@ class Thoughts():
             if camp not in thought["camp"]:
                 return False
 
+        return True
+
+    @staticmethod
+    def cats_fulfill_thought_constraints(main_cat, random_cat, thought, game_mode, biome, season, camp) -> bool:
+        """Check if the two cats fulfills the thought constraints."""
+        if not Thoughts.thought_fulfill_clan_constraints(thought, biome, season, camp):
+            return False
+
+        return Thoughts.cats_fulfill_cat_constraints(main_cat, random_cat, thought, game_mode)
+
+    @staticmethod
+    def cats_fulfill_cat_constraints(main_cat, random_cat, thought, game_mode) -> bool:
+        """Check if the two cats fulfill the thought constraints which depend on the cats."""
+
         # This is for checking the 'not_working' status
         if "not_working" in thought:
             if thought["not_working"] != main_cat.not_working():
@@ -264,11 +283,34 @@ class Thoughts():
         return created_list
 
     @staticmethod
-    def load_thoughts(main_cat, other_cat, game_mode, biome, season, camp):
+    def clear_cache():
+        """Drops all loaded thoughts, so they are read again from the resource files."""
+        Thoughts._loaded_files.clear()
+        Thoughts._pools.clear()
+
+    @staticmethod
+    def _load_file(path: str) -> list:
+        if path not in Thoughts._loaded_files:
+            with open(path, 'r') as read_file:
+                Thoughts._loaded_files[path] = ujson.loads(read_file.read())
+        return Thoughts._loaded_files[path]
+
+    @staticmethod
+    def get_thought_pool(paths: tuple, biome, season, camp) -> list:
+        """Returns the thoughts of the given files which fit the biome, season and camp of the Clan.
+        The list is shared, so it must not be changed."""
+        key = (paths, biome, season, camp)
+        if key not in Thoughts._pools:
+            Thoughts._pools[key] = [thought for path in paths for thought in Thoughts._load_file(path)
+                                    if Thoughts.thought_fulfill_clan_constraints(thought, biome, season, camp)]
+        return Thoughts._pools[key]
+
+    @staticmethod
+    def get_thought_files(main_cat) -> tuple:
+        """Returns the paths of the thought files for the status and life state of the cat."""
         base_path = f"resources/dicts/thoughts/"
         life_dir = None
         status = main_cat.status
-        loaded_thoughts = []
 
         if status == "medicine cat apprentice":
             status = "medicine_cat_apprentice"
@@ -295,21 +337,17 @@ class Thoughts():
         else:
             spec_dir = ""
 
-        THOUGHTS = []
         # newborns only pull from their status thoughts. this is done for convenience
         if main_cat.age == 'newborn':
-            with open(f"{base_path}{life_dir}{spec_dir}/newborn.json", 'r') as read_file:
-                THOUGHTS = ujson.loads(read_file.read())
-            loaded_thoughts = THOUGHTS
-        else:
-            with open(f"{base_path}{life_dir}{spec_dir}/{status}.json", 'r') as read_file:
-                THOUGHTS = ujson.loads(read_file.read())
-            GENTHOUGHTS = []
-            with open(f"{base_path}{life_dir}{spec_dir}/general.json", 'r') as read_file:
-                GENTHOUGHTS = ujson.loads(read_file.read())
-            loaded_thoughts = THOUGHTS 
-            loaded_thoughts += GENTHOUGHTS
-        final_thoughts = Thoughts.create_thoughts(loaded_thoughts, main_cat, other_cat, game_mode, biome, season, camp)
+            return (f"{base_path}{life_dir}{spec_dir}/newborn.json",)
+        return f"{base_path}{life_dir}{spec_dir}/{status}.json", f"{base_path}{life_dir}{spec_dir}/general.json"
+
+    @staticmethod
+    def load_thoughts(main_cat, other_cat, game_mode, biome, season, camp):
+        thought_pool = Thoughts.get_thought_pool(Thoughts.get_thought_files(main_cat), biome, season, camp)
+
+        final_thoughts = [thought for thought in thought_pool
+                          if Thoughts.cats_fulfill_cat_constraints(main_cat, other_cat, thought, game_mode)]
 
         return final_thoughts
     
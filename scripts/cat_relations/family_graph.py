@@ -0,0 +1,79 @@
+"""
+The parent -> child edges between the cats in Cat.all_cats.
+
+Cat.all_cats and the setters of Cat.parent1, parent2 and adoptive_parents keep the edges up to date. With them, the
+inheritance only has to look at the cats which can be family, instead of going through all cats to find the kits,
+siblings and cousins of a cat.
+
+The generation goes up with every change of the edges. Anything worked out from the family, like the inheritances,
+can remember the generation it was worked out at, and is still right as long as the generation is the same.
+"""
+import itertools
+from typing import Dict, List, Tuple
+
+
+class FamilyGraph():
+
+    def __init__(self):
+        # parent ID: {child ID: None}, blood and adoptive children
+        self.children: Dict[str, Dict[str, None]] = {}
+        # child ID: the parent IDs which the child is listed under
+        self.parents: Dict[str, Tuple[str, ...]] = {}
+        # ID: when the cat was added, so cats can be given back in the same order as in Cat.all_cats
+        self.order: Dict[str, int] = {}
+        self._counter = itertools.count()
+        self.generation = 0
+
+    def update(self, cat):
+        """Reads the parents of the cat again and moves its edges if they changed."""
+        if cat.ID not in self.order:
+            self.order[cat.ID] = next(self._counter)
+
+        parents = []
+        for parent_id in [cat.parent1, cat.parent2] + list(cat.adoptive_parents):
+            if parent_id and parent_id not in parents:
+                parents.append(parent_id)
+        parents = tuple(parents)
+        old_parents = self.parents.get(cat.ID, ())
+        if parents == old_parents:
+            return
+
+        for parent_id in old_parents:
+            if parent_id not in parents:
+                self._remove_edge(parent_id, cat.ID)
+        for parent_id in parents:
+            self.children.setdefault(parent_id, {})[cat.ID] = None
+        self.parents[cat.ID] = parents
+        self.generation += 1
+
+    def remove(self, cat_id: str):
+        """Takes the cat out of the graph. The edges to its children are kept, they still name it as parent."""
+        for parent_id in self.parents.pop(cat_id, ()):
+            self._remove_edge(parent_id, cat_id)
+        if self.order.pop(cat_id, None) is not None:
+            self.generation += 1
+
+    def _remove_edge(self, parent_id: str, child_id: str):
+        children = self.children.get(parent_id)
+        if children is None:
+            return
+        children.pop(child_id, None)
+        if not children:
+            del self.children[parent_id]
+
+    def clear(self):
+        self.children.clear()
+        self.parents.clear()
+        self.order.clear()
+        self.generation += 1
+
+    def get_children(self, *parent_ids: str) -> List[str]:
+        """Returns the IDs of the children of all the given cats, in the order of Cat.all_cats."""
+        found = set()
+        for parent_id in parent_ids:
+            found.update(self.children.get(parent_id, ()))
+        return self.sort(found)
+
+    def sort(self, cat_ids) -> List[str]:
+        """Returns the IDs in the order of Cat.all_cats."""
+        return sorted(cat_ids, key=self.order.__getitem__)
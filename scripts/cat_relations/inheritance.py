@@ -37,6 +37,11 @@ class Inheritance():
         self.grand_kits = {}
         self.all_involved = []
         self.all_but_cousins = []
+        # the same IDs as the two lists above, for quick checks
+        self.involved_ids = set()
+        self.but_cousins_ids = set()
+        # generation of the family graph the inheritance was worked out at
+        self.generation = None
 
         self.cat = cat
         self.update_inheritance()
@@ -68,6 +73,10 @@ class Inheritance():
         # helping variables
         self.need_update = []
 
+        # the adoptive parents might have been changed in place
+        self.cat.update_family_graph()
+        family_graph = self.cat.family_graph
+
         # parents
         self.init_parents()
 
@@ -77,9 +86,19 @@ class Inheritance():
         # mates
         self.init_mates()
 
-        for inter_id, inter_cat in self.cat.all_cats.items():
-            if inter_id == self.cat.ID:
-                continue
+        # only the cats which can be family are looked at, the others would not be added anyways:
+        # kits are children of the cat, siblings children of the parents, parents siblings children of the grand
+        # parents and cousins children of the parents siblings
+        parent_ids = self.get_blood_parents() + self.cat.adoptive_parents
+        parents_siblings_ids = family_graph.get_children(*self.grand_parents.keys())
+        possible_ids = set(family_graph.get_children(self.cat.ID, *parent_ids))
+        possible_ids.update(parents_siblings_ids)
+        possible_ids.update(family_graph.get_children(*parents_siblings_ids))
+        possible_ids.discard(self.cat.ID)
+
+        # the cats are still looked at in the order of all_cats, so the result is the same as looking at all cats
+        for inter_id in family_graph.sort(possible_ids):
+            inter_cat = self.cat.all_cats[inter_id]
 
             # kits + their mates
             self.init_kits(inter_id, inter_cat)
@@ -94,9 +113,10 @@ class Inheritance():
             self.init_cousins(inter_id, inter_cat)
 
         # since grand kits depending on kits, ALL KITS HAVE TO BE SET FIRST!
-        for inter_id, inter_cat in self.cat.all_cats.items():
+        for inter_id in family_graph.get_children(*self.kits.keys()):
             if inter_id == self.cat.ID:
                 continue
+            inter_cat = self.cat.all_cats[inter_id]
 
             # grand kits
             self.init_grand_kits(inter_id, inter_cat)
@@ -120,6 +140,14 @@ class Inheritance():
                     # if the inheritance is updated, remove the id of the need_update list
                     self.need_update.remove(update_id)
 
+        self.involved_ids = set(self.all_involved)
+        self.but_cousins_ids = set(self.all_but_cousins)
+        self.generation = family_graph.generation
+
+    def is_current(self) -> bool:
+        """Returns if the family graph didn't change since the inheritance was worked out."""
+        return self.generation == self.cat.family_graph.generation
+
     def update_all_related_inheritance(self):
         """Update all the inheritances of the cats, which are related to the current cat."""
         # only adding/removing parents or kits will use this function, because all inheritances are based on parents
@@ -134,8 +162,13 @@ class Inheritance():
         It renews all inheritances, where this cat is listed as a mate of a kit or sibling.
         """
         self.update_inheritance()
-        for inter_inheritances in self.all_inheritances.values():
-            if self.cat.ID in inter_inheritances.other_mates or self.cat.ID in inter_inheritances.all_involved:
+        Inheritance.update_inheritances_involving(self.cat.ID)
+
+    @staticmethod
+    def update_inheritances_involving(cat_id):
+        """Renews all inheritances, where the cat is listed as family or as a mate of a kit or sibling."""
+        for inter_inheritances in list(Inheritance.all_inheritances.values()):
+            if cat_id in inter_inheritances.other_mates or cat_id in inter_inheritances.all_involved:
                 inter_inheritances.update_inheritance()
 
     def get_cat_info(self, cat_id) -> list:
@@ -194,8 +227,11 @@ class Inheritance():
         }
         if rel_type == RelationType.ADOPTIVE and parent.ID not in self.cat.adoptive_parents:
             self.cat.adoptive_parents.append(parent.ID)
+            self.cat.update_family_graph()
         self.all_involved.append(parent.ID)
         self.all_but_cousins.append(parent.ID)
+        self.involved_ids.add(parent.ID)
+        self.but_cousins_ids.add(parent.ID)
         self.update_all_related_inheritance()
 
     # ---------------------------------------------------------------------------- #
@@ -439,8 +475,9 @@ class Inheritance():
                 }
                 self.other_mates.append(mate_id)
 
-            # iterate over all cats, to get the children of the sibling
-            for _c in self.cat.all_cats.values():
+            # get the children of the sibling
+            for _c_id in self.cat.family_graph.get_children(inter_id):
+                _c = self.cat.all_cats[_c_id]
                 _c_parents = self.get_parents(_c)
                 _c_adoptive = self.get_no_blood_parents(_c)
                 if inter_id in _c_parents:
@@ -313,6 +313,118 @@ def cats_fulfill_single_interaction_constraints(main_cat, random_cat, interactio
 
     return True
 
+# ---------------------------------------------------------------------------- #
+#                              INTERACTION CATALOG                             #
+# ---------------------------------------------------------------------------- #
+
+def get_constraint_skill(cat):
+    """Returns the skill which the skill constraints are checked against."""
+    if cat.skills.primary and cat.skills.primary.skill:
+        return cat.skills.primary.skill
+    return cat.skills.secondary.skill if cat.skills.secondary else None
+
+
+# the constraints which only look at one value of a cat, with the function to get the value
+CAT_VALUE_CONSTRAINTS = {
+    "main_status_constraint": ("m_c", lambda cat: cat.status),
+    "random_status_constraint": ("r_c", lambda cat: cat.status),
+    "main_trait_constraint": ("m_c", lambda cat: cat.personality.trait),
+    "random_trait_constraint": ("r_c", lambda cat: cat.personality.trait),
+    "main_skill_constraint": ("m_c", get_constraint_skill),
+    "random_skill_constraint": ("r_c", get_constraint_skill),
+}
+
+
+class InteractionCatalog():
+    """
+    The single interactions of one relationship type and direction, which fit the intensity, biome and season.
+    These don't change during a moon, so each catalog is only built once and used for every pair of cats.
+
+    For the status, trait and skill constraints, each catalog keeps bitmasks with one bit per interaction: which
+    interactions allow a value. The constraints of all interactions are checked for a pair of cats by AND-ing the
+    masks of their values. Only the interactions with backstory, injury or relationship constraints are then checked
+    one by one. The interactions come out in the same order as from Relationship.get_relevant_interactions, so the
+    same interaction is chosen for the same random numbers.
+    """
+    # (rel_type, in_de_crease, intensity, biome, season): catalog
+    catalogs = {}
+
+    def __init__(self, interactions: list):
+        self.interactions = list(interactions)
+        self.all_bits = (1 << len(self.interactions)) - 1
+
+        # constraint: (value: bits of the interactions which allow it, bits of the interactions without the constraint)
+        self.masks = {}
+        for constraint in CAT_VALUE_CONSTRAINTS:
+            allowed = {}
+            unconstrained = 0
+            for position, interaction in enumerate(self.interactions):
+                bit = 1 << position
+                values = getattr(interaction, constraint)
+                if len(values) >= 1:
+                    for value in values:
+                        allowed[value] = allowed.get(value, 0) | bit
+                else:
+                    unconstrained |= bit
+            if allowed:
+                self.masks[constraint] = (allowed, unconstrained)
+
+        # bits of the interactions which still need the full check
+        self.checked_bits = 0
+        for position, interaction in enumerate(self.interactions):
+            if interaction.backstory_constraint or interaction.has_injuries or interaction.relationship_constraint:
+                self.checked_bits |= 1 << position
+
+    @staticmethod
+    def get(rel_type: str, in_de_crease: str, intensity: str, biome: str, season: str):
+        """Returns the catalog, builds it the first time. For neutral interactions, intensity is None."""
+        if in_de_crease == "neutral":
+            # the neutral interactions are the same for all types
+            rel_type = None
+        key = (rel_type, in_de_crease, intensity, biome, season)
+        if key not in InteractionCatalog.catalogs:
+            if in_de_crease == "neutral":
+                interactions = NEUTRAL_INTERACTIONS
+            else:
+                interactions = INTERACTION_MASTER_DICT[rel_type][in_de_crease]
+
+            _season = [season, "Any", "any"]
+            _biome = [biome, "Any", "any"]
+            fitting = [interact for interact in interactions
+                       if all(i in _biome for i in interact.biome) and all(i in _season for i in interact.season)
+                       and (intensity is None or interact.intensity == intensity)]
+            InteractionCatalog.catalogs[key] = InteractionCatalog(fitting)
+        return InteractionCatalog.catalogs[key]
+
+    @staticmethod
+    def clear_cache():
+        InteractionCatalog.catalogs.clear()
+
+    def candidates(self, relationship, game_mode: str) -> list:
+        """Returns a new list of the interactions, which the cats and the relationship fulfill the constraints of."""
+        cats = {"m_c": relationship.cat_from, "r_c": relationship.cat_to}
+        bits = self.all_bits
+        for constraint, (allowed, unconstrained) in self.masks.items():
+            abbreviation, get_value = CAT_VALUE_CONSTRAINTS[constraint]
+            bits &= allowed.get(get_value(cats[abbreviation]), 0) | unconstrained
+            if not bits:
+                return []
+
+        filtered = []
+        while bits:
+            lowest_bit = bits & -bits
+            bits ^= lowest_bit
+            interaction = self.interactions[lowest_bit.bit_length() - 1]
+            if lowest_bit & self.checked_bits:
+                if not cats_fulfill_single_interaction_constraints(relationship.cat_from, relationship.cat_to,
+                                                                   interaction, game_mode):
+                    continue
+                if not rel_fulfill_rel_constraints(relationship, interaction.relationship_constraint,
+                                                   interaction.id):
+                    continue
+            filtered.append(interaction)
+        return filtered
+
 # ---------------------------------------------------------------------------- #
 #                            BUILD MASTER DICTIONARY                           #
 # ---------------------------------------------------------------------------- #
@@ -8,11 +8,14 @@ from scripts.utility import get_personality_compatibility, process_text
 from scripts.game_structure.game_essentials import game
 from scripts.cat_relations.interaction import (
     Single_Interaction, 
+    InteractionCatalog,
     NEUTRAL_INTERACTIONS, 
     INTERACTION_MASTER_DICT,
     rel_fulfill_rel_constraints,
     cats_fulfill_single_interaction_constraints,
 )
+from scripts.cat_relations.relationship_log import RelationshipLog
+from scripts.cat_relations.relationship_matrix import RelationshipMatrix
 
 
 # ---------------------------------------------------------------------------- #
@@ -21,21 +24,32 @@ from scripts.cat_relations.interaction import (
 
 class Relationship():
     used_interaction_ids = []
+    # if set, the values of all new relationships are stored in this matrix
+    matrix_store: RelationshipMatrix = None
 
     def __init__(self, cat_from, cat_to, mates=False, family=False, romantic_love=0, platonic_like=0, dislike=0,
                  admiration=0, comfortable=0, jealousy=0, trust=0, log=None) -> None:
         self.history = History()
         self.cat_from = cat_from
         self.cat_to = cat_to
+
+        # the matrix is kept per relationship, so enabling the store later won't break existing relationships
+        self.matrix = Relationship.matrix_store
+        if self.matrix is not None:
+            self.from_slot = self.matrix.get_slot(cat_from.ID)
+            self.to_slot = self.matrix.get_slot(cat_to.ID)
+        else:
+            self.from_slot = None
+            self.to_slot = None
+        self._mates = None
+        self._family = None
+
         self.mates = mates
         self.family = family
         self.opposite_relationship = None  # link to opposite relationship will be created later
         self.interaction_str = ''
         self.triggered_event = False
-        if log:
-            self.log = log
-        else:
-            self.log = []
+        self.log = RelationshipLog(cat_from, cat_to, log)
 
         # each stat can go from 0 to 100
         self.romantic_love = romantic_love
@@ -46,6 +60,9 @@ class Relationship():
         self.jealousy = jealousy
         self.trust = trust
 
+        # a new relationship has to be saved
+        self.cat_from.relationships_changed = True
+
     def link_relationship(self):
         """Add the other relationship object to this easily access and change the other side."""
         if self.cat_from.ID in self.cat_to.relationships:
@@ -96,13 +113,11 @@ class Relationship():
         biome = str(game.clan.biome).casefold()
         game_mode = game.clan.game_mode
 
-        all_interactions = NEUTRAL_INTERACTIONS.copy()
-        if in_de_crease != "neutral":
-            all_interactions = INTERACTION_MASTER_DICT[rel_type][in_de_crease].copy()
-            possible_interactions = self.get_relevant_interactions(all_interactions, intensity, biome, season, game_mode)
-        else:
+        if in_de_crease == "neutral":
             intensity = None
-            possible_interactions = self.get_relevant_interactions(all_interactions, intensity, biome, season, game_mode)
+        # gives the same interactions as get_relevant_interactions, without going through all of them for each pair
+        catalog = InteractionCatalog.get(rel_type, in_de_crease, intensity, biome, season)
+        possible_interactions = catalog.candidates(self, game_mode)
 
         if len(possible_interactions) <= 0:
             print("ERROR: No interaction with this conditions. ", rel_type, in_de_crease, intensity)
@@ -167,9 +182,9 @@ class Relationship():
 
         interaction_str = interaction_str + effect
         if self.cat_from.moons == 1:
-            self.log.append(interaction_str + f" - {self.cat_from.name} was {self.cat_from.moons} moon old")
+            self.add_log(interaction_str + f" - {self.cat_from.name} was {self.cat_from.moons} moon old")
         else:
-            self.log.append(interaction_str + f" - {self.cat_from.name} was {self.cat_from.moons} moons old")
+            self.add_log(interaction_str + f" - {self.cat_from.name} was {self.cat_from.moons} moons old")
         relevant_event_tabs = ["relation", "interaction"]
         if self.chosen_interaction.get_injuries:
             relevant_event_tabs.append("health")
@@ -519,90 +534,126 @@ class Relationship():
             self.dislike -= buff
 
 
+    def add_log(self, text: str):
+        """Adds an entry to the log of this relationship."""
+        self.log.append(text)
+
     # ---------------------------------------------------------------------------- #
     #                                   property                                   #
     # ---------------------------------------------------------------------------- #
 
-    @property
-    def romantic_love(self):
-        return self._romantic_love
+    def _get_value(self, value_type):
+        if self.matrix is not None:
+            return self.matrix.get_value(value_type, self.from_slot, self.to_slot)
+        return getattr(self, f"_{value_type}")
 
-    @romantic_love.setter
-    def romantic_love(self, value):
+    def _set_value(self, value_type, value):
         if value > 100:
             value = 100
         if value < 0:
             value = 0
-        self._romantic_love = value
+        if self.matrix is not None:
+            if self.matrix.get_value(value_type, self.from_slot, self.to_slot) == int(value):
+                return
+            self.matrix.set_value(value_type, self.from_slot, self.to_slot, value)
+        else:
+            if getattr(self, f"_{value_type}", None) == value:
+                return
+            setattr(self, f"_{value_type}", value)
+        # only the relationships of cats which changed are saved again
+        self.cat_from.relationships_changed = True
+
+    @property
+    def mates(self):
+        if self.matrix is not None:
+            return self.matrix.get_flag("mates", self.from_slot, self.to_slot)
+        return self._mates
+
+    @mates.setter
+    def mates(self, value):
+        if self.mates == value:
+            return
+        if self.matrix is not None:
+            self.matrix.set_flag("mates", self.from_slot, self.to_slot, value)
+        else:
+            self._mates = value
+        self.cat_from.relationships_changed = True
+
+    @property
+    def family(self):
+        if self.matrix is not None:
+            return self.matrix.get_flag("family", self.from_slot, self.to_slot)
+        return self._family
+
+    @family.setter
+    def family(self, value):
+        if self.family == value:
+            return
+        if self.matrix is not None:
+            self.matrix.set_flag("family", self.from_slot, self.to_slot, value)
+        else:
+            self._family = value
+        self.cat_from.relationships_changed = True
+
+    @property
+    def romantic_love(self):
+        return self._get_value("romantic_love")
+
+    @romantic_love.setter
+    def romantic_love(self, value):
+        self._set_value("romantic_love", value)
 
     @property
     def platonic_like(self):
-        return self._platonic_like
+        return self._get_value("platonic_like")
 
     @platonic_like.setter
     def platonic_like(self, value):
-        if value > 100:
-            value = 100
-        if value < 0:
-            value = 0
-        self._platonic_like = value
+        self._set_value("platonic_like", value)
 
     @property
     def dislike(self):
-        return self._dislike
+        return self._get_value("dislike")
 
     @dislike.setter
     def dislike(self, value):
-        if value > 100:
-            value = 100
-        if value < 0:
-            value = 0
-        self._dislike = value
+        self._set_value("dislike", value)
 
     @property
     def admiration(self):
-        return self._admiration
+        return self._get_value("admiration")
 
     @admiration.setter
     def admiration(self, value):
-        if value > 100:
-            value = 100
-        if value < 0:
-            value = 0
-        self._admiration = value
+        self._set_value("admiration", value)
 
     @property
     def comfortable(self):
-        return self._comfortable
+        return self._get_value("comfortable")
 
     @comfortable.setter
     def comfortable(self, value):
-        if value > 100:
-            value = 100
-        if value < 0:
-            value = 0
-        self._comfortable = value
+        self._set_value("comfortable", value)
 
     @property
     def jealousy(self):
-        return self._jealousy
+        return self._get_value("jealousy")
 
     @jealousy.setter
     def jealousy(self, value):
-        if value > 100:
-            value = 100
-        if value < 0:
-            value = 0
-        self._jealousy = value
+        self._set_value("jealousy", value)
 
     @property
     def trust(self):
-        return self._trust
+        return self._get_value("trust")
 
     @trust.setter
     def trust(self, value):
-        if value > 100:
-            value = 100
-        if value < 0:
-            value = 0
-        self._trust = value
+        self._set_value("trust", value)
+
+
+if game.config["relationship"].get("matrix_store"):
+    if RelationshipMatrix.available():
+        Relationship.matrix_store = RelationshipMatrix()
+    else:
+        print("WARNING: matrix_store is enabled, but numpy is not installed. Relationships are stored per object.")
@@ -0,0 +1,71 @@
+"""
+The log of a relationship: what happened between the two cats, as shown in the relationship log window.
+
+The entries are kept as the texts they were written with, like "<text> (<effect> effect) - <name> was <moons> moons
+old". Almost every text is only used once, so there is nothing to share between them.
+
+A log only keeps the newest entries, see "log_limit" in the relationship section of game_config.json. Older entries
+are taken out of the log, and written to the "relationship_logs" storage of the Clan with the next save.
+"""
+import re
+from typing import List, Optional
+
+from scripts.game_structure.game_essentials import game
+
+EFFECT_PATTERN = re.compile(r" \(([\w ]+) effect\)$")
+
+
+class RelationshipLog():
+    """The log entries of one relationship. Can be used like the list of the entry texts."""
+
+    def __init__(self, cat, cat_to, entries=None, limit: Optional[int] = None):
+        # the cat the relationship belongs to
+        self.cat = cat
+        self.cat_to = cat_to
+        self.limit = game.config["relationship"].get("log_limit") if limit is None else limit
+        self.entries: List[str] = list(entries) if entries else []
+        # entries taken out of the log because of the limit, which aren't written to the archive yet
+        self.spilled: List[str] = []
+        self._cut_to_limit()
+
+    def append(self, text: str):
+        self.entries.append(text)
+        self._cut_to_limit()
+        self.cat.relationships_changed = True
+
+    def _cut_to_limit(self):
+        if self.limit and len(self.entries) > self.limit:
+            self.spilled.extend(self.entries[:-self.limit])
+            del self.entries[:-self.limit]
+
+    def get_effect(self, index: int) -> Optional[str]:
+        """Returns the effect of the entry, like "high negative", or None if it has none."""
+        effect_match = EFFECT_PATTERN.search(self.entries[index].rpartition(" - ")[0])
+        return effect_match.group(1) if effect_match else None
+
+    def get_save_list(self) -> List[str]:
+        """Returns the texts of the entries, as they are saved."""
+        return list(self.entries)
+
+    def take_spilled(self) -> List[str]:
+        """Returns the texts of the spilled entries, and forgets them."""
+        spilled = self.spilled
+        self.spilled = []
+        return spilled
+
+    def get_archived(self) -> List[str]:
+        """Returns the texts of the entries which were taken out of the log, oldest first."""
+        archived = []
+        if game.clan:
+            saved = game.get_clan_storage(game.clan.name).read("relationship_logs", self.cat.ID) or {}
+            archived = saved.get(self.cat_to.ID, [])
+        return archived + self.spilled
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def __iter__(self):
+        return iter(self.entries)
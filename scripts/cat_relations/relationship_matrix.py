@@ -0,0 +1,91 @@
+"""
+Dense storage for relationship values.
+
+When the matrix store is enabled (see "matrix_store" in the relationship section of game_config.json),
+the seven relationship values and the mates/family flags of every Relationship are kept in NumPy arrays,
+indexed by the slots of the two cats. The Relationship objects are only views onto these arrays.
+
+NumPy is an optional dependency. If it can't be imported, the matrix store is not available and all
+relationships keep their values themselves.
+"""
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+VALUE_TYPES = ("romantic_love", "platonic_like", "dislike", "admiration", "comfortable", "jealousy", "trust")
+VALUE_INDEX = {value_type: i for i, value_type in enumerate(VALUE_TYPES)}
+
+
+class RelationshipMatrix():
+    """Holds the relationship values of all cats. Each cat gets a slot, the value of the
+    relationship from cat A to cat B is found at [value type, slot of A, slot of B]."""
+
+    def __init__(self, capacity: int = 64):
+        if np is None:
+            raise ImportError("The relationship matrix store needs numpy to be installed.")
+
+        self.slots: Dict[str, int] = {}
+        self.capacity = capacity
+        # The values are always whole numbers between 0 and 100.
+        self.values = np.zeros((len(VALUE_TYPES), capacity, capacity), dtype=np.int16)
+        self.mates = np.zeros((capacity, capacity), dtype=bool)
+        self.family = np.zeros((capacity, capacity), dtype=bool)
+
+    @staticmethod
+    def available() -> bool:
+        """Returns True if numpy could be imported, so the matrix store can be used."""
+        return np is not None
+
+    def get_slot(self, cat_id: str) -> int:
+        """Returns the slot of the cat, gives the cat a new slot if it didn't have one yet."""
+        if cat_id not in self.slots:
+            slot = len(self.slots)
+            if slot >= self.capacity:
+                self._grow(max(self.capacity * 2, slot + 1))
+            self.slots[cat_id] = slot
+        return self.slots[cat_id]
+
+    def _grow(self, capacity: int):
+        old = self.capacity
+        values = np.zeros((len(VALUE_TYPES), capacity, capacity), dtype=self.values.dtype)
+        values[:, :old, :old] = self.values
+        mates = np.zeros((capacity, capacity), dtype=bool)
+        mates[:old, :old] = self.mates
+        family = np.zeros((capacity, capacity), dtype=bool)
+        family[:old, :old] = self.family
+
+        self.values = values
+        self.mates = mates
+        self.family = family
+        self.capacity = capacity
+
+    def clear(self):
+        """Removes all slots and values, for example when another Clan is loaded."""
+        self.__init__(capacity=self.capacity)
+
+    def get_value(self, value_type: str, from_slot: int, to_slot: int) -> int:
+        return int(self.values[VALUE_INDEX[value_type], from_slot, to_slot])
+
+    def set_value(self, value_type: str, from_slot: int, to_slot: int, value):
+        self.values[VALUE_INDEX[value_type], from_slot, to_slot] = int(value)
+
+    def get_flag(self, flag: str, from_slot: int, to_slot: int) -> bool:
+        return bool(getattr(self, flag)[from_slot, to_slot])
+
+    def set_flag(self, flag: str, from_slot: int, to_slot: int, value: bool):
+        getattr(self, flag)[from_slot, to_slot] = bool(value)
+
+    def count_values_above(self, relationships: List, threshold: int) -> Dict[str, int]:
+        """Counts for each value type how many of the given relationships have at least the threshold value.
+        All relationships have to be stored in this matrix."""
+        if not relationships:
+            return {value_type: 0 for value_type in VALUE_TYPES}
+
+        from_slots = np.fromiter((rel.from_slot for rel in relationships), dtype=np.intp, count=len(relationships))
+        to_slots = np.fromiter((rel.to_slot for rel in relationships), dtype=np.intp, count=len(relationships))
+        counts = (self.values[:, from_slots, to_slots] >= threshold).sum(axis=1)
+
+        return {value_type: int(counts[i]) for i, value_type in enumerate(VALUE_TYPES)}
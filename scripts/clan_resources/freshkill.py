@@ -3,7 +3,6 @@ from scripts.utility import get_alive_clan_queens
 from scripts.cat.cats import Cat
 from scripts.cat.skills import SkillPath
 from scripts.game_structure.game_essentials import game
-from copy import deepcopy
 import random
 
 class Nutrition():
@@ -81,8 +80,11 @@ class Freshkill_Pile():
             self.total_amount = game.prey_config["start_amount"]
         self.nutrition_info = {}
         self.living_cats = []
-        self.already_fed = []
+        self.already_fed = set()
         self.needed_prey = 0
+        # the food the Clan needs, worked out once at the start of feed_cats. It only depends on the cats, not on the
+        # pile, so it stays the same while the cats are fed.
+        self._feeding_demand = None
 
     def add_freshkill(self, amount) -> None:
         """
@@ -170,9 +172,9 @@ class Freshkill_Pile():
                 event_list.append(f"Some prey expired, {amount} pieces were removed from the pile.")
         self.total_amount = sum(self.pile.values())
         value_diff = self.total_amount
-        self.already_fed = []
+        self.already_fed = set()
         self.feed_cats(living_cats)
-        self.already_fed = []
+        self.already_fed = set()
         value_diff -= sum(self.pile.values())
         event_list.append(f"{value_diff} pieces of prey were consumed.")
         self._update_needed_food(living_cats)
@@ -188,6 +190,13 @@ class Freshkill_Pile():
                 list of living cats which should be feed
         """
         self.update_nutrition(living_cats)
+        self._feeding_demand = self.amount_food_needed()
+        try:
+            self._feed_with_tactic(living_cats, not_moon_feeding)
+        finally:
+            self._feeding_demand = None
+
+    def _feed_with_tactic(self, living_cats: list, not_moon_feeding = False) -> None:
         # NOTE: this is for testing purposes
         if not game.clan:
             self.tactic_status(living_cats, not_moon_feeding)
@@ -220,6 +229,12 @@ class Freshkill_Pile():
         self._update_needed_food(living_cats)
         return self.needed_prey
 
+    def _get_feeding_demand(self):
+        """Returns the food the Clan needs, the one worked out for this feeding if there is one."""
+        if self._feeding_demand is not None:
+            return self._feeding_demand
+        return self.amount_food_needed()
+
     def clan_has_enough_food(self) -> bool:
         """
             Returns
@@ -244,34 +259,23 @@ class Freshkill_Pile():
                 the list of cats which should be feed
         """
         relevant_group = []
-        queen_dict, kits = get_alive_clan_queens(living_cats)
-        fed_kits = []
-        relevant_queens = []
-        # kits under 3 months are feed by the queen
-        for queen_id, their_kits in queen_dict.items():
-            queen = Cat.fetch_cat(queen_id)
-            young_kits = [kit for kit in their_kits if kit.moons < 3]
-            if len(young_kits) > 0:
-                fed_kits.extend(young_kits)
-                relevant_queens.append(queen)
-        
-        pregnant_cats = [cat for cat in living_cats if "pregnant" in cat.injuries and cat.ID not in queen_dict.keys()]
+        queen_dict, fed_kits, relevant_queens, pregnant_cats = self._get_special_groups(living_cats)
+        queens_and_pregnant = set(relevant_queens) | set(pregnant_cats)
+
+        cats_by_status = {}
+        for cat in living_cats:
+            cats_by_status.setdefault(str(cat.status), []).append(cat)
 
         for feeding_status in FEEDING_ORDER:
-            if feeding_status == "newborn":
-                relevant_group = [
-                    cat for cat in living_cats if cat.status == "newborn" and cat not in fed_kits
-                ]
-            elif feeding_status == "kitten":
-                relevant_group = [
-                    cat for cat in living_cats if cat.status == "kitten" and cat not in fed_kits
-                ]
+            if feeding_status in ["newborn", "kitten"]:
+                relevant_group = [cat for cat in cats_by_status.get(feeding_status, []) if cat not in fed_kits]
             elif feeding_status == "queen/pregnant":
                 relevant_group = relevant_queens + pregnant_cats
             else:
-                relevant_group = [cat for cat in living_cats if str(cat.status) == feeding_status]
                 # remove all cats, which are also queens / pregnant
-                relevant_group = [cat for cat in relevant_group if cat not in relevant_queens and cat not in pregnant_cats]
+                relevant_group = [
+                    cat for cat in cats_by_status.get(feeding_status, []) if cat not in queens_and_pregnant
+                ]
 
             if len(relevant_group) == 0:
                 continue
@@ -309,17 +313,9 @@ class Freshkill_Pile():
             return
         
         # first get special groups, which need to be looked out for, when feeding
-        queen_dict, kits = get_alive_clan_queens(living_cats)
-        fed_kits = []
-        relevant_queens = []
-        # kits under 3 months are feed by the queen
-        for queen_id, their_kits in queen_dict.items():
-            queen = Cat.fetch_cat(queen_id)
-            young_kits = [kit for kit in their_kits if kit.moons < 3]
-            if len(young_kits) > 0:
-                fed_kits.extend(young_kits)
-                relevant_queens.append(queen)
-        pregnant_cats = [cat for cat in living_cats if "pregnant" in cat.injuries and cat.ID not in queen_dict.keys()]
+        queen_dict, fed_kits, relevant_queens, pregnant_cats = self._get_special_groups(living_cats)
+        pregnant_cats = set(pregnant_cats)
+        needed_prey = self._get_feeding_demand()
 
         # first split nutrition information into low nutrition and satisfied
         ration_prey = game.clan.clan_settings["ration prey"] if game.clan else False
@@ -364,9 +360,9 @@ class Freshkill_Pile():
                 if ration_prey and status == "warrior":
                     feeding_amount = feeding_amount/2
 
-            if self.amount_food_needed() < self.total_amount * 1.2 and self.nutrition_info[cat.ID].percentage < 100:
+            if needed_prey < self.total_amount * 1.2 and self.nutrition_info[cat.ID].percentage < 100:
                 feeding_amount += 1
-            elif self.amount_food_needed() < self.total_amount and self.nutrition_info[cat.ID].percentage < 100:
+            elif needed_prey < self.total_amount and self.nutrition_info[cat.ID].percentage < 100:
                 feeding_amount += 0.5
 
             if not_moon_feeding:
@@ -400,16 +396,20 @@ class Freshkill_Pile():
                 the list of cats which should be feed
         """
         best_hunter = []
+        hunter_ids = set()
         for search_rank in range(1,4):
-            for cat in living_cats.copy():
-                if not cat.skills:
+            for cat in living_cats:
+                if not cat.skills or cat.ID in hunter_ids:
                     continue
                 if cat.skills.primary and cat.skills.primary.path == SkillPath.HUNTER and cat.skills.primary.tier == search_rank:
-                    best_hunter.insert(0,cat)
-                    living_cats.remove(cat)
+                    best_hunter.append(cat)
+                    hunter_ids.add(cat.ID)
                 elif cat.skills.secondary and cat.skills.secondary.path == SkillPath.HUNTER and cat.skills.secondary.tier == search_rank:
-                    best_hunter.insert(0,cat)
-                    living_cats.remove(cat)
+                    best_hunter.append(cat)
+                    hunter_ids.add(cat.ID)
+        # the hunters found last are fed first
+        best_hunter.reverse()
+        living_cats[:] = [cat for cat in living_cats if cat.ID not in hunter_ids]
 
         self.feed_group(best_hunter, not_moon_feeding)
         self.tactic_status(living_cats, not_moon_feeding)
@@ -432,6 +432,33 @@ class Freshkill_Pile():
     #                               helper functions                               #
     # ---------------------------------------------------------------------------- #
 
+    def _get_special_groups(self, living_cats: List[Cat]):
+        """
+        Returns the groups which need to be looked out for when feeding.
+
+            Returns
+            ----------
+            queen_dict : dict
+                the queen ID with the list of their kits, see get_alive_clan_queens
+            fed_kits : set
+                the kits under 3 moons, which are fed by their queen
+            relevant_queens : list
+                the queens which feed kits
+            pregnant_cats : list
+                the pregnant cats, which aren't queens
+        """
+        queen_dict, kits = get_alive_clan_queens(living_cats)
+        fed_kits = set()
+        relevant_queens = []
+        # kits under 3 months are feed by the queen
+        for queen_id, their_kits in queen_dict.items():
+            young_kits = [kit for kit in their_kits if kit.moons < 3]
+            if len(young_kits) > 0:
+                fed_kits.update(young_kits)
+                relevant_queens.append(Cat.fetch_cat(queen_id))
+        pregnant_cats = [cat for cat in living_cats if "pregnant" in cat.injuries and cat.ID not in queen_dict]
+        return queen_dict, fed_kits, relevant_queens, pregnant_cats
+
     def feed_group(self, group: list, not_moon_feeding = False, queens = False, fed_kits = None) -> None:
         """
         Handle the feeding giving cats.
@@ -448,6 +475,7 @@ class Freshkill_Pile():
 
         # first split nutrition information into low nutrition and satisfied
         ration_prey = game.clan.clan_settings["ration prey"] if game.clan else False
+        needed_prey = self._get_feeding_demand()
 
         # first feed the cats with the lowest nutrition
         for cat in group:
@@ -473,13 +501,13 @@ class Freshkill_Pile():
                 if ration_prey and status == "warrior":
                     feeding_amount = feeding_amount/2
 
-            if self.total_amount * 2 > self.amount_food_needed() and self.nutrition_info[cat.ID].percentage < 100:
+            if self.total_amount * 2 > needed_prey and self.nutrition_info[cat.ID].percentage < 100:
                 feeding_amount += 2
-            if self.total_amount * 1.8 > self.amount_food_needed() and self.nutrition_info[cat.ID].percentage < 100:
+            if self.total_amount * 1.8 > needed_prey and self.nutrition_info[cat.ID].percentage < 100:
                 feeding_amount += 1.5
-            elif self.total_amount * 1.2 > self.amount_food_needed() and self.nutrition_info[cat.ID].percentage < 100:
+            elif self.total_amount * 1.2 > needed_prey and self.nutrition_info[cat.ID].percentage < 100:
                 feeding_amount += 1
-            elif self.total_amount > self.amount_food_needed() and self.nutrition_info[cat.ID].percentage < 100:
+            elif self.total_amount > needed_prey and self.nutrition_info[cat.ID].percentage < 100:
                 feeding_amount += 0.5
 
             if not_moon_feeding:
@@ -505,7 +533,7 @@ class Freshkill_Pile():
         order = ["expires_in_1", "expires_in_2", "expires_in_3", "expires_in_4"]
         for key in order:
             remaining_amount = self.take_from_pile(key, remaining_amount)
-        self.already_fed.append(cat)
+        self.already_fed.add(cat)
 
         if remaining_amount > 0 and amount_difference == 0:
             self.nutrition_info[cat.ID].current_score -= remaining_amount
@@ -564,7 +592,8 @@ class Freshkill_Pile():
             living_cats : list
                 the list of the current living cats, where the nutrition should be stored
         """
-        old_nutrition_info = deepcopy(self.nutrition_info)
+        # the cats which are not in living_cats anymore are dropped, the nutrition of the others is kept
+        old_nutrition_info = self.nutrition_info
         self.nutrition_info = {}
         queen_dict, kits = get_alive_clan_queens(self.living_cats)
 
@@ -589,21 +618,24 @@ class Freshkill_Pile():
                     self.nutrition_info[cat.ID].max_score = required_max
                     self.nutrition_info[cat.ID].current_score = current_score / previous_max * required_max
             else:
-                self.add_cat_to_nutrition(cat)
+                self.add_cat_to_nutrition(cat, queen_dict)
 
-    def add_cat_to_nutrition(self, cat: Cat) -> None:
+    def add_cat_to_nutrition(self, cat: Cat, queen_dict: dict = None) -> None:
         """
             Parameters
             ----------
             cat : Cat
                 the cat, which should be added to the nutrition info
+            queen_dict : dict
+                the queens of the living cats, as returned by get_alive_clan_queens. Worked out if not given.
         """
         nutrition = Nutrition()
         factor = 3
         if str(cat.status) in ["newborn", "kitten", "elder"]:
             factor = 2
         
-        queen_dict, kits = get_alive_clan_queens(self.living_cats)
+        if queen_dict is None:
+            queen_dict, kits = get_alive_clan_queens(self.living_cats)
         prey_status = str(cat.status)
         if cat.ID in queen_dict.keys() or "pregnant" in cat.injuries:
             prey_status = "queen/pregnant"
@@ -9,6 +9,7 @@ TODO: Docs
   # pylint: enable=line-too-long
 
 from scripts.game_structure.game_essentials import game
+from scripts.cat.cat_index import CLAN
 from scripts.cat.skills import SkillPath
 
 
@@ -18,15 +19,20 @@ def medical_cats_condition_fulfilled(all_cats,
     """
     returns True if the player has enough meds for the whole clan
 
+    set all_cats to None to check the cats of the player's Clan, which is looked up in the cat index
     set give_clanmembers_covered to True to return the int of clanmembers that the meds can treat
     """
     
     fulfilled = False
     
-    medical_cats = [i for i in all_cats if not i.dead and not i.outside and not
-                                            i.not_working() and i.status in 
-                                            ["medicine cat", 
-                                             "medicine cat apprentice"]]
+    if all_cats is None:
+        medical_cats = [i for i in game.cat_class.index.with_status("medicine cat", "medicine cat apprentice")
+                        if not i.not_working()]
+    else:
+        medical_cats = [i for i in all_cats if not i.dead and not i.outside and not
+                                                i.not_working() and i.status in
+                                                ["medicine cat",
+                                                 "medicine cat apprentice"]]
     full_med = [i for i in medical_cats if i.status == "medicine cat"]
     apprentices = [i for i in medical_cats if i.status == "medicine cat apprentice"]
     
@@ -53,12 +59,14 @@ def medical_cats_condition_fulfilled(all_cats,
 
     can_care_for = int(adjust_med_number * (amount_per_med + 1))
 
-    relevant_cats = list(
-        filter(lambda c: not c.dead and not c.outside, all_cats))
+    if all_cats is None:
+        relevant_cat_count = game.cat_class.index.count(CLAN)
+    else:
+        relevant_cat_count = len([c for c in all_cats if not c.dead and not c.outside])
 
     if give_clanmembers_covered is True:
         return can_care_for
-    if can_care_for >= len(relevant_cats):
+    if can_care_for >= relevant_cat_count:
         fulfilled = True
     return fulfilled
 
@@ -107,7 +115,7 @@ class Illness:
         self.current_mortality = mortality
 
         amount_per_med = get_amount_cat_for_one_medic(game.clan)
-        if medical_cats_condition_fulfilled(game.cat_class.all_cats.values(),
+        if medical_cats_condition_fulfilled(None,
                                             amount_per_med):
             self.current_duration = medicine_duration
             self.current_mortality = medicine_mortality
@@ -125,7 +133,7 @@ class Illness:
         TODO: DOCS
         """
         amount_per_med = get_amount_cat_for_one_medic(game.clan)
-        if medical_cats_condition_fulfilled(game.cat_class.all_cats.values(),
+        if medical_cats_condition_fulfilled(None,
                                             amount_per_med):
             if value > self.medicine_duration:
                 value = self.medicine_duration
@@ -145,7 +153,7 @@ class Illness:
         TODO: DOCS
         """
         amount_per_med = get_amount_cat_for_one_medic(game.clan)
-        if medical_cats_condition_fulfilled(game.cat_class.all_cats.values(),
+        if medical_cats_condition_fulfilled(None,
                                             amount_per_med):
             if value < self.medicine_mortality:
                 value = self.medicine_mortality
@@ -191,7 +199,7 @@ class Injury:
         self.current_mortality = mortality
 
         amount_per_med = get_amount_cat_for_one_medic(game.clan)
-        if medical_cats_condition_fulfilled(game.cat_class.all_cats.values(),
+        if medical_cats_condition_fulfilled(None,
                                             amount_per_med):
             self.current_duration = medicine_duration
 
@@ -205,7 +213,7 @@ class Injury:
     @current_duration.setter
     def current_duration(self, value):
         amount_per_med = get_amount_cat_for_one_medic(game.clan)
-        if medical_cats_condition_fulfilled(game.cat_class.all_cats.values(),
+        if medical_cats_condition_fulfilled(None,
                                             amount_per_med):
             if value > self.medicine_duration:
                 value = self.medicine_duration
@@ -4,6 +4,8 @@ from scripts.debug_commands.settings import ToggleCommand, SetCommand, GetComman
 from scripts.debug_commands.eval import EvalCommand
 from scripts.debug_commands.fps import FpsCommand
 from scripts.debug_commands.cat import CatsCommand
+from scripts.debug_commands.profile import ProfileCommand
+from scripts.debug_commands.events import EventsCommand
 from typing import List
 
 commandList: List[Command] = [
@@ -12,7 +14,9 @@ commandList: List[Command] = [
     GetCommand(),
     EvalCommand(),
     FpsCommand(),
-    CatsCommand()
+    CatsCommand(),
+    ProfileCommand(),
+    EventsCommand()
 ]
 
 helpCommand = HelpCommand(commandList)
@@ -0,0 +1,104 @@
+from typing import List
+
+from scripts.debug_commands.command import Command
+from scripts.debug_commands.utils import add_output_line_to_log
+
+from scripts.game_structure.game_essentials import game
+from scripts.cat.cats import Cat
+
+
+def _get_archive():
+    if not game.clan:
+        add_output_line_to_log("No Clan loaded")
+        return None
+    return game.get_event_archive(game.clan.name)
+
+
+def _print_found(found):
+    if not found:
+        add_output_line_to_log("No events found")
+    for moon, event in found:
+        add_output_line_to_log(f"{moon:>4} [{', '.join(event.types)}] {event.text}")
+
+
+class moonsEventsCommand(Command):
+    name = "moons"
+    description = "List the moons in the event archive"
+
+    def callback(self, args: List[str]):
+        archive = _get_archive()
+        if archive is None:
+            return
+        moons = archive.get_moons()
+        if not moons:
+            add_output_line_to_log("The event archive is empty")
+            return
+        add_output_line_to_log(f"{len(moons)} moons archived, from moon {moons[0]} to {moons[-1]}")
+
+
+class moonEventsCommand(Command):
+    name = "moon"
+    description = "Show the archived events of a moon"
+    usage = "<moon>"
+
+    def callback(self, args: List[str]):
+        archive = _get_archive()
+        if archive is None:
+            return
+        if not args or not args[0].isnumeric():
+            add_output_line_to_log("Please specify a moon")
+            return
+        moon = int(args[0])
+        _print_found([(moon, event) for event in archive.get_moon(moon)])
+
+
+class catEventsCommand(Command):
+    name = "cat"
+    description = "Show the archived events involving a cat, newest first"
+    usage = "<cat name|id> [number]"
+
+    def callback(self, args: List[str]):
+        archive = _get_archive()
+        if archive is None:
+            return
+        if len(args) == 0:
+            add_output_line_to_log("Please specify a cat name or ID")
+            return
+        amount = int(args[1]) if len(args) > 1 and args[1].isnumeric() else 20
+        for cat in Cat.all_cats_list:
+            if str(cat.name).lower() == args[0].lower() or cat.ID == args[0]:
+                _print_found(archive.find(cat_id=cat.ID, limit=amount)[:amount])
+                return
+        add_output_line_to_log(f"Could not find cat with name or ID {args[0]}")
+
+
+class typeEventsCommand(Command):
+    name = "type"
+    description = "Show the archived events of a type, newest first"
+    usage = "<type> [number]"
+
+    def callback(self, args: List[str]):
+        archive = _get_archive()
+        if archive is None:
+            return
+        if len(args) == 0:
+            add_output_line_to_log("Please specify a type, like health or birth_death")
+            return
+        amount = int(args[1]) if len(args) > 1 and args[1].isnumeric() else 20
+        _print_found(archive.find(event_type=args[0], limit=amount)[:amount])
+
+
+class EventsCommand(Command):
+    name = "events"
+    description = "Search the events of earlier moons"
+    aliases = ["ev"]
+
+    subCommands = [
+        moonsEventsCommand(),
+        moonEventsCommand(),
+        catEventsCommand(),
+        typeEventsCommand()
+    ]
+
+    def callback(self, args: List[str]):
+        add_output_line_to_log("Please specify a subcommand")
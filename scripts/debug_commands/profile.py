@@ -0,0 +1,80 @@
+from typing import List
+
+from scripts.debug_commands.command import Command
+from scripts.debug_commands.utils import add_output_line_to_log
+
+from scripts.housekeeping.moon_profiler import moon_profiler
+
+
+class startProfileCommand(Command):
+    name = "start"
+    description = "Start recording the time spent in each phase of the moon skips"
+
+    def callback(self, args: List[str]):
+        from scripts.events import events_class
+        moon_profiler.start(events_class)
+        add_output_line_to_log("Moon profiler started, skip some moons and use 'profile report'")
+
+
+class stopProfileCommand(Command):
+    name = "stop"
+    description = "Stop recording, the recorded data is kept"
+
+    def callback(self, args: List[str]):
+        moon_profiler.stop()
+        add_output_line_to_log(f"Moon profiler stopped after {moon_profiler.moons} moons")
+
+
+class resetProfileCommand(Command):
+    name = "reset"
+    description = "Throw away the recorded data"
+
+    def callback(self, args: List[str]):
+        moon_profiler.reset()
+        add_output_line_to_log("Moon profiler data cleared")
+
+
+class reportProfileCommand(Command):
+    name = "report"
+    description = "Show the phases which took the most time"
+    usage = "[number of phases]"
+
+    def callback(self, args: List[str]):
+        report = moon_profiler.get_report()
+        if not report["moons"]:
+            add_output_line_to_log("No moons recorded yet")
+            return
+        amount = int(args[0]) if args and args[0].isnumeric() else 15
+
+        add_output_line_to_log(f"{report['moons']} moons, {report['total_time'] / report['moons'] * 1000:.1f} ms "
+                               f"per moon")
+        for phase in report["phases"][:amount]:
+            add_output_line_to_log(f"{phase['time_per_moon'] * 1000:8.2f} ms {phase['calls_per_moon']:7.1f}x "
+                                   f"{' > '.join(phase['path'][1:]) or phase['path'][0]}")
+
+
+class exportProfileCommand(Command):
+    name = "export"
+    description = "Save the report as JSON and as collapsed stacks for flame graphs"
+    usage = "[path]"
+
+    def callback(self, args: List[str]):
+        path = moon_profiler.export(args[0] if args else None)
+        add_output_line_to_log(f"Moon profile saved to {path}")
+
+
+class ProfileCommand(Command):
+    name = "profile"
+    description = "Profile the moon skips"
+    aliases = ["prof"]
+
+    subCommands = [
+        startProfileCommand(),
+        stopProfileCommand(),
+        resetProfileCommand(),
+        reportProfileCommand(),
+        exportProfileCommand()
+    ]
+
+    def callback(self, args: List[str]):
+        add_output_line_to_log("Please specify a subcommand")
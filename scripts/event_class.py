@@ -62,3 +62,115 @@ class Single_Event():
             types=dict.get("types", None),
             cats_involved=dict.get("cats_involved", None)
         )
+
+
+class EventList(list):
+    """The list used for game.cur_events_list. Works like a normal list of Single_Events, but also keeps the events of
+    each type and the events of each involved cat, so the events of a category or of one cat don't have to be found
+    by going through all events.
+
+    Appending, inserting and clearing keep the indexes up to date. After any other change, the indexes are built
+    again the next time they are needed."""
+
+    def __init__(self, events=()):
+        super().__init__(events)
+        # type: events of that type, in the order of the list
+        self.by_type = {}
+        # cat ID: events involving that cat, in the order of the list
+        self.by_cat = {}
+        self._indexed = False
+
+    def _index(self):
+        if self._indexed:
+            return
+        self.by_type = {}
+        self.by_cat = {}
+        for event in self:
+            self._add(event)
+        self._indexed = True
+
+    def _add(self, event, position=None):
+        """Adds the event to the indexes. If position is given, the event is inserted there in the list."""
+        for index, attribute in ((self.by_type, "types"), (self.by_cat, "cats_involved")):
+            for key in dict.fromkeys(getattr(event, attribute)):
+                events = index.setdefault(key, [])
+                if position is None:
+                    events.append(event)
+                else:
+                    # the event goes after the events with the same key which are before it in the list
+                    before = sum(1 for other in self[:position] if key in getattr(other, attribute))
+                    events.insert(before, event)
+
+    def append(self, event):
+        super().append(event)
+        if self._indexed:
+            self._add(event)
+
+    def extend(self, events):
+        for event in events:
+            self.append(event)
+
+    def __iadd__(self, events):
+        self.extend(events)
+        return self
+
+    def insert(self, position, event):
+        position = min(max(position + len(self), 0) if position < 0 else position, len(self))
+        if self._indexed:
+            self._add(event, position)
+        super().insert(position, event)
+
+    def clear(self):
+        super().clear()
+        self.by_type = {}
+        self.by_cat = {}
+        self._indexed = True
+
+    # ---------------------------------------------------------------------------- #
+    #          any other change builds the indexes again when they are needed      #
+    # ---------------------------------------------------------------------------- #
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._indexed = False
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._indexed = False
+
+    def pop(self, *index):
+        self._indexed = False
+        return super().pop(*index)
+
+    def remove(self, event):
+        super().remove(event)
+        self._indexed = False
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._indexed = False
+
+    def reverse(self):
+        super().reverse()
+        self._indexed = False
+
+    # ---------------------------------------------------------------------------- #
+    #                                    queries                                   #
+    # ---------------------------------------------------------------------------- #
+
+    def of_type(self, event_type) -> list:
+        """Returns the events of the type, in the order of the list."""
+        self._index()
+        return list(self.by_type.get(event_type, ()))
+
+    def without_type(self, event_type) -> list:
+        """Returns all events which aren't of the type, in the order of the list."""
+        self._index()
+        if event_type not in self.by_type:
+            return list(self)
+        return [event for event in self if event_type not in event.types]
+
+    def involving(self, cat_id) -> list:
+        """Returns the events involving the cat, in the order of the list."""
+        self._index()
+        return list(self.by_cat.get(cat_id, ()))
@@ -30,7 +30,7 @@ from scripts.events_module.death_events import Death_Events
 from scripts.events_module.freshkill_pile_events import Freshkill_Events
 # from scripts.events_module.disaster_events import DisasterEvents
 from scripts.events_module.outsider_events import OutsiderEvents
-from scripts.event_class import Single_Event
+from scripts.event_class import Single_Event, EventList
 from scripts.game_structure.game_essentials import game
 from scripts.utility import change_clan_relations, change_clan_reputation, get_alive_kits, get_med_cats, \
     ceremony_text_adjust, \
@@ -39,6 +39,7 @@ from scripts.utility import change_clan_relations, change_clan_reputation, get_a
 from scripts.events_module.generate_events import GenerateEvents, generate_events
 from scripts.events_module.relationship.pregnancy_events import Pregnancy_Events
 from scripts.game_structure.windows import SaveError
+from scripts.housekeeping.moon_profiler import moon_profiler
 
 
 class Events:
@@ -60,7 +61,11 @@ class Events:
         """
         Handles the moon skipping of the whole Clan.
         """
-        game.cur_events_list = []
+        moon_profiler.mark_phase("setup")
+        # the events of the last moon are kept in the archive, they are written with the next save
+        if game.clan.age > 0:
+            game.get_event_archive(game.clan.name).add_moon(game.clan.age, game.cur_events_list)
+        game.cur_events_list = EventList()
         game.herb_events_list = []
         game.freshkill_events_list = []
         game.mediated = []
@@ -88,6 +93,7 @@ class Events:
 
 
 
+        moon_profiler.mark_phase("freshkill")
         if game.clan.game_mode in ['expanded', 'cruel season'] and game.clan.freshkill_pile:
             # feed the cats and update the nutrient status
             relevant_cats = list(
@@ -106,11 +112,13 @@ class Events:
                 game.freshkill_event_list.append(event_string)
 
         # checking if a lost cat returns on their own
+        moon_profiler.mark_phase("lost_cats")
         rejoin_upperbound = game.config["lost_cat"]["rejoin_chance"]
         if random.randint(1, rejoin_upperbound) == 1:
             self.handle_lost_cats_return()
 
         # Calling of "one_moon" functions.
+        moon_profiler.mark_phase("cats")
         for cat in Cat.all_cats.copy().values():
             if not cat.outside or cat.dead:
                 self.one_moon_cat(cat)
@@ -118,6 +126,7 @@ class Events:
                 self.one_moon_outside_cat(cat)
 
         # Adding in any potential lead den events that have been saved
+        moon_profiler.mark_phase("lead_den")
         if "lead_den_interaction" in game.clan.clan_settings:
             if game.clan.clan_settings["lead_den_interaction"]:
                 self.handle_lead_den_event()
@@ -126,6 +135,7 @@ class Events:
         # self.disaster_events.handle_disasters()
 
         # Handle grief events.
+        moon_profiler.mark_phase("grief")
         if Cat.grief_strings:
             # Grab all the dead or outside cats, who should not have grief text
             for ID in Cat.grief_strings.copy():
@@ -203,14 +213,15 @@ class Events:
                                  [i.ID for i in shaken_cats]))
             Cat.dead_cats.clear()
 
+        moon_profiler.mark_phase("herbs_and_focus")
         self.herb_destruction()
         self.herb_gather()
         self.handle_focus()
 
+        moon_profiler.mark_phase("medicine_check")
         if game.clan.game_mode in ["expanded", "cruel season"]:
             amount_per_med = get_amount_cat_for_one_medic(game.clan)
-            med_fullfilled = medical_cats_condition_fulfilled(
-                Cat.all_cats.values(), amount_per_med)
+            med_fullfilled = medical_cats_condition_fulfilled(None, amount_per_med)
             if not med_fullfilled:
                 string = f"{game.clan.name}Clan does not have enough healthy medicine cats! Cats will be sick/hurt " \
                          f"for longer and have a higher chance of dying. "
@@ -228,17 +239,20 @@ class Events:
         game.just_died.clear()
 
         # Promote leader and deputy, if needed.
+        moon_profiler.mark_phase("promotions")
         self.check_and_promote_leader()
         self.check_and_promote_deputy()
 
         # Resort
+        moon_profiler.mark_phase("sort")
         if game.sort_type != "id":
             Cat.sort_cats()
 
-        # Clear all the loaded event dicts.
-        GenerateEvents.clear_loaded_events()
+        # Event files which changed since they were loaded are read again.
+        GenerateEvents.check_resources()
 
         # autosave
+        moon_profiler.mark_phase("autosave")
         if game.clan.clan_settings.get('autosave') and game.clan.age % 5 == 0:
             try:
                 game.save_cats()
@@ -1464,7 +1478,7 @@ class Events:
 
                     # check if the Clan has sufficient med cats
                     has_med = medical_cats_condition_fulfilled(
-                        Cat.all_cats.values(),
+                        None,
                         amount_per_med=get_amount_cat_for_one_medic(game.clan))
 
                     # check if a med cat app already exists
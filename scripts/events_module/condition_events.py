@@ -302,9 +302,9 @@ class Condition_Events():
                 log_text = text + effect
 
                 if cat.moons == 1:
-                    cat.relationships[other_cat.ID].log.append(log_text + f" - {cat.name} was {cat.moons} moon old")
+                    cat.relationships[other_cat.ID].add_log(log_text + f" - {cat.name} was {cat.moons} moon old")
                 else:
-                    cat.relationships[other_cat.ID].log.append(log_text + f" - {cat.name} was {cat.moons} moons old")
+                    cat.relationships[other_cat.ID].add_log(log_text + f" - {cat.name} was {cat.moons} moons old")
             game.cur_events_list.append(Single_Event(text, types, involved_cats))
 
         return triggered
@@ -843,7 +843,7 @@ class Condition_Events():
 
             # adjust chance of risk gain if Clan has enough meds
             chance = risk["chance"]
-            if medical_cats_condition_fulfilled(Cat.all_cats.values(),
+            if medical_cats_condition_fulfilled(None,
                                                 get_amount_cat_for_one_medic(game.clan)):
                 chance += 10  # lower risk if enough meds
             if game.clan.medicine_cat is None and chance != 0:
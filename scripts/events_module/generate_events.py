@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: ascii -*-
+import os
 import random
+from collections import OrderedDict
 
 import ujson
 from scripts.game_structure.game_essentials import game
@@ -13,7 +15,16 @@ resource_directory = "resources/dicts/events/"
 # ---------------------------------------------------------------------------- #
 
 class GenerateEvents:
-    loaded_events = {}
+    # Short events of each resource file, key is (event type, cat type, biome), value is (file path, stamp, events).
+    # They are kept over moons and only read again when the file changes, see check_resources.
+    loaded_events = OrderedDict()
+    # The possible short events of a cat type as returned by possible_short_events, key is
+    # (event type, cat type, biome). Built from the loaded events.
+    event_catalogs = OrderedDict()
+    # Parsed JSON of the other event files, key is the file path, value is (stamp, data)
+    loaded_files = OrderedDict()
+
+    CACHE_SIZE = game.config["event_generation"]["cache_size"]
 
     INJURY_DISTRIBUTION = None
     with open(f"resources/dicts/conditions/event_injuries_distribution.json", 'r') as read_file:
@@ -41,11 +52,7 @@ class GenerateEvents:
     def get_ongoing_event_dicts(file_path):
         events = None
         try:
-            with open(
-                    file_path,
-                    "r",
-            ) as read_file:
-                events = ujson.loads(read_file.read())
+            events = GenerateEvents._load_file(file_path)
         except:
             print(f"ERROR: Unable to load events from biome {file_path}.")
 
@@ -55,11 +62,7 @@ class GenerateEvents:
     def get_death_reaction_dicts(family_relation, rel_value):
         try:
             file_path = f"{resource_directory}/death/death_reactions/{family_relation}/{family_relation}_{rel_value}.json"
-            with open(
-                    file_path,
-                    "r",
-            ) as read_file:
-                events = ujson.loads(read_file.read())
+            events = GenerateEvents._load_file(file_path)
         except:
             events = None
             print(f"ERROR: Unable to load death reaction events for {family_relation}_{rel_value}.")
@@ -70,20 +73,67 @@ class GenerateEvents:
 
         try:
             file_path = f"{resource_directory}/leader_den/{'success' if success else 'fail'}/{event_type}.json"
-            with open(
-                    file_path,
-                    "r"
-            ) as read_file:
-                events = ujson.loads(read_file.read())
+            events = GenerateEvents._load_file(file_path)
         except:
             events = None
             print(f"ERROR: Unable to load lead den events for {event_type} {'success' if success else 'fail'}.")
 
         return events
 
+    # ---------------------------------------------------------------------------- #
+    #                                     cache                                    #
+    # ---------------------------------------------------------------------------- #
+
+    @staticmethod
+    def _get_file_stamp(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _add_to_cache(cache: OrderedDict, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > GenerateEvents.CACHE_SIZE:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _load_file(file_path):
+        """Returns the parsed JSON file, which is shared and must not be changed."""
+        if file_path in GenerateEvents.loaded_files:
+            GenerateEvents.loaded_files.move_to_end(file_path)
+            return GenerateEvents.loaded_files[file_path][1]
+
+        stamp = GenerateEvents._get_file_stamp(file_path)
+        with open(file_path, "r") as read_file:
+            data = ujson.loads(read_file.read())
+        GenerateEvents._add_to_cache(GenerateEvents.loaded_files, file_path, (stamp, data))
+        return data
+
+    @staticmethod
+    def check_resources():
+        """Drops the events of all resource files which were changed or removed since they were read,
+        so they are read again the next time they're needed."""
+        changed = False
+        for key, (file_path, stamp, _) in list(GenerateEvents.loaded_events.items()):
+            if GenerateEvents._get_file_stamp(file_path) != stamp:
+                del GenerateEvents.loaded_events[key]
+                changed = True
+        if changed:
+            GenerateEvents.event_catalogs.clear()
+
+        for file_path, (stamp, _) in list(GenerateEvents.loaded_files.items()):
+            if GenerateEvents._get_file_stamp(file_path) != stamp:
+                del GenerateEvents.loaded_files[file_path]
+
     @staticmethod
     def clear_loaded_events():
-        GenerateEvents.loaded_events = {}
+        """Drops all loaded events, so they are read again from the resource files."""
+        GenerateEvents.loaded_events.clear()
+        GenerateEvents.event_catalogs.clear()
+        GenerateEvents.loaded_files.clear()
 
     @staticmethod
     def generate_short_events(event_triggered, cat_type, biome):
@@ -95,15 +145,19 @@ class GenerateEvents:
         else:
             file_path = f"{resource_directory}{event_triggered}/{biome}/{cat_type}.json"
 
-        if file_path in GenerateEvents.loaded_events:
-            return GenerateEvents.loaded_events[file_path]
+        key = (event_triggered, cat_type, biome)
+        if key in GenerateEvents.loaded_events:
+            GenerateEvents.loaded_events.move_to_end(key)
+            return GenerateEvents.loaded_events[key][2]
         else:
+            stamp = GenerateEvents._get_file_stamp(file_path)
             events_dict = GenerateEvents.get_short_event_dicts(file_path)
 
             event_list = []
-            if not events_dict:
+            if events_dict is None and stamp is not None:
+                # the file is there but can't be read, try again next time
                 return event_list
-            for event in events_dict:
+            for event in events_dict or []:
                 event_text = event["event_text"] if "event_text" in event else None
                 if not event_text:
                     event_text = event["death_text"] if "death_text" in event else None
@@ -145,8 +199,8 @@ class GenerateEvents:
                 )
                 event_list.append(event)
 
-            # Add to loaded events.
-            GenerateEvents.loaded_events[file_path] = event_list
+            # Add to loaded events. Missing files are remembered as well, so they're not looked for every time.
+            GenerateEvents._add_to_cache(GenerateEvents.loaded_events, key, (file_path, stamp, event_list))
             return event_list
 
     @staticmethod
@@ -154,68 +208,54 @@ class GenerateEvents:
 
         file_path = f"resources/dicts/events/{event_type}/{biome}.json"
 
-        if file_path in GenerateEvents.loaded_events:
-            return GenerateEvents.loaded_events[file_path]
-        else:
-            events_dict = GenerateEvents.get_ongoing_event_dicts(file_path)
+        events_dict = GenerateEvents.get_ongoing_event_dicts(file_path)
 
-            if not specific_event:
-                event_list = []
-                for event in events_dict:
-                    event = OngoingEvent(
-                        event=event["event"],
-                        camp=event["camp"],
-                        season=event["season"],
-                        tags=event["tags"],
-                        priority=event["priority"],
-                        duration=event["duration"],
-                        current_duration=0,
-                        rarity=event["rarity"],
-                        trigger_events=event["trigger_events"],
-                        progress_events=event["progress_events"],
-                        conclusion_events=event["conclusion_events"],
-                        secondary_disasters=event["secondary_disasters"],
-                        collateral_damage=event["collateral_damage"]
-                    )
-                    event_list.append(event)
-                return event_list
-            else:
-                event = None
-                for event in events_dict:
-                    if event["event"] != specific_event:
-                        # print(event["event"], 'is not', specific_event)
-                        continue
-                    # print(event["event"], "is", specific_event)
-                    event = OngoingEvent(
-                        event=event["event"],
-                        camp=event["camp"],
-                        season=event["season"],
-                        tags=event["tags"],
-                        priority=event["priority"],
-                        duration=event["duration"],
-                        current_duration=0,
-                        progress_events=event["progress_events"],
-                        conclusion_events=event["conclusion_events"],
-                        collateral_damage=event["collateral_damage"]
-                    )
-                    break
-                return event
+        if not specific_event:
+            event_list = []
+            for event in events_dict:
+                event = OngoingEvent(
+                    event=event["event"],
+                    camp=event["camp"],
+                    season=event["season"],
+                    tags=event["tags"],
+                    priority=event["priority"],
+                    duration=event["duration"],
+                    current_duration=0,
+                    rarity=event["rarity"],
+                    trigger_events=event["trigger_events"],
+                    progress_events=event["progress_events"],
+                    conclusion_events=event["conclusion_events"],
+                    secondary_disasters=event["secondary_disasters"],
+                    collateral_damage=event["collateral_damage"]
+                )
+                event_list.append(event)
+            return event_list
+        else:
+            event = None
+            for event in events_dict:
+                if event["event"] != specific_event:
+                    # print(event["event"], 'is not', specific_event)
+                    continue
+                # print(event["event"], "is", specific_event)
+                event = OngoingEvent(
+                    event=event["event"],
+                    camp=event["camp"],
+                    season=event["season"],
+                    tags=event["tags"],
+                    priority=event["priority"],
+                    duration=event["duration"],
+                    current_duration=0,
+                    progress_events=event["progress_events"],
+                    conclusion_events=event["conclusion_events"],
+                    collateral_damage=event["collateral_damage"]
+                )
+                break
+            return event
 
     @staticmethod
     def possible_short_events(cat_type=None, age=None, event_type=None):
-        event_list = []
-        biome = None
-
-        excluded_from_general = []
-        warrior_adjacent_ranks = []
-
-        if event_type == 'death':
-            warrior_adjacent_ranks.extend(["deputy", "apprentice"])
-            excluded_from_general.extend(["kitten", "leader", "newborn"])
-        elif event_type in ['injury', 'nutrition', 'misc_events', 'new_cat']:
-            warrior_adjacent_ranks.extend(["deputy", "apprentice", "leader"])
-            excluded_from_general.extend(["kitten", "leader", "newborn"])
-
+        """Returns the short events which are possible for this cat type in the biome of the Clan.
+        The list is shared, it must not be changed."""
         if cat_type in ["medicine cat", "medicine cat apprentice"]:
             cat_type = "medicine"
         elif cat_type in ["mediator", "mediator apprentice"]:
@@ -226,14 +266,38 @@ class GenerateEvents:
             print(
                 f"WARNING: unrecognised cat status {cat_type} in generate_events. Have you added it to CAT_TYPES in "
                 f"clan.py?")
+            return []
 
         elif game.clan.biome not in game.clan.BIOME_TYPES:
             print(
                 f"WARNING: unrecognised biome {game.clan.biome} in generate_events. Have you added it to BIOME_TYPES "
                 f"in clan.py?")
+            return []
+
+        key = (event_type, cat_type, game.clan.biome)
+        if key not in GenerateEvents.event_catalogs:
+            GenerateEvents._add_to_cache(GenerateEvents.event_catalogs, key,
+                                         ShortEventCatalog(GenerateEvents._collect_short_events(cat_type, event_type)))
+        GenerateEvents.event_catalogs.move_to_end(key)
+        return GenerateEvents.event_catalogs[key]
+
+    @staticmethod
+    def _collect_short_events(cat_type, event_type):
+        event_list = []
+        biome = None
+
+        excluded_from_general = []
+        warrior_adjacent_ranks = []
+
+        if event_type == 'death':
+            warrior_adjacent_ranks.extend(["deputy", "apprentice"])
+            excluded_from_general.extend(["kitten", "leader", "newborn"])
+        elif event_type in ['injury', 'nutrition', 'misc_events', 'new_cat']:
+            warrior_adjacent_ranks.extend(["deputy", "apprentice", "leader"])
+            excluded_from_general.extend(["kitten", "leader", "newborn"])
 
         # NUTRITION this needs biome to be None so is handled separately
-        elif event_type == 'nutrition':
+        if event_type == 'nutrition':
             event_list.extend(
                 GenerateEvents.generate_short_events(event_type, cat_type, biome))
 
@@ -296,6 +360,9 @@ class GenerateEvents:
         else:
             war_event = False
 
+        if isinstance(possible_events, ShortEventCatalog):
+            possible_events = possible_events.candidates(cat, other_cat, war, war_event, murder, murder_reveal)
+
         for event in possible_events:
 
             # Normally, there is a chance to bypass skill and trait requirments. 
@@ -761,6 +828,99 @@ class ShortEvent:
         self.accessories = accessories
 
 
+class ShortEventCatalog(list):
+    """
+    The possible short events of one event type, cat type and biome, in the order they have in the resource files.
+    The events are indexed by the tags and the required traits and skills which filter_possible_short_events checks,
+    so it only has to look at the events which can pass these checks. The list is shared, it must not be changed.
+    """
+
+    # the tags which are checked in filter_possible_short_events before it rolls for anything
+    EARLY_TAGS = ("war", "hostile", "classic", "other_cat", "murder", "murder_reveal")
+
+    def __init__(self, events):
+        super().__init__(events)
+        self._all = frozenset(range(len(self)))
+        self._with_tag = {}
+        # positions of the events which can only happen to cats with one of their traits or skills
+        self._requires = set()
+        # positions of the events which roll for the traits and skills of the other cat
+        self._rolls_for_other_cat = set()
+        # ("trait", trait) or ("skill", skill path): positions of the events which need it
+        self._needed_by = {}
+
+        for position, event in enumerate(self):
+            for tag in event.tags:
+                self._with_tag.setdefault(tag, set()).add(position)
+
+            if "skill_trait_required" in event.tags and (event.cat_trait or event.cat_skill):
+                self._requires.add(position)
+                for trait in event.cat_trait:
+                    self._needed_by.setdefault(("trait", trait), set()).add(position)
+                for skill in event.cat_skill:
+                    self._needed_by.setdefault(("skill", skill.split(",")[0]), set()).add(position)
+            if event.other_cat_trait or event.other_cat_skill or event.other_cat_negate_trait:
+                self._rolls_for_other_cat.add(position)
+
+    def _tagged(self, tag: str) -> set:
+        return self._with_tag.get(tag, set())
+
+    @staticmethod
+    def _get_cat_keys(cat) -> list:
+        keys = [("trait", cat.personality.trait)]
+        for skill in (cat.skills.primary, cat.skills.secondary):
+            if skill:
+                keys.append(("skill", skill.path.name))
+        if cat.skills.hidden:
+            keys.append(("skill", cat.skills.hidden.name))
+        return keys
+
+    def candidates(self, cat, other_cat, war, war_event, murder, murder_reveal) -> list:
+        """Returns the events which aren't ruled out by their tags or by the traits and skills they need.
+        All checks are done again by filter_possible_short_events, this only skips events that can't pass them."""
+        excluded = set()
+
+        # these are checked before anything is rolled for
+        if war_event:
+            excluded |= self._all - self._tagged("war") - self._tagged("hostile")
+        if not war:
+            excluded |= self._tagged("war")
+        if game.clan.game_mode in ["expanded", "cruel season"]:
+            excluded |= self._tagged("classic")
+        if not other_cat:
+            excluded |= self._tagged("other_cat")
+        excluded |= (self._all - self._tagged("murder")) if murder else self._tagged("murder")
+        excluded |= (self._all - self._tagged("murder_reveal")) if murder_reveal else self._tagged("murder_reveal")
+
+        # these are checked after "all_lives" events rolled, so those are kept to roll the same way
+        late_excluded = self._all - self._tagged(game.clan.current_season)
+        if cat.status != "medicine cat":
+            late_excluded |= self._tagged("medicine_cat")
+        if cat.status != "medicine cat apprentice":
+            late_excluded |= self._tagged("medicine_cat_app")
+
+        # these are checked after elders rolled for the events which aren't "old_age" events, and after the rolls for
+        # the traits and skills of the other cat, so the events which roll are kept
+        last_excluded = set()
+        if not other_cat:
+            last_excluded |= self._tagged("multi_death")
+        if self._requires:
+            possible = set()
+            for key in self._get_cat_keys(cat):
+                possible |= self._needed_by.get(key, set())
+            last_excluded |= self._requires - possible
+            if other_cat:
+                last_excluded -= self._rolls_for_other_cat
+        if cat.moons > game.config["death_related"]["old_age_death_start"]:
+            last_excluded &= self._tagged("old_age")
+        late_excluded |= last_excluded
+        excluded |= late_excluded - self._tagged("all_lives")
+
+        if not excluded:
+            return self
+        return [self[position] for position in sorted(self._all - excluded)]
+
+
 """
 Tagging Guidelines: (if you add more tags, please add guidelines for them here) 
 "Newleaf", "Greenleaf", "Leaf-fall", "Leaf-bare" < specify season.  If event happens in all seasons then include all of those tags.
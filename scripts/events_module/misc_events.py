@@ -114,9 +114,9 @@ class MiscEvents():
                     other_cat.relationships[cat.ID] = Relationship(other_cat, cat)
 
                 if cat.moons == 1:
-                    cat.relationships[other_cat.ID].log.append(log_text + f" - {cat.name} was {cat.moons} moon old")
+                    cat.relationships[other_cat.ID].add_log(log_text + f" - {cat.name} was {cat.moons} moon old")
                 else:
-                    cat.relationships[other_cat.ID].log.append(log_text + f" - {cat.name} was {cat.moons} moons old")
+                    cat.relationships[other_cat.ID].add_log(log_text + f" - {cat.name} was {cat.moons} moons old")
 
         types = ["misc"]
         if "other_clan" in misc_event.tags:
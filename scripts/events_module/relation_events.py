@@ -7,6 +7,7 @@ import ujson
 from scripts.game_structure.game_essentials import game
 from scripts.events_module.condition_events import Condition_Events
 from scripts.cat.cats import Cat
+from scripts.cat.cat_index import CLAN
 from scripts.utility import get_cats_same_age, get_cats_of_romantic_interest, get_free_possible_mates
 from scripts.event_class import Single_Event
 from scripts.cat_relations.relationship import Relationship
@@ -166,14 +167,7 @@ class Relation_Events():
 
         if cat.status == "leader":
             chosen_type = "all"
-        possible_interaction_cats = list(
-            filter(
-                lambda cat:
-                (not cat.dead and not cat.outside and not cat.exiled),
-                Cat.all_cats.values())
-        )
-        if cat in possible_interaction_cats:
-            possible_interaction_cats.remove(cat)
+        possible_interaction_cats = [inter_cat for inter_cat in Cat.index.cats(CLAN) if inter_cat.ID != cat.ID]
 
         if chosen_type != "all":
             possible_interaction_cats = Relation_Events.cats_with_relationship_constraints(cat,
@@ -207,7 +201,7 @@ class Relation_Events():
 
         for new_cat in new_cats:
             same_age_cats = get_cats_same_age(new_cat)
-            alive_cats = [i for i in new_cat.all_cats.values() if not i.dead and not i.outside]
+            alive_cats = list(new_cat.index.cats(CLAN))
             number = game.config["new_cat"]["cat_amount_welcoming"]
 
             if len(alive_cats) == 0:
@@ -244,13 +238,7 @@ class Relation_Events():
     @staticmethod
     def cats_with_relationship_constraints(main_cat, constraint):
         """Returns a list of cats, where the relationship from main_cat towards the cat fulfill the given constraints."""
-        cat_list = list(
-            filter(
-                lambda cat:
-                (not cat.dead and not cat.outside and not cat.exiled),
-                Cat.all_cats.values())
-        )
-        cat_list.remove(main_cat)
+        cat_list = [inter_cat for inter_cat in Cat.index.cats(CLAN) if inter_cat.ID != main_cat.ID]
         filtered_cat_list = []
         
         for inter_cat in cat_list:
@@ -262,6 +262,9 @@ class Group_Events():
             new_key = "r_c" + str(integer+1)
             base_dictionary[new_key] = []
 
+        cat_ids = [cat.ID for cat in interact_cats]
+        all_ids = set(cat_ids)
+
         # iterate over all interactions and checks for each abbreviation, which cat is possible
         for interact in interactions:
             dictionary = deepcopy(base_dictionary)
@@ -272,27 +275,28 @@ class Group_Events():
                 skill_ids = []
                 trait_ids = []
 
+                # the ids are kept in sets, so checking if a cat is in all of them doesn't go through the whole Clan
                 # if the abbreviation has a status constraint, check in details
                 if abbreviation in interact.status_constraint:
                     # if the cat status is in the status constraint, add the id to the list
-                    status_ids = [cat.ID for cat in interact_cats if cat.status in interact.status_constraint[abbreviation]]
+                    status_ids = {cat.ID for cat in interact_cats if cat.status in interact.status_constraint[abbreviation]}
                 else:
                     # if there is no constraint, add all ids to the list 
-                    status_ids = [cat.ID for cat in interact_cats]
+                    status_ids = all_ids
 
                 # same as status
                 if abbreviation in interact.skill_constraint:
-                    skill_ids = [cat.ID for cat in interact_cats if cat.skill in interact.skill_constraint[abbreviation]]
+                    skill_ids = {cat.ID for cat in interact_cats if cat.skill in interact.skill_constraint[abbreviation]}
                 else:
-                    skill_ids = [cat.ID for cat in interact_cats]
+                    skill_ids = all_ids
 
                 if abbreviation in interact.trait_constraint:
-                    trait_ids = [cat.ID for cat in interact_cats if cat.personality.trait in interact.trait_constraint[abbreviation]]
+                    trait_ids = {cat.ID for cat in interact_cats if cat.personality.trait in interact.trait_constraint[abbreviation]}
                 else:
-                    trait_ids = [cat.ID for cat in interact_cats]
+                    trait_ids = all_ids
 
                 # only add the id if it is in all other lists
-                for cat_id in [cat.ID for cat in interact_cats]:
+                for cat_id in cat_ids:
                     if cat_id in status_ids and cat_id in skill_ids and cat_id in trait_ids:
                         dictionary[abbreviation].append(cat_id)
 
@@ -12,6 +12,7 @@ from scripts.utility import (
 )
 from scripts.game_structure.game_essentials import game
 from scripts.cat.cats import Cat, cat_class
+from scripts.cat.cat_index import CLAN
 from scripts.event_class import Single_Event
 from scripts.cat_relations.relationship import Relationship
 from scripts.events_module.condition_events import Condition_Events
@@ -23,6 +24,8 @@ class Pregnancy_Events():
     """All events which are related to pregnancy such as kitting and defining who are the parents."""
    
     biggest_family = {}
+    # generation of the family graph the biggest family was found at
+    biggest_family_generation = None
     
     PREGNANT_STRINGS = None
     with open(f"resources/dicts/conditions/pregnancy.json", 'r') as read_file:
@@ -30,10 +33,15 @@ class Pregnancy_Events():
    
     @staticmethod
     def set_biggest_family():
-        """Gets the biggest family of the clan."""
+        """Gets the biggest family of the clan. It's only searched again if the family graph changed since."""
+        if Pregnancy_Events.biggest_family and \
+                Pregnancy_Events.biggest_family_generation == Cat.family_graph.generation:
+            return
+
         biggest_family = None
         for cat in Cat.all_cats.values():
-            ancestors = cat.get_relatives()
+            # a copy, the list of the inheritance must not get the cat itself
+            ancestors = list(cat.get_relatives())
             if not biggest_family:
                 biggest_family = ancestors
                 biggest_family.append(cat.ID)
@@ -41,11 +49,12 @@ class Pregnancy_Events():
                 biggest_family = ancestors
                 biggest_family.append(cat.ID)
         Pregnancy_Events.biggest_family = biggest_family
+        Pregnancy_Events.biggest_family_generation = Cat.family_graph.generation
 
     @staticmethod
     def biggest_family_is_big():
         """Returns if the current biggest family is big enough to 'activates' additional inbreeding counters."""
-        living_cats = len([i for i in Cat.all_cats.values() if not (i.dead or i.outside or i.exiled)])
+        living_cats = Cat.index.count(CLAN)
         return len(Pregnancy_Events.biggest_family) > (living_cats/10)
 
     @staticmethod
@@ -245,11 +245,11 @@ class Romantic_Events():
         ))
 
         # now add the age of the cats before the string is sent to the cats' relationship logs
-        relationship.log.append(interaction_str + f" - {cat_from.name} was {cat_from.moons} moons old")
+        relationship.add_log(interaction_str + f" - {cat_from.name} was {cat_from.moons} moons old")
 
         if not relationship.opposite_relationship and cat_from.ID != cat_to.ID:
             relationship.link_relationship()
-            relationship.opposite_relationship.log.append(interaction_str + f" - {cat_to.name} was {cat_to.moons} moons old")
+            relationship.opposite_relationship.add_log(interaction_str + f" - {cat_to.name} was {cat_to.moons} moons old")
 
         #print(f"ROMANTIC! {cat_from.name} to {cat_to.name}")
         return True
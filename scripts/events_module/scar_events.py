@@ -100,7 +100,7 @@ class Scar_Events():
         chance = max(5 - moons_with, 1)
         
         amount_per_med = get_amount_cat_for_one_medic(game.clan)
-        if medical_cats_condition_fulfilled(game.cat_class.all_cats.values(), amount_per_med):
+        if medical_cats_condition_fulfilled(None, amount_per_med):
             chance += 2
         
         if len(cat.pelt.scars) < 4 and not int(random.random() * chance):
@@ -0,0 +1,277 @@
+"""
+Storage for the save data which is kept per cat: relationships, history, conditions and the old relationship log
+entries.
+
+There are two layouts:
+ - JSON: one file per cat and kind, in the folders named in STORAGE_KINDS. This is the default and the layout all
+   older saves use.
+ - single file: all rows in one SQLite database "clan_data.db" in the Clan folder. A save is one transaction, and
+   only the rows which changed since they were last read or written are written again.
+
+Use Game.get_clan_storage to get the storage of a Clan, and convert_clan_storage to switch between the layouts.
+
+When a Clan is loaded, prefetch lets the storage read the data of all cats in the background, while the cats are
+still being made. The next read of a prefetched cat gets the data which was read ahead.
+"""
+import os
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Tuple
+
+import ujson
+
+SQLITE_FILE_NAME = "clan_data.db"
+# number of threads reading the files of the JSON layout ahead
+PREFETCH_THREADS = min(8, (os.cpu_count() or 1) + 2)
+
+# kind: (folder name, file suffix) of the JSON layout
+STORAGE_KINDS = {
+    "relationships": ("relationships", "_relations.json"),
+    "history": ("history", "_history.json"),
+    "conditions": ("conditions", "_conditions.json"),
+    "relationship_logs": ("relationship_logs", "_relation_logs.json"),
+}
+
+
+class JsonClanStorage():
+    """One JSON file per cat and kind."""
+    single_file = False
+
+    def __init__(self, clan_dir: str, save_file: Callable):
+        self.clan_dir = clan_dir
+        # the function used to write a file, takes the path and the data
+        self.save_file = save_file
+        # (kind, cat ID): the file being read ahead
+        self._prefetched: Dict[Tuple[str, str], Future] = {}
+
+    def _dir(self, kind: str) -> str:
+        return f"{self.clan_dir}/{STORAGE_KINDS[kind][0]}"
+
+    def _path(self, kind: str, cat_id: str) -> str:
+        return f"{self._dir(kind)}/{cat_id}{STORAGE_KINDS[kind][1]}"
+
+    def has_kind(self, kind: str) -> bool:
+        """Returns True if there was ever any data of this kind saved."""
+        return os.path.exists(self._dir(kind))
+
+    def read(self, kind: str, cat_id: str):
+        """Returns the saved data of the cat, or None if there is none."""
+        prefetched = self._prefetched.pop((kind, cat_id), None)
+        text = prefetched.result() if prefetched is not None else self._read_text(kind, cat_id)
+        return ujson.loads(text) if text is not None else None
+
+    def _read_text(self, kind: str, cat_id: str):
+        path = self._path(kind, cat_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as read_file:
+            return read_file.read()
+
+    def read_all(self, kind: str) -> Dict[str, object]:
+        """Returns the saved data of all cats, keyed by the cat ID."""
+        if not self.has_kind(kind):
+            return {}
+        suffix = STORAGE_KINDS[kind][1]
+        all_data = {}
+        for file_name in os.listdir(self._dir(kind)):
+            if file_name.endswith(suffix):
+                cat_id = file_name[:-len(suffix)]
+                all_data[cat_id] = self.read(kind, cat_id)
+        return all_data
+
+    def prefetch(self, kind: str, cat_ids: Iterable[str]):
+        """Starts reading the files of the cats in the background. Reading a file mostly waits on the disk, so
+        several files are read at the same time. Only the text is read ahead, it's parsed when it is asked for:
+        parsing in the background would only make the threads wait on each other."""
+        if not self.has_kind(kind):
+            return
+        pool = ThreadPoolExecutor(max_workers=PREFETCH_THREADS, thread_name_prefix="clan_storage")
+        for cat_id in cat_ids:
+            if (kind, cat_id) not in self._prefetched:
+                self._prefetched[(kind, cat_id)] = pool.submit(self._read_text, kind, cat_id)
+        # the threads end once all files are read
+        pool.shutdown(wait=False)
+
+    def clear_prefetched(self):
+        """Forgets the data read ahead which wasn't asked for."""
+        for prefetched in self._prefetched.values():
+            prefetched.cancel()
+        self._prefetched = {}
+
+    def write(self, kind: str, rows: Dict[str, object], delete_ids: Iterable[str] = (), replace: bool = False):
+        """Saves the rows, keyed by the cat ID. The data of cats in delete_ids is removed.
+        If replace is True, the data of all cats which are not in rows is removed."""
+        directory = self._dir(kind)
+        os.makedirs(directory, exist_ok=True)
+        # what was read ahead may not be what is saved anymore
+        self.clear_prefetched()
+
+        saved_ids = set(self.read_ids(kind))
+        if replace:
+            delete_ids = [cat_id for cat_id in saved_ids if cat_id not in rows]
+        for cat_id in delete_ids:
+            if cat_id in saved_ids:
+                os.remove(self._path(kind, cat_id))
+
+        # the save function skips files whose content didn't change
+        for cat_id, data in rows.items():
+            self.save_file(self._path(kind, cat_id), data)
+
+    @contextmanager
+    def batch(self):
+        """Groups several writes. The JSON files are written one by one, so there is nothing to group."""
+        yield self
+
+    def read_ids(self, kind: str):
+        if not self.has_kind(kind):
+            return []
+        suffix = STORAGE_KINDS[kind][1]
+        return [file_name[:-len(suffix)] for file_name in os.listdir(self._dir(kind)) if file_name.endswith(suffix)]
+
+    def remove(self):
+        """Deletes all data of this storage."""
+        self.clear_prefetched()
+        for kind in STORAGE_KINDS:
+            if not self.has_kind(kind):
+                continue
+            for file_name in os.listdir(self._dir(kind)):
+                os.remove(os.path.join(self._dir(kind), file_name))
+            os.rmdir(self._dir(kind))
+
+
+class SqliteClanStorage():
+    """All cats in one SQLite file. Each kind is a table with one row per cat."""
+    single_file = True
+
+    def __init__(self, clan_dir: str):
+        self.clan_dir = clan_dir
+        self.path = f"{clan_dir}/{SQLITE_FILE_NAME}"
+        # the JSON text of each row as it is in the file, so unchanged rows don't have to be written again
+        self._saved_rows: Dict[str, Dict[str, str]] = {}
+        # modification time and size of the file when the rows were read or written
+        self._file_stamp = None
+        # open connection while in a batch
+        self._batch_connection = None
+
+    def _get_file_stamp(self):
+        if not os.path.exists(self.path):
+            return None
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.clan_dir, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        for kind in STORAGE_KINDS:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {kind} (cat_id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        return connection
+
+    def _rows(self, kind: str) -> Dict[str, str]:
+        if self._batch_connection is not None:
+            if kind not in self._saved_rows:
+                self._saved_rows[kind] = self._select_rows(self._batch_connection, kind)
+            return self._saved_rows[kind]
+
+        # if the file was changed or removed by something else, the known rows can't be trusted anymore
+        if self._get_file_stamp() != self._file_stamp:
+            self._saved_rows = {}
+            self._file_stamp = self._get_file_stamp()
+
+        if kind not in self._saved_rows:
+            if not os.path.exists(self.path):
+                return {}
+            connection = self._connect()
+            try:
+                self._saved_rows[kind] = self._select_rows(connection, kind)
+            finally:
+                connection.close()
+        return self._saved_rows[kind]
+
+    @staticmethod
+    def _select_rows(connection: sqlite3.Connection, kind: str) -> Dict[str, str]:
+        return dict(connection.execute(f"SELECT cat_id, data FROM {kind}").fetchall())
+
+    def has_kind(self, kind: str) -> bool:
+        return os.path.exists(self.path)
+
+    def read(self, kind: str, cat_id: str):
+        data = self._rows(kind).get(cat_id)
+        return ujson.loads(data) if data is not None else None
+
+    def read_all(self, kind: str) -> Dict[str, object]:
+        return {cat_id: ujson.loads(data) for cat_id, data in self._rows(kind).items()}
+
+    def read_ids(self, kind: str):
+        return list(self._rows(kind))
+
+    def prefetch(self, kind: str, cat_ids: Iterable[str]):
+        """All rows of a kind are read at once when the first one is asked for, so this only reads them now."""
+        self._rows(kind)
+
+    def clear_prefetched(self):
+        pass
+
+    def write(self, kind: str, rows: Dict[str, object], delete_ids: Iterable[str] = (), replace: bool = False):
+        saved_rows = dict(self._rows(kind))
+
+        if replace:
+            delete_ids = [cat_id for cat_id in saved_rows if cat_id not in rows]
+        delete_ids = [cat_id for cat_id in delete_ids if cat_id in saved_rows]
+
+        changed_rows = []
+        for cat_id, data in rows.items():
+            data = ujson.dumps(data)
+            if saved_rows.get(cat_id) != data:
+                changed_rows.append((cat_id, data))
+
+        if not changed_rows and not delete_ids:
+            self._saved_rows[kind] = saved_rows
+            return
+
+        with self.batch() as connection:
+            connection.executemany(f"INSERT OR REPLACE INTO {kind} (cat_id, data) VALUES (?, ?)", changed_rows)
+            connection.executemany(f"DELETE FROM {kind} WHERE cat_id = ?", [(i,) for i in delete_ids])
+
+            saved_rows.update(changed_rows)
+            for cat_id in delete_ids:
+                saved_rows.pop(cat_id, None)
+            self._saved_rows[kind] = saved_rows
+
+    @contextmanager
+    def batch(self):
+        """All writes inside the batch are done in one transaction."""
+        if self._batch_connection is not None:
+            yield self._batch_connection
+            return
+
+        if self._get_file_stamp() != self._file_stamp:
+            self._saved_rows = {}
+        self._batch_connection = self._connect()
+        try:
+            with self._batch_connection:
+                yield self._batch_connection
+        except BaseException:
+            # the transaction was rolled back, so the known rows are not the rows in the file anymore
+            self._saved_rows = {}
+            raise
+        finally:
+            self._batch_connection.close()
+            self._batch_connection = None
+            self._file_stamp = self._get_file_stamp()
+
+    def remove(self):
+        self._saved_rows = {}
+        self._file_stamp = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def convert_clan_storage(source, target):
+    """Copies all data from the source storage into the target storage, and removes the source afterwards.
+    This works both ways, from JSON files into the single file and back."""
+    with target.batch():
+        for kind in STORAGE_KINDS:
+            target.write(kind, source.read_all(kind), replace=True)
+    source.remove()
+    return target
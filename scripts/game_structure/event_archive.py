@@ -0,0 +1,228 @@
+"""
+The events of earlier moons of a Clan.
+
+game.cur_events_list only holds the events of the current moon. Before a moon skip clears it, the events are given to
+the archive of the Clan, and written to the save folder the next time the Clan is saved.
+
+The archive is in the folder "event_archive" of the Clan:
+ - segment files "moons_<first>-<last>.ndjson", one for every moons_per_segment moons. Each line is one event as JSON,
+   with the moon it happened in. The moons of a segment are in order, so new moons are only appended.
+ - "index.json": where each moon starts in its segment and how many events it has, and in which moons there are
+   events of each type and events involving each cat.
+Only the index is kept in memory. The events of a moon are read from its segment when they are asked for.
+
+If an older save of the Clan is loaded and moons are skipped again, the archived moons from there on are replaced,
+by cutting the segment files at the first replaced moon.
+"""
+import bisect
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import ujson
+
+from scripts.event_class import Single_Event
+
+ARCHIVE_FOLDER = "event_archive"
+INDEX_FILE_NAME = "index.json"
+
+
+class EventArchive():
+
+    def __init__(self, clan_dir: str, save_file: Callable, moons_per_segment: int = 10):
+        self.directory = f"{clan_dir}/{ARCHIVE_FOLDER}"
+        self.index_path = f"{self.directory}/{INDEX_FILE_NAME}"
+        # the function used to write the index, takes the path and the data
+        self.save_file = save_file
+        # only used for new archives, an existing archive keeps the number it was made with
+        self.new_moons_per_segment = moons_per_segment
+
+        self.moons_per_segment = moons_per_segment
+        # moon: (offset in its segment file, number of events)
+        self.moons: Dict[int, Tuple[int, int]] = {}
+        # type: moons with events of that type, in order
+        self.types: Dict[str, List[int]] = {}
+        # cat ID: moons with events involving that cat, in order
+        self.cats: Dict[str, List[int]] = {}
+        # modification time and size of the index file when it was read or written
+        self._file_stamp = None
+        self._loaded = False
+
+        # moon: events of the moons which were skipped since the last save
+        self.pending: Dict[int, List[Single_Event]] = {}
+
+    # ---------------------------------------------------------------------------- #
+    #                                     index                                    #
+    # ---------------------------------------------------------------------------- #
+
+    def _get_file_stamp(self):
+        if not os.path.exists(self.index_path):
+            return None
+        stat = os.stat(self.index_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_index(self):
+        # if the index was changed or removed by something else, e.g. the Clan was deleted, it's read again
+        if self._loaded and self._get_file_stamp() == self._file_stamp:
+            return
+        self._loaded = True
+        self._file_stamp = self._get_file_stamp()
+        self.moons = {}
+        self.types = {}
+        self.cats = {}
+        self.moons_per_segment = self.new_moons_per_segment
+        if self._file_stamp is None:
+            return
+
+        try:
+            with open(self.index_path, 'r') as read_file:
+                index = ujson.loads(read_file.read())
+        except (OSError, ValueError):
+            print(f"WARNING: the event archive index {self.index_path} can't be read, the archive is started again")
+            return
+        self.moons_per_segment = index.get("moons_per_segment", self.moons_per_segment)
+        self.moons = {moon: (offset, count) for moon, offset, count in index.get("moons", [])}
+        self.types = index.get("types", {})
+        self.cats = index.get("cats", {})
+
+    def _save_index(self):
+        self.save_file(self.index_path, {
+            "moons_per_segment": self.moons_per_segment,
+            "moons": [[moon, offset, count] for moon, (offset, count) in sorted(self.moons.items())],
+            "types": self.types,
+            "cats": self.cats
+        })
+        self._file_stamp = self._get_file_stamp()
+
+    def _segment_path(self, moon: int) -> str:
+        first = moon - moon % self.moons_per_segment
+        return f"{self.directory}/moons_{first}-{first + self.moons_per_segment - 1}.ndjson"
+
+    # ---------------------------------------------------------------------------- #
+    #                                    writing                                   #
+    # ---------------------------------------------------------------------------- #
+
+    def add_moon(self, moon: int, events: Iterable[Single_Event]):
+        """Keeps the events of the moon until the next save. Moons after it which weren't saved yet are thrown
+        away, they are from a save which was loaded again."""
+        for pending_moon in [pending_moon for pending_moon in self.pending if pending_moon > moon]:
+            del self.pending[pending_moon]
+        self.pending[moon] = list(events)
+
+    def save(self):
+        """Writes the moons which were added since the last save."""
+        if not self.pending:
+            return
+        self._load_index()
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._cut(min(self.pending))
+        for moon in sorted(self.pending):
+            with open(self._segment_path(moon), 'ab') as write_file:
+                offset = write_file.tell()
+                for event in self.pending[moon]:
+                    line = ujson.dumps(self._event_to_line(moon, event), ensure_ascii=False) + "\n"
+                    write_file.write(line.encode('utf-8'))
+
+            self.moons[moon] = (offset, len(self.pending[moon]))
+            for index, keys in ((self.types, {key for event in self.pending[moon] for key in event.types}),
+                                (self.cats, {key for event in self.pending[moon] for key in event.cats_involved})):
+                for key in keys:
+                    index.setdefault(key, []).append(moon)
+        self.pending = {}
+        self._save_index()
+
+    def _cut(self, first_moon: int):
+        """Removes the archived moons from first_moon on."""
+        removed = sorted(moon for moon in self.moons if moon >= first_moon)
+        if not removed:
+            return
+
+        segments = {}
+        for moon in removed:
+            segments.setdefault(self._segment_path(moon), moon)
+        for path, moon in segments.items():
+            if not os.path.exists(path):
+                continue
+            offset = self.moons[moon][0]
+            if offset == 0:
+                os.remove(path)
+            else:
+                with open(path, 'r+b') as write_file:
+                    write_file.truncate(offset)
+
+        for moon in removed:
+            del self.moons[moon]
+        for index in (self.types, self.cats):
+            for key in list(index):
+                index[key] = index[key][:bisect.bisect_left(index[key], first_moon)]
+                if not index[key]:
+                    del index[key]
+
+    @staticmethod
+    def _event_to_line(moon: int, event: Single_Event) -> dict:
+        line = {"moon": moon, "text": event.text}
+        if event.types:
+            line["types"] = event.types
+        if event.cats_involved:
+            line["cats_involved"] = event.cats_involved
+        return line
+
+    # ---------------------------------------------------------------------------- #
+    #                                    reading                                   #
+    # ---------------------------------------------------------------------------- #
+
+    def get_moons(self) -> List[int]:
+        """Returns the moons in the archive, the ones which weren't saved yet included."""
+        self._load_index()
+        return sorted(set(self.moons) | set(self.pending))
+
+    def get_moon(self, moon: int) -> List[Single_Event]:
+        """Returns the events of the moon, in the order they were shown."""
+        if moon in self.pending:
+            return list(self.pending[moon])
+        self._load_index()
+        if moon not in self.moons:
+            return []
+
+        offset, count = self.moons[moon]
+        events = []
+        try:
+            with open(self._segment_path(moon), 'rb') as read_file:
+                read_file.seek(offset)
+                for _ in range(count):
+                    event = Single_Event.from_dict(ujson.loads(read_file.readline()))
+                    if event:
+                        events.append(event)
+        except (OSError, ValueError):
+            print(f"WARNING: the archived events of moon {moon} can't be read")
+        return events
+
+    def find(self, cat_id: str = None, event_type: str = None, before_moon: int = None,
+             limit: Optional[int] = None) -> List[Tuple[int, Single_Event]]:
+        """Returns (moon, event) of the archived events which involve the cat and are of the type, if they are given.
+        The newest moons come first, the events of a moon are in the order they were shown.
+        Only moons before before_moon are searched, and the search stops after limit events."""
+        self._load_index()
+        moons = set(self.moons)
+        if cat_id is not None:
+            moons.intersection_update(self.cats.get(cat_id, ()))
+        if event_type is not None:
+            moons.intersection_update(self.types.get(event_type, ()))
+        for moon, events in self.pending.items():
+            if (cat_id is None or any(cat_id in event.cats_involved for event in events)) and \
+                    (event_type is None or any(event_type in event.types for event in events)):
+                moons.add(moon)
+
+        found = []
+        for moon in sorted(moons, reverse=True):
+            if before_moon is not None and moon >= before_moon:
+                continue
+            for event in self.get_moon(moon):
+                if cat_id is not None and cat_id not in event.cats_involved:
+                    continue
+                if event_type is not None and event_type not in event.types:
+                    continue
+                found.append((moon, event))
+            if limit is not None and len(found) >= limit:
+                break
+        return found
@@ -0,0 +1,26 @@
+import pygame
+
+_fonts = {}
+# (path, size): {character: width}
+_char_widths = {}
+
+
+def load_font(path, size):
+    """
+    If not in the cache already, loads the font from path in the given size.
+    Otherwise, the font is retrieved from the cache.
+    """
+    if (path, size) not in _fonts:
+        _fonts[(path, size)] = pygame.font.Font(path, size)
+    return _fonts[(path, size)]
+
+
+def get_text_width(path, size, text):
+    """
+    Returns the width of the text in the font, as given by font.size.
+    The widths are kept, so each text is only measured once per font.
+    """
+    widths = _char_widths.setdefault((path, size), {})
+    if text not in widths:
+        widths[text] = load_font(path, size).size(text)[0]
+    return widths[text]
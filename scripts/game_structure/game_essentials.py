@@ -7,7 +7,15 @@ import ujson
 import os
 from shutil import move as shutil_move
 from ast import literal_eval
-from scripts.event_class import Single_Event
+from scripts.event_class import Single_Event, EventList
+from scripts.game_structure.clan_storage import (
+    JsonClanStorage,
+    SqliteClanStorage,
+    SQLITE_FILE_NAME,
+    convert_clan_storage
+)
+from scripts.game_structure.event_archive import EventArchive
+from scripts.cat.history_store import HistoryStore
 
 pygame.init()
 
@@ -25,7 +33,7 @@ class Game():
     mediated = []  # Keep track of which couples have been mediated this moon.
     just_died = []  # keeps track of which cats died this moon via die()
 
-    cur_events_list = []
+    cur_events_list = EventList()  # the events of this moon, indexed by type and involved cat
     ceremony_events_list = []
     birth_death_events_list = []
     relation_events_list = []
@@ -42,6 +50,8 @@ class Game():
     game_mode_list = ['classic', 'expanded', 'cruel season']
 
     cat_to_fade = []
+    # how far the cats of the Clan are loaded, from 0 to 1, or None before loading starts. Shown by the loading screen.
+    loading_progress = None
     sub_tab_list = ['life events', 'user notes']
 
     # Keeping track of various last screen for various purposes
@@ -184,6 +194,15 @@ class Game():
 
     is_close_menu_open = False
 
+    # storages of the per-cat save data, key is the Clan name
+    clan_storages = {}
+    # archives of the events of earlier moons, key is the Clan name
+    event_archives = {}
+    # the loaded histories of the cats of the current Clan
+    history_store = HistoryStore()
+    # hash of the data and (modification time, size) of each file written by safe_save, key is the path
+    saved_files = {}
+
     def __init__(self, current_screen='start screen'):
         self.current_screen = current_screen
         self.clicked = False
@@ -217,11 +236,15 @@ class Game():
 
         # If write_data is not a string,
         if type(write_data) is not str:
-            print(write_data)
             _data = ujson.dumps(write_data, indent=4)
         else:
             _data = write_data
 
+        # Skip the write if the file still holds exactly what was last written to it
+        data_hash = hash(_data)
+        if Game.saved_files.get(path) == (data_hash, Game._get_file_stamp(path)):
+            return
+
         dir_name, file_name = os.path.split(path)
 
         if check_integrity:
@@ -256,7 +279,7 @@ class Game():
                 # This section is reached is the file was not nullied. Move the file and return True
 
                 shutil_move(temp_file_path, path)
-                return
+                break
         else:
             os.makedirs(dir_name, exist_ok=True)
             with open(path, 'w') as write_file:
@@ -264,6 +287,17 @@ class Game():
                 write_file.flush()
                 os.fsync(write_file.fileno())
 
+        Game.saved_files[path] = (data_hash, Game._get_file_stamp(path))
+
+    @staticmethod
+    def _get_file_stamp(path: str):
+        """Returns the modification time and size of the file, or None if it doesn't exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     def read_clans(self):
         '''with open(get_save_dir() + '/clanlist.txt', 'r') as read_file:
             clan_list = read_file.read()
@@ -405,15 +439,22 @@ class Game():
         if not os.path.exists(directory):
             os.makedirs(directory)
 
-        # Delete all existing relationship files
-        if not os.path.exists(directory + '/relationships'):
-            os.makedirs(directory + '/relationships')
-        for f in os.listdir(directory + '/relationships'):
-            os.remove(os.path.join(directory + '/relationships', f))
-
         self.save_faded_cats(clanname)  # Fades cat and saves them, if needed
 
+        single_file = self.clan.clan_settings["single_file_save"] if self.clan else None
+        storage = self.get_clan_storage(clanname, single_file=single_file)
+
+        # relationships are only written again for cats whose relationships changed since the last save
+        saved_relationships = set(storage.read_ids("relationships"))
+        living_cats = set()
+
         clan_cats = []
+        relationships = {}
+        # cat ID: {cat ID: entries}, the log entries which were taken out of the relationship logs since the last save
+        spilled_logs = {}
+        histories = {}
+        conditions = {}
+        no_conditions = []
         for inter_cat in self.cat_class.all_cats.values():
 
             cat_data = inter_cat.get_save_dict()
@@ -423,19 +464,78 @@ class Game():
             # should allow closing and reloading to clear conditions on
             # classic, just in case a condition is accidently applied.
             if game.game_mode != "classic":
-                inter_cat.save_condition()
+                condition_data = inter_cat.get_condition_save_dict()
+                if condition_data:
+                    conditions[inter_cat.ID] = condition_data
+                else:
+                    no_conditions.append(inter_cat.ID)
 
+            # the loaded histories are kept, only the ones which changed are written
             if inter_cat.history:
-                inter_cat.save_history(directory + '/history')
-                # after saving, dump the history info
-                inter_cat.history = None
+                history_data = inter_cat.history.make_dict(inter_cat)
+                if self.history_store.is_changed(inter_cat, history_data):
+                    histories[inter_cat.ID] = history_data
             if not inter_cat.dead:
-                inter_cat.save_relationship_of_cat(
-                    directory + '/relationships')
+                living_cats.add(inter_cat.ID)
+                if inter_cat.relationships_changed or inter_cat.ID not in saved_relationships:
+                    relationships[inter_cat.ID] = inter_cat.get_relationship_save_list()
+                    for cat_to_id, relationship in inter_cat.relationships.items():
+                        if relationship.log.spilled:
+                            spilled_logs.setdefault(inter_cat.ID, {})[cat_to_id] = relationship.log.take_spilled()
+
+        # the spilled entries are added to the end of the archived entries
+        archived_logs = {}
+        for cat_id, spilled in spilled_logs.items():
+            archived_logs[cat_id] = storage.read("relationship_logs", cat_id) or {}
+            for cat_to_id, entries in spilled.items():
+                archived_logs[cat_id].setdefault(cat_to_id, []).extend(entries)
+
+        with storage.batch():
+            storage.write("relationships", relationships, delete_ids=saved_relationships - living_cats)
+            storage.write("relationship_logs", archived_logs, delete_ids=saved_relationships - living_cats)
+            storage.write("history", histories)
+            if game.game_mode != "classic":
+                storage.write("conditions", conditions, delete_ids=no_conditions)
+
+        for cat_id in relationships:
+            self.cat_class.all_cats[cat_id].relationships_changed = False
+        for cat_id, history_data in histories.items():
+            self.history_store.saved(self.cat_class.all_cats[cat_id], history_data)
+        self.history_store.evict(self.cat_class.all_cats, game.config["save_load"]["history_cache_size"])
 
         self.safe_save(
             f"{get_save_dir()}/{clanname}/clan_cats.json", clan_cats)
 
+    def get_clan_storage(self, clanname, single_file=None):
+        """Returns the storage of the relationships, history and conditions of the Clan.
+        The layout which is found in the save folder is used. If single_file is True or False,
+        the data is converted to the single file or JSON layout first, if needed."""
+        directory = get_save_dir() + '/' + clanname
+        storage = self.clan_storages.get(clanname)
+        # the save folder might have been replaced, e.g. when a Clan was deleted and a new one with the same name made
+        if storage is None or storage.single_file != os.path.exists(f"{directory}/{SQLITE_FILE_NAME}"):
+            if os.path.exists(f"{directory}/{SQLITE_FILE_NAME}"):
+                storage = SqliteClanStorage(directory)
+            else:
+                storage = JsonClanStorage(directory, self.safe_save)
+            self.clan_storages[clanname] = storage
+
+        if single_file is not None and storage.single_file != single_file:
+            new_storage = SqliteClanStorage(directory) if single_file \
+                else JsonClanStorage(directory, self.safe_save)
+            storage = convert_clan_storage(storage, new_storage)
+            self.clan_storages[clanname] = storage
+
+        return storage
+
+    def get_event_archive(self, clanname):
+        """Returns the archive of the events of earlier moons of the Clan."""
+        if clanname not in self.event_archives:
+            self.event_archives[clanname] = EventArchive(
+                get_save_dir() + '/' + clanname, self.safe_save,
+                self.config["save_load"]["event_archive_moons_per_segment"])
+        return self.event_archives[clanname]
+
     def save_faded_cats(self, clanname):
         """Deals with fades cats, if needed, adding them as faded """
         if game.cat_to_fade:
@@ -508,6 +608,12 @@ class Game():
         game.safe_save(
             f"{get_save_dir()}/{game.clan.name}/events.json", events_list)
 
+        # the moons skipped since the last save
+        archive = self.get_event_archive(game.clan.name)
+        if game.clan.age > 0:
+            archive.add_moon(game.clan.age, game.cur_events_list)
+        archive.save()
+
     def add_faded_offspring_to_faded_cat(self, parent, offspring):
         """In order to siblings to work correctly, and not to lose relation info on fading, we have to keep track of
         both active and faded cat's faded offpsring. This will add a faded offspring to a faded parents file. """
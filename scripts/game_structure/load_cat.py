@@ -14,7 +14,6 @@ from scripts.cat.cats import Cat, Personality, BACKSTORIES
 from scripts.housekeeping.version import SAVE_VERSION_NUMBER
 from scripts.utility import update_sprite, is_iterable
 from random import choice
-from scripts.cat_relations.inheritance import Inheritance
 
 import logging
 logger = logging.getLogger(__name__)
@@ -52,9 +51,18 @@ def json_load():
 
     old_tortie_patches = convert["old_tortie_patches"]
 
+    # the files of the cats are read in the background while the cats are made
+    storage = game.get_clan_storage(clanname)
+    storage.prefetch("conditions", [cat["ID"] for cat in cat_data if "ID" in cat])
+    storage.prefetch("relationships", [cat["ID"] for cat in cat_data if "ID" in cat and not cat.get("dead")])
+
+    # making the cats is the first half of the loading, the second half is loading their data
+    total_steps = 2 * len(cat_data) or 1
+    game.loading_progress = 0
 
     # create new cat objects
     for i, cat in enumerate(cat_data):
+        game.loading_progress = i / total_steps
         try:
             new_cat = Cat(ID=cat["ID"],
                         prefix=cat["name_prefix"],
@@ -197,7 +205,8 @@ def json_load():
             raise
 
     # replace cat ids with cat objects and add other needed variables
-    for cat in all_cats:
+    for i, cat in enumerate(all_cats):
+        game.loading_progress = (len(cat_data) + i) / total_steps
 
         cat.load_conditions()
 
@@ -220,10 +229,9 @@ def json_load():
             game.switches['error_message'] = f'There was an error loading relationships for cat #{cat}.'
             game.switches['traceback'] = e
             raise
-        
-        
-        cat.inheritance = Inheritance(cat)
-        
+
+        # the inheritance is worked out the first time it's needed, see Cat.inheritance
+
         try:
             # initialization of thoughts
             cat.thoughts()
@@ -237,6 +245,9 @@ def json_load():
         if game.config["save_load"]["load_integrity_checks"]:
             save_check()
 
+    storage.clear_prefetched()
+    game.loading_progress = 1
+
 
 def csv_load(all_cats):
     if game.switches['clan_list'][0].strip() == '':
@@ -1383,10 +1383,13 @@ class RelationshipLog(UIWindow):
         opposite_log_string = None
         if not relationship.opposite_relationship:
             relationship.link_relationship()
+        # the entries which were moved out of the logs are shown before the others
         if relationship.opposite_relationship and len(relationship.opposite_relationship.log) > 0:
-            opposite_log_string = f"{f'<br>-----------------------------<br>'.join(relationship.opposite_relationship.log)}<br>"
+            opposite_log = relationship.opposite_relationship.log.get_archived() + \
+                list(relationship.opposite_relationship.log)
+            opposite_log_string = f"{f'<br>-----------------------------<br>'.join(opposite_log)}<br>"
 
-        log_string = f"{f'<br>-----------------------------<br>'.join(relationship.log)}<br>" if len(
+        log_string = f"{f'<br>-----------------------------<br>'.join(relationship.log.get_archived() + list(relationship.log))}<br>" if len(
             relationship.log) > 0 else \
             "There are no relationship logs."
 
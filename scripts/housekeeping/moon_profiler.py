@@ -0,0 +1,216 @@
+"""
+Opt-in profiler for moon skips.
+
+While it's running, the wall time and number of calls of every phase of Events.one_moon and of the handlers
+called in it are recorded, nested the way they are called, over as many moons as are skipped. The result can be
+exported as JSON and as collapsed stacks, which flame graph tools (flamegraph.pl, speedscope, inferno) can read.
+
+The handlers are only wrapped while the profiler is running, so it costs nothing when it's off. Start and stop it
+with the "profile" debug command.
+"""
+import os
+import time
+from functools import wraps
+from typing import Dict, List, Tuple
+
+import ujson
+
+from scripts.housekeeping.datadir import get_log_dir
+
+
+class MoonProfiler():
+
+    # methods of the Events object which are timed
+    EVENT_HANDLERS = (
+        "check_war", "get_moon_freshkill", "handle_lost_cats_return", "one_moon_cat", "one_moon_outside_cat",
+        "handle_lead_den_event", "handle_fading", "mediator_events", "handle_outbreaks", "handle_apprentice_EX",
+        "perform_ceremonies", "coming_out", "invite_new_cats", "other_interactions", "gain_accessories",
+        "handle_injuries_or_general_death", "handle_illnesses_or_illness_deaths", "handle_murder",
+        "herb_destruction", "herb_gather", "handle_focus", "check_and_promote_leader", "check_and_promote_deputy"
+    )
+
+    def __init__(self):
+        self.running = False
+        self.moons = 0
+        # key is the path of names from one_moon down to the phase, value is [calls, total seconds]
+        self.stats: Dict[Tuple[str, ...], List] = {}
+        # open phases: (name, start time, opened by mark_phase)
+        self._stack: List[Tuple[str, float, bool]] = []
+        # (owner, attribute name, original attribute) of everything which was wrapped
+        self._wrapped = []
+
+    # ---------------------------------------------------------------------------- #
+    #                                start and stop                                #
+    # ---------------------------------------------------------------------------- #
+
+    def start(self, events):
+        """Starts recording. events is the Events object which runs the moon skips."""
+        if self.running:
+            return
+        self.running = True
+
+        self._wrap(events, "one_moon", self._timed_moon)
+        for name in MoonProfiler.EVENT_HANDLERS:
+            self._wrap(events, name, self._timed)
+
+        for owner, name in self._get_class_handlers():
+            self._wrap(owner, name, self._timed)
+
+    def stop(self):
+        """Stops recording and removes all wrappers. The recorded data is kept."""
+        for owner, name, original in reversed(self._wrapped):
+            if isinstance(owner, type):
+                setattr(owner, name, original)
+            else:
+                # the wrapper was set on the object, removing it makes the class method visible again
+                delattr(owner, name)
+        self._wrapped.clear()
+        self._stack.clear()
+        self.running = False
+
+    def reset(self):
+        """Throws away all recorded data."""
+        self.moons = 0
+        self.stats.clear()
+        self._stack.clear()
+
+    @staticmethod
+    def _get_class_handlers():
+        """Handlers of other classes which are called during the moon skip."""
+        from scripts.cat.cats import Cat
+        from scripts.clan import Clan
+        from scripts.clan_resources.freshkill import Freshkill_Pile
+        from scripts.events_module.condition_events import Condition_Events
+        from scripts.events_module.freshkill_pile_events import Freshkill_Events
+        from scripts.events_module.relation_events import Relation_Events
+        from scripts.events_module.relationship.pregnancy_events import Pregnancy_Events
+        from scripts.game_structure.game_essentials import Game
+
+        return (
+            (Cat, "one_moon"), (Cat, "thoughts"), (Cat, "relationship_interaction"), (Cat, "sort_cats"),
+            (Condition_Events, "handle_illnesses"), (Condition_Events, "handle_injuries"),
+            (Condition_Events, "handle_already_disabled"),
+            (Relation_Events, "handle_relationships"),
+            (Pregnancy_Events, "handle_having_kits"),
+            (Freshkill_Pile, "time_skip"), (Freshkill_Events, "handle_nutrient"),
+            (Game, "save_cats"), (Game, "save_events"), (Clan, "save_clan")
+        )
+
+    def _wrap(self, owner, name, wrapper):
+        if isinstance(owner, type):
+            original = owner.__dict__[name]
+            # keep static and class methods what they are
+            if isinstance(original, (staticmethod, classmethod)):
+                wrapped = type(original)(wrapper(name, original.__func__))
+            else:
+                wrapped = wrapper(name, original)
+        else:
+            original = getattr(owner, name)
+            wrapped = wrapper(name, original)
+        setattr(owner, name, wrapped)
+        self._wrapped.append((owner, name, original))
+
+    # ---------------------------------------------------------------------------- #
+    #                                   recording                                  #
+    # ---------------------------------------------------------------------------- #
+
+    def _timed(self, name, func):
+        @wraps(func)
+        def timed(*args, **kwargs):
+            self._enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit()
+        return timed
+
+    def _timed_moon(self, name, func):
+        @wraps(func)
+        def timed_moon(*args, **kwargs):
+            self._stack.clear()
+            self._enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._close_marked_phase()
+                self._exit()
+                self.moons += 1
+        return timed_moon
+
+    def mark_phase(self, name: str):
+        """Ends the current phase of the moon skip and starts the next one. Does nothing if the profiler isn't
+        running, so it can stay in the code."""
+        if not self.running or not self._stack:
+            return
+        self._close_marked_phase()
+        self._enter(name, marked=True)
+
+    def _close_marked_phase(self):
+        if self._stack and self._stack[-1][2]:
+            self._exit()
+
+    def _enter(self, name: str, marked=False):
+        self._stack.append((name, time.perf_counter(), marked))
+
+    def _exit(self):
+        end = time.perf_counter()
+        path = tuple(frame[0] for frame in self._stack)
+        start = self._stack.pop()[1]
+
+        if path not in self.stats:
+            self.stats[path] = [0, 0.0]
+        self.stats[path][0] += 1
+        self.stats[path][1] += end - start
+
+    # ---------------------------------------------------------------------------- #
+    #                                    report                                    #
+    # ---------------------------------------------------------------------------- #
+
+    def _self_times(self) -> Dict[Tuple[str, ...], float]:
+        """The time spent in each phase itself, not in the phases called in it."""
+        self_times = {path: stat[1] for path, stat in self.stats.items()}
+        for path, stat in self.stats.items():
+            if len(path) > 1 and path[:-1] in self_times:
+                self_times[path[:-1]] -= stat[1]
+        return self_times
+
+    def get_report(self) -> dict:
+        """Returns the recorded data, with the phases sorted by total time."""
+        self_times = self._self_times()
+        moons = max(self.moons, 1)
+        phases = []
+        for path, (calls, total) in sorted(self.stats.items(), key=lambda item: -item[1][1]):
+            phases.append({
+                "path": list(path),
+                "calls": calls,
+                "total_time": total,
+                "self_time": self_times[path],
+                "time_per_moon": total / moons,
+                "calls_per_moon": calls / moons
+            })
+        return {
+            "moons": self.moons,
+            "total_time": sum(stat[1] for path, stat in self.stats.items() if len(path) == 1),
+            "phases": phases
+        }
+
+    def get_collapsed_stacks(self) -> str:
+        """Returns the self time of each phase in microseconds, in the collapsed stack format of flame graphs."""
+        lines = [f"{';'.join(path)} {max(round(self_time * 1000000), 0)}"
+                 for path, self_time in sorted(self._self_times().items())]
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str = None) -> str:
+        """Writes the report as JSON and as collapsed stacks next to it. Returns the path of the JSON file."""
+        if not path:
+            path = f"{get_log_dir()}/moon_profile_{time.strftime('%Y_%m_%d_%H%M%S')}.json"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with open(path, 'w') as write_file:
+            write_file.write(ujson.dumps(self.get_report(), indent=4))
+        with open(os.path.splitext(path)[0] + ".folded", 'w') as write_file:
+            write_file.write(self.get_collapsed_stacks())
+        return path
+
+
+moon_profiler = MoonProfiler()
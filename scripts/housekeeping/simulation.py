@@ -0,0 +1,241 @@
+"""
+Runs moon skips without the game window.
+
+The Clan is either generated from a fixed seed or copied from a Clan in the saves folder, so the save of the player
+isn't changed. Then the moons are skipped the same way the timeskip button does it. The report has the moons per
+second, the time of each save and load, and the peak memory of the process. Start it with simulate.py; the benchmarks in the benchmarks folder use it as well.
+
+pygame still needs a display, even one that isn't shown. To run on a machine without one, set SDL_VIDEODRIVER and
+SDL_AUDIODRIVER to "dummy" before anything imports pygame. simulate.py does this.
+"""
+import os
+import random
+import shutil
+import sys
+import time
+from typing import Dict, List, Optional
+
+import ujson
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+from scripts.cat.cats import Cat
+from scripts.cat.sprites import sprites
+from scripts.clan import Clan, clan_class
+from scripts.cat_relations.inheritance import Inheritance
+from scripts.cat_relations.relationship import Relationship
+from scripts.events import events_class
+from scripts.game_structure.game_essentials import game
+from scripts.game_structure.load_cat import load_cats, version_convert
+from scripts.housekeeping.datadir import get_save_dir
+from scripts.housekeeping.moon_profiler import moon_profiler
+from scripts.patrol.patrol import Patrol
+
+# statuses of the generated members, picked the same way as the cats on the Clan creation screen
+MEMBER_STATUSES = ('kitten', 'apprentice', 'warrior', 'warrior', 'elder')
+NOT_ALLOWED_SCARS = ('NOPAW', 'NOTAIL', 'HALFTAIL', 'NOEAR', 'BOTHBLIND', 'RIGHTBLIND', 'LEFTBLIND', 'BRIGHTHEART',
+                     'NOLEFTEAR', 'NORIGHTEAR', 'MANLEG')
+
+
+def reset_game_state():
+    """Throws away the loaded Clan and all cats, so another Clan can be generated or loaded."""
+    Cat.all_cats.clear()
+    Cat.all_cats_list.clear()
+    Cat.ordered_cat_list.clear()
+    Cat.outside_cats.clear()
+    Cat.grief_strings.clear()
+    Inheritance.all_inheritances.clear()
+    game.history_store.clear()
+    if Relationship.matrix_store is not None:
+        Relationship.matrix_store.clear()
+    game.clan = None
+    game.cur_events_list.clear()
+    game.herb_events_list.clear()
+    game.mediated.clear()
+    game.patrolled.clear()
+    game.cat_to_fade.clear()
+    Patrol.used_patrols.clear()
+    game.switches['error_message'] = ''
+
+
+def generate_clan(name: str, size: int, game_mode: str = "expanded", biome: str = "Forest",
+                  season: str = "Newleaf") -> Clan:
+    """Creates and saves a new Clan with a leader, a deputy, a medicine cat and size - 3 other members.
+    Seed the random module before calling this to get the same Clan every time."""
+    if os.path.exists(f"{get_save_dir()}/{name}"):
+        raise FileExistsError(f"There is already a Clan named {name} in {get_save_dir()}")
+    reset_game_state()
+
+    leader = Cat(status='leader', biome=None)
+    deputy = Cat(status='deputy', biome=None)
+    medicine_cat = Cat(status='medicine cat', biome=None)
+    members = []
+    for _ in range(max(size - 3, 0)):
+        cat = Cat(status=random.choice(MEMBER_STATUSES), biome=None)
+        if cat.moons >= 160:
+            cat.moons = random.choice(range(120, 155))
+        elif cat.moons == 0:
+            cat.moons = random.choice([1, 2, 3, 4, 5])
+        cat.pelt.scars = [scar for scar in cat.pelt.scars if scar not in NOT_ALLOWED_SCARS]
+        members.append(cat)
+
+    game.clan = Clan(name=name,
+                     leader=leader,
+                     deputy=deputy,
+                     medicine_cat=medicine_cat,
+                     biome=biome,
+                     camp_bg="camp1",
+                     symbol=random.choice(sprites.clan_symbols) if sprites.clan_symbols else None,
+                     game_mode=game_mode,
+                     starting_members=members,
+                     starting_season=season)
+    game.clan.create_clan()
+    game.cur_events_list.clear()
+    game.herb_events_list.clear()
+    Cat.grief_strings.clear()
+    Cat.sort_cats()
+    return game.clan
+
+
+def load_clan(name: str) -> Clan:
+    """Loads a Clan from the saves folder, the same way the game does when it's started."""
+    reset_game_state()
+    game.switches['clan_list'] = [name]
+    load_cats()
+    version_convert(clan_class.load_clan())
+    game.load_events()
+    if game.switches['error_message']:
+        raise RuntimeError(game.switches['error_message'])
+    return game.clan
+
+
+def save_clan():
+    """Saves the Clan, the same way the save button does."""
+    game.save_cats()
+    game.clan.save_clan()
+    game.clan.save_pregnancy(game.clan)
+    game.save_events()
+
+
+def copy_clan(source: str, target: str):
+    """Copies the save of the Clan named source to a new Clan named target."""
+    source_path = f"{get_save_dir()}/{source}"
+    target_path = f"{get_save_dir()}/{target}"
+    if os.path.exists(target_path):
+        raise FileExistsError(f"There is already a Clan named {target} in {get_save_dir()}")
+    if not os.path.exists(f"{source_path}clan.json"):
+        raise FileNotFoundError(f"There is no Clan named {source} in {get_save_dir()}")
+
+    shutil.copytree(source_path, target_path)
+    with open(f"{source_path}clan.json", 'r', encoding='utf-8') as read_file:
+        clan_data = ujson.loads(read_file.read())
+    clan_data["clanname"] = target
+    game.safe_save(f"{target_path}clan.json", clan_data)
+
+
+def remove_clan(name: str, current_clan: Optional[str] = None):
+    """Deletes the save of the Clan. current_clan is written back as the Clan which the game opens."""
+    shutil.rmtree(f"{get_save_dir()}/{name}", ignore_errors=True)
+    for suffix in ("clan.json", "clan.txt"):
+        if os.path.exists(f"{get_save_dir()}/{name}{suffix}"):
+            os.remove(f"{get_save_dir()}/{name}{suffix}")
+    game.save_clanlist(current_clan)
+    game.clan_storages.pop(name, None)
+    game.event_archives.pop(name, None)
+
+
+def run_moons(moons: int) -> List[float]:
+    """Skips the given number of moons. Returns the time each moon took, in seconds."""
+    times = []
+    for _ in range(moons):
+        start = time.perf_counter()
+        events_class.one_moon()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run_patrols(patrols: int, patrol_type: str = "hunting") -> List[float]:
+    """Sends out the given number of patrols of up to three random warriors, and lets them proceed.
+    Returns the time each patrol took, in seconds."""
+    times = []
+    for _ in range(patrols):
+        able_cats = [cat for cat in Cat.all_cats_list if cat.status in ('warrior', 'deputy', 'leader')
+                     and not cat.dead and not cat.outside and not cat.not_working()]
+        if not able_cats:
+            break
+
+        start = time.perf_counter()
+        patrol = Patrol()
+        patrol.setup_patrol(random.sample(able_cats, min(3, len(able_cats))), patrol_type)
+        patrol.proceed_patrol()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def time_call(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def get_peak_memory() -> Optional[float]:
+    """Returns the peak memory use of the process in MiB, or None if it can't be found out."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kibibytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def run_simulation(moons: int, seed: int = None, size: int = 30, load: str = None, name: str = None,
+                   game_mode: str = "expanded", keep: bool = False, profile: bool = False) -> Dict:
+    """Generates a Clan of the given size, or copies the Clan named load, and skips the moons.
+    The Clan is deleted afterwards unless keep is True. Returns the report."""
+    if seed is not None:
+        random.seed(seed)
+    clan_list = game.read_clans()
+    current_clan = clan_list[0] if clan_list else None
+
+    if not name:
+        name = f"{load}Simulation" if load else f"Simulation{seed if seed is not None else ''}"
+    # checked here, so a Clan of the player is never removed below
+    if os.path.exists(f"{get_save_dir()}/{name}") or os.path.exists(f"{get_save_dir()}/{name}clan.json"):
+        raise FileExistsError(f"There is already a Clan named {name} in {get_save_dir()}")
+
+    report = {"clan": name, "seed": seed, "moons": moons}
+    try:
+        if load:
+            copy_clan(load, name)
+            report["load_time"] = time_call(load_clan, name)
+        else:
+            report["generate_time"] = time_call(generate_clan, name, size, game_mode)
+        report["cats"] = len([cat for cat in Cat.all_cats.values() if not cat.dead and not cat.outside])
+
+        if profile:
+            moon_profiler.reset()
+            moon_profiler.start(events_class)
+        try:
+            moon_times = run_moons(moons)
+        finally:
+            if profile:
+                moon_profiler.stop()
+                report["profile"] = moon_profiler.export()
+
+        report["moon_time"] = sum(moon_times)
+        report["moons_per_second"] = moons / sum(moon_times) if sum(moon_times) else None
+        report["slowest_moon"] = max(moon_times, default=None)
+        report["living_cats_after"] = len([cat for cat in Cat.all_cats.values() if not cat.dead and not cat.outside])
+
+        report["save_time"] = time_call(save_clan)
+        report["reload_time"] = time_call(load_clan, name)
+        report["peak_memory_mib"] = get_peak_memory()
+    finally:
+        if not keep:
+            remove_clan(name, current_clan)
+    return report
@@ -6,7 +6,6 @@ from random import choice, randint, choices
 from typing import List, Tuple
 from itertools import repeat
 
-import ujson
 import pygame
 from os.path import exists as path_exists
 
@@ -24,6 +23,7 @@ from scripts.game_structure.game_essentials import game
 from itertools import combinations
 from scripts.patrol.patrol_event import PatrolEvent
 from scripts.patrol.patrol_outcome import PatrolOutcome
+from scripts.patrol.patrol_catalog import PatrolCatalog
 from scripts.cat.cats import Cat
 from scripts.special_dates import get_special_date, contains_special_date_tag
 
@@ -55,6 +55,9 @@ class Patrol():
         # Holds new cats for easy access
         self.new_cats: List[List[Cat]] = []
 
+        # Holds the loaded patrols for the current biome and season
+        self.catalog: PatrolCatalog = None
+
     def setup_patrol(self, patrol_cats:List[Cat], patrol_type:str) -> str:
         # Add cats
         
@@ -218,11 +221,8 @@ class Patrol():
         game_setting_disaster = game_setting_disaster if game_setting_disaster is not None else \
                                 game.clan.clan_settings['disasters']
         season = current_season.lower()
-        biome_dir = f"{biome}/"
-        leaf = f"{season}"
-        self.update_resources(biome_dir, leaf)
+        self.catalog = PatrolCatalog.get_catalog(biome, season)
 
-        possible_patrols = []
         # this next one is needed for Classic specifically
         patrol_type = "med" if ['medicine cat', 'medicine cat apprentice'] in self.patrol_status_list else patrol_type
         patrol_size = len(self.patrol_cats)
@@ -270,41 +270,34 @@ class Patrol():
             welcoming_rep = True
             chance = welcoming_chance
 
-        possible_patrols.extend(self.generate_patrol_events(self.HUNTING))
-        possible_patrols.extend(self.generate_patrol_events(self.HUNTING_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.BORDER))
-        possible_patrols.extend(self.generate_patrol_events(self.BORDER_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.TRAINING))
-        possible_patrols.extend(self.generate_patrol_events(self.TRAINING_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.MEDCAT))
-        possible_patrols.extend(self.generate_patrol_events(self.MEDCAT_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.HUNTING_GEN))
-        possible_patrols.extend(self.generate_patrol_events(self.BORDER_GEN))
-        possible_patrols.extend(self.generate_patrol_events(self.TRAINING_GEN))
-        possible_patrols.extend(self.generate_patrol_events(self.MEDCAT_GEN))
+        patrol_groups = ["hunting", "hunting_szn", "border", "border_szn", "training", "training_szn",
+                         "med", "med_szn", "hunting_gen", "border_gen", "training_gen", "med_gen"]
 
         if game_setting_disaster:
             dis_chance = int(random.getrandbits(3))  # disaster patrol chance
             if dis_chance == 1:
-                possible_patrols.extend(self.generate_patrol_events(self.DISASTER))
+                patrol_groups.append("disaster")
 
         # new cat patrols
         if chance == 1:
             if welcoming_rep:
-                possible_patrols.extend(self.generate_patrol_events(self.NEW_CAT_WELCOMING))
+                patrol_groups.append("new_cat_welcoming")
             elif neutral_rep:
-                possible_patrols.extend(self.generate_patrol_events(self.NEW_CAT))
+                patrol_groups.append("new_cat")
             elif hostile_rep:
-                possible_patrols.extend(self.generate_patrol_events(self.NEW_CAT_HOSTILE))
+                patrol_groups.append("new_cat_hostile")
 
         # other Clan patrols
         if other_clan_chance == 1:
             if clan_neutral:
-                possible_patrols.extend(self.generate_patrol_events(self.OTHER_CLAN))
+                patrol_groups.append("other_clan")
             elif clan_allies:
-                possible_patrols.extend(self.generate_patrol_events(self.OTHER_CLAN_ALLIES))
+                patrol_groups.append("other_clan_allies")
             elif clan_hostile:
-                possible_patrols.extend(self.generate_patrol_events(self.OTHER_CLAN_HOSTILE))
+                patrol_groups.append("other_clan_hostile")
+
+        # only the patrols fitting the biome, camp, season and patrol size are taken from the catalog
+        possible_patrols = self.catalog.candidates(patrol_groups, patrol_size, biome, camp, season)
 
         final_patrols, final_romance_patrols = self. get_filtered_patrols(possible_patrols, biome, camp, current_season,
                                                                           patrol_type)
@@ -559,24 +552,41 @@ class Patrol():
         if patrol_type == "general":
             patrol_type = random.choice(["hunting", "border", "training"])
 
-        # makes sure that it grabs patrols in the correct biomes, season, with the correct number of cats
+        type_tag = {"hunting": "hunting", "border": "border", "training": "training",
+                    "med": "herb_gathering"}.get(patrol_type)
+
+        # makes sure that it grabs patrols in the correct biomes, season, with the correct number of cats.
+        # The cheap checks are done first, the relationship constraints are only checked for the patrols left.
         for patrol in possible_patrols:
-            if not self._check_constraints(patrol):
+            if type_tag:
+                if self.catalog:
+                    if not self.catalog.is_type(patrol, type_tag):
+                        continue
+                elif type_tag not in patrol.types:
+                    continue
+
+            if not (patrol.min_cats <= len(self.patrol_cats) <= patrol.max_cats):
                 continue
-            
+
+            if biome not in patrol.biome and "any" not in patrol.biome:
+                continue
+            if camp not in patrol.camp and "any" not in patrol.camp:
+                continue
+            if current_season not in patrol.season and "any" not in patrol.season:
+                continue
+
             # Don't check for repeat patrols if ensure_patrol_id is being used. 
             if not isinstance(game.config["patrol_generation"]["debug_ensure_patrol_id"], str) and \
                     patrol.patrol_id in self.used_patrols:
                 continue
 
             # filtering for dates
-            if contains_special_date_tag(patrol.tags):
+            special_date_patrol = self.catalog.is_special_date(patrol) if self.catalog \
+                else contains_special_date_tag(patrol.tags)
+            if special_date_patrol:
                 if not special_date or special_date.patrol_tag not in patrol.tags:
                     continue
 
-            if not (patrol.min_cats <= len(self.patrol_cats) <= patrol.max_cats):
-                continue
-        
             flag = False
             for sta, num in patrol.min_max_status.items():
                 if len(num) != 2:
@@ -588,28 +598,15 @@ class Patrol():
                     break
             if flag:
                 continue
-            
-            if biome not in patrol.biome and "any" not in patrol.biome:
-                continue
-            if camp not in patrol.camp and "any" not in patrol.camp:
-                continue
-            if current_season not in patrol.season and "any" not in patrol.season:
-                continue
-
-            if 'hunting' not in patrol.types and patrol_type == 'hunting':
-                continue
-            elif 'border' not in patrol.types and patrol_type == 'border':
-                continue
-            elif 'training' not in patrol.types and patrol_type == 'training':
-                continue
-            elif 'herb_gathering' not in patrol.types and patrol_type == 'med':
-                continue
 
             # cruel season tag check
             if "cruel_season" in patrol.tags:
                 if game.clan and game.clan.game_mode != 'cruel_season':
                     continue
 
+            if not self._check_constraints(patrol):
+                continue
+
             if "romantic" in patrol.tags:
                 romantic_patrols.append(patrol)
             else:
@@ -636,37 +633,7 @@ class Patrol():
         return filtered_patrols, romantic_patrols
 
     def generate_patrol_events(self, patrol_dict):
-        all_patrol_events = []
-        for patrol in patrol_dict:
-            patrol_event = PatrolEvent(
-                patrol_id=patrol.get("patrol_id"),
-                biome=patrol.get("biome"),
-                camp=patrol.get("camp"),
-                season=patrol.get("season"),
-                tags=patrol.get("tags"),
-                weight=patrol.get("weight", 20),
-                types=patrol.get("types"),
-                intro_text=patrol.get("intro_text"),
-                patrol_art=patrol.get("patrol_art"),
-                patrol_art_clean=patrol.get("patrol_art_clean"),
-                success_outcomes=PatrolOutcome.generate_from_info(patrol.get("success_outcomes")),
-                fail_outcomes=PatrolOutcome.generate_from_info(patrol.get("fail_outcomes"), success=False),
-                decline_text=patrol.get("decline_text"),
-                chance_of_success=patrol.get("chance_of_success"),
-                min_cats=patrol.get("min_cats", 1),
-                max_cats=patrol.get("max_cats", 6),
-                min_max_status=patrol.get("min_max_status"),
-                antag_success_outcomes=PatrolOutcome.generate_from_info(patrol.get("antag_success_outcomes"), antagonize=True),
-                antag_fail_outcomes=PatrolOutcome.generate_from_info(patrol.get("antag_fail_outcomes"), success=False, 
-                                                                     antagonize=True),
-                relationship_constraints=patrol.get("relationship_constraint"),
-                pl_skill_constraints=patrol.get("pl_skill_constraint"),
-                pl_trait_constraints=patrol.get("pl_trait_constraints")
-            )
-
-            all_patrol_events.append(patrol_event)
-
-        return all_patrol_events
+        return PatrolCatalog.generate_patrol_events(patrol_dict)
 
     def determine_outcome(self, antagonize=False) -> Tuple[str]:
         
@@ -737,73 +704,6 @@ class Patrol():
         success = int(random.random() * 120) < success_chance
         return (success_outcome if success else fail_outcome, success)
         
-    def update_resources(self, biome_dir, leaf):
-        resource_dir = "resources/dicts/patrols/"
-        # HUNTING #
-        self.HUNTING_SZN = None
-        with open(f"{resource_dir}{biome_dir}hunting/{leaf}.json", 'r', encoding='ascii') as read_file:
-            self.HUNTING_SZN = ujson.loads(read_file.read())
-        self.HUNTING = None
-        with open(f"{resource_dir}{biome_dir}hunting/any.json", 'r', encoding='ascii') as read_file:
-            self.HUNTING = ujson.loads(read_file.read())
-        # BORDER #
-        self.BORDER_SZN = None
-        with open(f"{resource_dir}{biome_dir}border/{leaf}.json", 'r', encoding='ascii') as read_file:
-            self.BORDER_SZN = ujson.loads(read_file.read())
-        self.BORDER = None
-        with open(f"{resource_dir}{biome_dir}border/any.json", 'r', encoding='ascii') as read_file:
-            self.BORDER = ujson.loads(read_file.read())
-        # TRAINING #
-        self.TRAINING_SZN = None
-        with open(f"{resource_dir}{biome_dir}training/{leaf}.json", 'r', encoding='ascii') as read_file:
-            self.TRAINING_SZN = ujson.loads(read_file.read())
-        self.TRAINING = None
-        with open(f"{resource_dir}{biome_dir}training/any.json", 'r', encoding='ascii') as read_file:
-            self.TRAINING = ujson.loads(read_file.read())
-        # MED #
-        self.MEDCAT_SZN = None
-        with open(f"{resource_dir}{biome_dir}med/{leaf}.json", 'r', encoding='ascii') as read_file:
-            self.MEDCAT_SZN = ujson.loads(read_file.read())
-        self.MEDCAT = None
-        with open(f"{resource_dir}{biome_dir}med/any.json", 'r', encoding='ascii') as read_file:
-            self.MEDCAT = ujson.loads(read_file.read())
-        # NEW CAT #
-        self.NEW_CAT = None
-        with open(f"{resource_dir}new_cat.json", 'r', encoding='ascii') as read_file:
-            self.NEW_CAT = ujson.loads(read_file.read())
-        self.NEW_CAT_HOSTILE = None
-        with open(f"{resource_dir}new_cat_hostile.json", 'r', encoding='ascii') as read_file:
-            self.NEW_CAT_HOSTILE = ujson.loads(read_file.read())
-        self.NEW_CAT_WELCOMING = None
-        with open(f"{resource_dir}new_cat_welcoming.json", 'r', encoding='ascii') as read_file:
-            self.NEW_CAT_WELCOMING = ujson.loads(read_file.read())
-        # OTHER CLAN #
-        self.OTHER_CLAN = None
-        with open(f"{resource_dir}other_clan.json", 'r', encoding='ascii') as read_file:
-            self.OTHER_CLAN = ujson.loads(read_file.read())
-        self.OTHER_CLAN_ALLIES = None
-        with open(f"{resource_dir}other_clan_allies.json", 'r', encoding='ascii') as read_file:
-            self.OTHER_CLAN_ALLIES = ujson.loads(read_file.read())
-        self.OTHER_CLAN_HOSTILE = None
-        with open(f"{resource_dir}other_clan_hostile.json", 'r', encoding='ascii') as read_file:
-            self.OTHER_CLAN_HOSTILE = ujson.loads(read_file.read())
-        self.DISASTER = None
-        with open(f"{resource_dir}disaster.json", 'r', encoding='ascii') as read_file:
-            self.DISASTER = ujson.loads(read_file.read())
-        # sighing heavily as I add general patrols back in
-        self.HUNTING_GEN = None
-        with open(f"{resource_dir}general/hunting.json", 'r', encoding='ascii') as read_file:
-            self.HUNTING_GEN = ujson.loads(read_file.read())
-        self.BORDER_GEN = None
-        with open(f"{resource_dir}general/border.json", 'r', encoding='ascii') as read_file:
-            self.BORDER_GEN = ujson.loads(read_file.read())
-        self.TRAINING_GEN = None
-        with open(f"{resource_dir}general/training.json", 'r', encoding='ascii') as read_file:
-            self.TRAINING_GEN = ujson.loads(read_file.read())
-        self.MEDCAT_GEN = None
-        with open(f"{resource_dir}general/medcat.json", 'r', encoding='ascii') as read_file:
-            self.MEDCAT_GEN = ujson.loads(read_file.read())
-
     def balance_hunting(self, possible_patrols: list):
         """Filter the incoming hunting patrol list to balance the different kinds of hunting patrols.
         With this filtering, there should be more prey possible patrols.
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: ascii -*-
+from typing import Dict, List, Set, Tuple, Iterable
+
+import ujson
+
+from scripts.patrol.patrol_event import PatrolEvent
+from scripts.patrol.patrol_outcome import PatrolOutcome
+from scripts.special_dates import contains_special_date_tag
+
+# ---------------------------------------------------------------------------- #
+#                          PATROL CATALOG CLASS START                          #
+# ---------------------------------------------------------------------------- #
+"""
+The patrol catalog holds the PatrolEvent objects for one biome and season. The patrol
+json files are only read once, and each catalog indexes its patrols by the attributes that
+are used to filter them, so setting up a patrol only has to look at the matching buckets.
+"""
+
+RESOURCE_DIR = "resources/dicts/patrols/"
+
+
+class PatrolCatalog():
+    # Parsed patrol files, shared by all catalogs. Key is the file path.
+    _loaded_files: Dict[str, List[PatrolEvent]] = {}
+    # Built catalogs. Key is (biome, season)
+    _catalogs: Dict[Tuple[str, str], "PatrolCatalog"] = {}
+
+    # The order of the groups is the order the patrols were always collected in, which
+    # keeps the weighted choice between the final patrols the same.
+    GROUPS = (
+        "hunting", "hunting_szn", "border", "border_szn", "training", "training_szn",
+        "med", "med_szn", "hunting_gen", "border_gen", "training_gen", "med_gen",
+        "disaster", "new_cat_welcoming", "new_cat", "new_cat_hostile",
+        "other_clan", "other_clan_allies", "other_clan_hostile"
+    )
+
+    def __init__(self, biome: str, season: str):
+        self.biome = biome
+        self.season = season
+
+        self.patrols: List[PatrolEvent] = []
+        self._by_group: Dict[str, List[int]] = {}
+        self._by_type: Dict[str, Set[PatrolEvent]] = {}
+        self._by_biome: Dict[str, Set[int]] = {}
+        self._by_camp: Dict[str, Set[int]] = {}
+        self._by_season: Dict[str, Set[int]] = {}
+        self._by_size: Dict[int, Set[int]] = {}
+        self._special_date: Set[PatrolEvent] = set()
+
+        for group in PatrolCatalog.GROUPS:
+            self._add_group(group, PatrolCatalog._load_file(self._group_path(group)))
+
+    @staticmethod
+    def get_catalog(biome: str, season: str) -> "PatrolCatalog":
+        """Returns the catalog for this biome and season, building it if it wasn't needed before."""
+        key = (biome.casefold(), season.casefold())
+        if key not in PatrolCatalog._catalogs:
+            PatrolCatalog._catalogs[key] = PatrolCatalog(*key)
+        return PatrolCatalog._catalogs[key]
+
+    @staticmethod
+    def clear_cache():
+        """Drops all loaded patrols, so they are read again from the resource files."""
+        PatrolCatalog._loaded_files.clear()
+        PatrolCatalog._catalogs.clear()
+
+    @staticmethod
+    def _load_file(path: str) -> List[PatrolEvent]:
+        if path not in PatrolCatalog._loaded_files:
+            with open(path, 'r', encoding='ascii') as read_file:
+                patrol_dicts = ujson.loads(read_file.read())
+            PatrolCatalog._loaded_files[path] = PatrolCatalog.generate_patrol_events(patrol_dicts)
+        return PatrolCatalog._loaded_files[path]
+
+    def _group_path(self, group: str) -> str:
+        """Returns the file path for a patrol group"""
+        if group.endswith("_gen"):
+            file_name = "medcat" if group == "med_gen" else group[:-4]
+            return f"{RESOURCE_DIR}general/{file_name}.json"
+        if group.endswith("_szn"):
+            return f"{RESOURCE_DIR}{self.biome}/{group[:-4]}/{self.season}.json"
+        if group in ("hunting", "border", "training", "med"):
+            return f"{RESOURCE_DIR}{self.biome}/{group}/any.json"
+        return f"{RESOURCE_DIR}{group}.json"
+
+    def _add_group(self, group: str, patrols: List[PatrolEvent]):
+        indexes = self._by_group.setdefault(group, [])
+        for patrol in patrols:
+            idx = len(self.patrols)
+            self.patrols.append(patrol)
+            indexes.append(idx)
+
+            for _type in patrol.types:
+                self._by_type.setdefault(_type, set()).add(patrol)
+            for _biome in patrol.biome:
+                self._by_biome.setdefault(_biome, set()).add(idx)
+            for camp in patrol.camp:
+                self._by_camp.setdefault(camp, set()).add(idx)
+            for season in patrol.season:
+                self._by_season.setdefault(season, set()).add(idx)
+            if contains_special_date_tag(patrol.tags):
+                self._special_date.add(patrol)
+
+    def _fitting_size(self, patrol_size: int) -> Set[int]:
+        if patrol_size not in self._by_size:
+            self._by_size[patrol_size] = {idx for idx, patrol in enumerate(self.patrols)
+                                          if patrol.min_cats <= patrol_size <= patrol.max_cats}
+        return self._by_size[patrol_size]
+
+    @staticmethod
+    def _with_any(index: Dict[str, Set[int]], key: str) -> Set[int]:
+        return index.get(key, set()) | index.get("any", set())
+
+    def candidates(self, groups: Iterable[str], patrol_size: int, biome: str, camp: str,
+                   season: str) -> List[PatrolEvent]:
+        """Returns the patrols of the given groups which fit the patrol size, biome, camp and season.
+        The patrols keep the order they have in the resource files."""
+        in_groups = set()
+        for group in groups:
+            in_groups.update(self._by_group.get(group, ()))
+
+        fitting = in_groups & self._fitting_size(patrol_size) & \
+            self._with_any(self._by_biome, biome) & \
+            self._with_any(self._by_camp, camp) & \
+            self._with_any(self._by_season, season)
+
+        return [self.patrols[idx] for idx in sorted(fitting)]
+
+    def is_type(self, patrol: PatrolEvent, patrol_type: str) -> bool:
+        """Checks if the patrol is of the given type."""
+        return patrol in self._by_type.get(patrol_type, ())
+
+    def is_special_date(self, patrol: PatrolEvent) -> bool:
+        """Checks if the patrol is tied to a special date."""
+        return patrol in self._special_date
+
+    @staticmethod
+    def generate_patrol_events(patrol_dicts: List[dict]) -> List[PatrolEvent]:
+        """Turns a list of patrol dicts, as found in the resource files, into PatrolEvents."""
+        all_patrol_events = []
+        for patrol in patrol_dicts:
+            patrol_event = PatrolEvent(
+                patrol_id=patrol.get("patrol_id"),
+                biome=patrol.get("biome"),
+                camp=patrol.get("camp"),
+                season=patrol.get("season"),
+                tags=patrol.get("tags"),
+                weight=patrol.get("weight", 20),
+                types=patrol.get("types"),
+                intro_text=patrol.get("intro_text"),
+                patrol_art=patrol.get("patrol_art"),
+                patrol_art_clean=patrol.get("patrol_art_clean"),
+                success_outcomes=PatrolOutcome.generate_from_info(patrol.get("success_outcomes")),
+                fail_outcomes=PatrolOutcome.generate_from_info(patrol.get("fail_outcomes"), success=False),
+                decline_text=patrol.get("decline_text"),
+                chance_of_success=patrol.get("chance_of_success"),
+                min_cats=patrol.get("min_cats", 1),
+                max_cats=patrol.get("max_cats", 6),
+                min_max_status=patrol.get("min_max_status"),
+                antag_success_outcomes=PatrolOutcome.generate_from_info(patrol.get("antag_success_outcomes"), antagonize=True),
+                antag_fail_outcomes=PatrolOutcome.generate_from_info(patrol.get("antag_fail_outcomes"), success=False,
+                                                                     antagonize=True),
+                relationship_constraints=patrol.get("relationship_constraint"),
+                pl_skill_constraints=patrol.get("pl_skill_constraint"),
+                pl_trait_constraints=patrol.get("pl_trait_constraints")
+            )
+
+            all_patrol_events.append(patrol_event)
+
+        return all_patrol_events
+
+# ---------------------------------------------------------------------------- #
+#                           PATROL CATALOG CLASS END                           #
+# ---------------------------------------------------------------------------- #
@@ -101,6 +101,8 @@ class PatrolOutcome():
            
             if (out.stat_skill or out.stat_trait):
                 special = True
+                # Outcomes are kept between patrols, so the stat cat of the last patrol has to be dropped
+                out.stat_cat = None
                 out._get_stat_cat(patrol)
                 if not isinstance(out.stat_cat, Cat):
                     continue
@@ -472,7 +472,7 @@ class MedDenScreen(Screens):
             med_messages = []
 
             amount_per_med = get_amount_cat_for_one_medic(game.clan)
-            number = medical_cats_condition_fulfilled(Cat.all_cats.values(), amount_per_med,
+            number = medical_cats_condition_fulfilled(None, amount_per_med,
                                                       give_clanmembers_covered=True)
             if len(self.meds) == 1:
                 insert = 'medicine cat'
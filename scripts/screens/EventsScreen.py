@@ -1,3 +1,5 @@
+import bisect
+
 import pygame_gui
 
 from .Screens import Screens
@@ -48,10 +50,34 @@ class EventsScreen(Screens):
         self.clan_age = None
         self.season = None
         self.heading = None
-        self.display_events_elements = {}
         self.involved_cat_buttons = []
         self.cat_profile_buttons = {}
         self.scroll_height = {}
+
+        # Only the events in and near the visible part of the list get widgets. The rows of widgets are kept and
+        # given other events while scrolling, instead of making widgets for every event.
+        self.event_rows = []
+        self.shown_events = []
+        # y position of each of the shown events in the scrolling container
+        self.event_positions = []
+        # the y position where the next shown event would go
+        self.events_height = 0
+        self.shown_scroll_top = None
+        # only events of moons before this are still to be added from the archive
+        self.archive_before_moon = 0
+        self.archive_done = True
+        # the event type of each list, for finding the archived events of the list
+        self.archive_types = {
+            "ceremony events": "ceremony",
+            "birth death events": "birth_death",
+            "relationship events": "relation",
+            "health events": "health",
+            "other clans events": "other_clans",
+            "misc events": "misc"
+        }
+        # event text: height of its text box, so the heights of the events only have to be worked out once
+        self.event_heights = {}
+        self.measure_box = None
         self.events_thread = None
 
         # Stores the involved cat button that currently has its cat profile buttons open
@@ -339,6 +365,14 @@ class EventsScreen(Screens):
         self.open_involved_cat_button = None
         self.make_events_container()
         self.events_container_y = self.event_container.get_relative_rect()[3]
+        # not shown, only used to find the height of the event texts
+        self.measure_box = pygame_gui.elements.UITextBox("",
+                                                         pygame.Rect((0, 0),
+                                                                     (self.event_container.get_relative_rect()[2] - 20,
+                                                                      -1)),
+                                                         object_id=get_text_box_theme("#text_box_30_horizleft"),
+                                                         visible=0,
+                                                         manager=MANAGER)
 
         # Display text
         # self.explain_text = pygame_gui.elements.UITextBox(self.display_text, scale(pygame.Rect((25,110),(750,40))))
@@ -395,14 +429,16 @@ class EventsScreen(Screens):
         self.season.kill()
         del self.season
         self.event_container.kill()
+        self.measure_box.kill()
+        self.measure_box = None
 
-        for ele in self.display_events_elements:
-            self.display_events_elements[ele].kill()
-        self.display_events_elements = {}
-
-        for ele in self.involved_cat_buttons:
-            ele.kill()
+        for row in self.event_rows:
+            for ele in row["elements"]:
+                ele.kill()
+        self.event_rows = []
         self.involved_cat_buttons = []
+        self.shown_events = []
+        self.event_positions = []
 
         for ele in self.cat_profile_buttons:
             ele.kill()
@@ -414,22 +450,27 @@ class EventsScreen(Screens):
 
         self.loading_screen_on_use(self.events_thread, self.timeskip_done)
 
+        # Give the rows other events if the list was scrolled
+        if self.event_rows and self.get_scroll_top() != self.shown_scroll_top:
+            self.update_event_rows()
+
     def timeskip_done(self):
         """Various sorting and other tasks that must be done with the timeskip is over. """
 
         self.scroll_height = {}
+        self.event_heights = {}
 
         if get_living_clan_cat_count(Cat) == 0:
             GameOver('events screen')
 
         self.event_display_type = 'all events'
         self.all_events_button.disable()
-        self.all_events = [x for x in game.cur_events_list if "interaction" not in x.types]
+        self.all_events = game.cur_events_list.without_type("interaction")
 
         self.ceremonies_events_button.enable()
         if self.ceremony_alert:
             self.ceremony_alert.kill()
-        self.ceremony_events = [x for x in game.cur_events_list if "ceremony" in x.types]
+        self.ceremony_events = game.cur_events_list.of_type("ceremony")
         if self.ceremony_events:
             self.ceremony_alert = pygame_gui.elements.UIImage(scale(pygame.Rect((110, 680), (8, 44))),
                                                               pygame.transform.scale(
@@ -440,7 +481,7 @@ class EventsScreen(Screens):
         if self.birth_death_alert:
             self.birth_death_alert.kill()
         self.birth_death_events_button.enable()
-        self.birth_death_events = [x for x in game.cur_events_list if "birth_death" in x.types]
+        self.birth_death_events = game.cur_events_list.of_type("birth_death")
         if self.birth_death_events:
             self.birth_death_alert = pygame_gui.elements.UIImage(scale(pygame.Rect((110, 780), (8, 44))),
                                                                  pygame.transform.scale(
@@ -451,7 +492,7 @@ class EventsScreen(Screens):
         if self.relation_alert:
             self.relation_alert.kill()
         self.relationship_events_button.enable()
-        self.relation_events = [x for x in game.cur_events_list if "relation" in x.types]
+        self.relation_events = game.cur_events_list.of_type("relation")
         if self.relation_events:
             self.relation_alert = pygame_gui.elements.UIImage(scale(pygame.Rect((110, 880), (8, 44))),
                                                               pygame.transform.scale(
@@ -462,7 +503,7 @@ class EventsScreen(Screens):
         if self.health_alert:
             self.health_alert.kill()
         self.health_events_button.enable()
-        self.health_events = [x for x in game.cur_events_list if "health" in x.types]
+        self.health_events = game.cur_events_list.of_type("health")
         if self.health_events:
             self.health_alert = pygame_gui.elements.UIImage(scale(pygame.Rect((110, 980), (8, 44))),
                                                             pygame.transform.scale(
@@ -473,7 +514,7 @@ class EventsScreen(Screens):
         if self.other_clans_alert:
             self.other_clans_alert.kill()
         self.other_clans_events_button.enable()
-        self.other_clans_events = [x for x in game.cur_events_list if "other_clans" in x.types]
+        self.other_clans_events = game.cur_events_list.of_type("other_clans")
         if self.other_clans_events:
             self.other_clans_alert = pygame_gui.elements.UIImage(scale(pygame.Rect((110, 1080), (8, 44))),
                                                                  pygame.transform.scale(
@@ -484,7 +525,7 @@ class EventsScreen(Screens):
         if self.misc_alert:
             self.misc_alert.kill()
         self.misc_events_button.enable()
-        self.misc_events = [x for x in game.cur_events_list if "misc" in x.types]
+        self.misc_events = game.cur_events_list.of_type("misc")
         if self.misc_events:
             self.misc_alert = pygame_gui.elements.UIImage(scale(pygame.Rect((110, 1180), (8, 44))),
                                                           pygame.transform.scale(
@@ -538,94 +579,202 @@ class EventsScreen(Screens):
         if game.clan.age != 1:
             self.clan_age.set_text(f'Clan age: {game.clan.age} moons')
 
-        for ele in self.display_events_elements:
-            self.display_events_elements[ele].kill()
-        self.display_events_elements = {}
-
-        for ele in self.involved_cat_buttons:
-            ele.kill()
-        self.involved_cat_buttons = []
-
-        for ele in self.cat_profile_buttons:
-            ele.kill()
-        self.cat_profile_buttons = []
-
-        # In order to set-set the scroll-bar postion, we have to remake the scrolling container
-        self.event_container.kill()
-        self.make_events_container()
+        self.close_cat_buttons()
+        # the rows show events of the list shown before
+        for row in self.event_rows:
+            self.hide_event_row(row)
+        self.shown_events = []
+        self.event_positions = []
+        self.events_height = 0
+        self.archive_done = True
 
         # Stop if Clan is new, so that events from previously loaded Clan don't show up
         if game.clan.age == 0:
+            self.shown_scroll_top = self.get_scroll_top()
             return
 
-        # Make display, with buttons and all that.
+        # Work out where each event goes. Widgets are only made for the events which can be seen, in update_event_rows
+        self.add_shown_events(self.display_events)
+        y = self.events_height
+        # the events of earlier moons are added when the list is scrolled to the end
+        self.archive_before_moon = game.clan.age
+        self.archive_done = False
+
+        # Set the scroll bar to the last position it was at. The scrolling container is moved there before the length
+        # is set, so the scroll bar is made to fit the new position.
         box_length = self.event_container.get_relative_rect()[2]
-        i = 0
-        y = 0
-        padding = 70 / 1400 * screen_y
-        button_size = 68 / 1600 * screen_x
-        button_padding = 80 / 1400 * screen_x
-        for ev in self.display_events:
-            if isinstance(ev.text, str):  # Check to make sure text is a string.
-                self.display_events_elements["event" + str(i)] = pygame_gui.elements.UITextBox(ev.text,
-                                                                                               pygame.Rect((0, y), (
-                                                                                               box_length - 20, -1)),
-                                                                                               object_id=get_text_box_theme(
-                                                                                                   "#text_box_30_horizleft"),
-                                                                                               container=self.event_container,
-                                                                                               starting_height=2,
-                                                                                               manager=MANAGER)
-                self.display_events_elements["event" + str(i)].disable()
-                # Find the next y-height by finding the height of the text box, and adding 35 for the cats button
-
-                if i % 2 == 0:
-                    if game.settings["dark mode"]:
-                        self.display_events_elements["shading" + str(i)] = pygame_gui.elements.UIImage(
-                            pygame.Rect((0, y), (box_length + 100,
-                                                 self.display_events_elements["event" + str(i)].get_relative_rect()[
-                                                     3] + padding)),
-                            image_cache.load_image("resources/images/shading_dark.png"), container=self.event_container,
-                            manager=MANAGER)
-                    else:
-                        self.display_events_elements["shading" + str(i)] = pygame_gui.elements.UIImage(
-                            pygame.Rect((0, y),
-                                        (box_length + 100,
-                                         self.display_events_elements["event" + str(i)].get_relative_rect()[
-                                             3] + padding)),
-                            image_cache.load_image("resources/images/shading.png"), container=self.event_container
-                            , manager=MANAGER)
-
-                    self.display_events_elements["shading" + str(i)].disable()
-
-                y += self.display_events_elements["event" + str(i)].get_relative_rect()[3]
-
-                self.involved_cat_buttons.append(IDImageButton(pygame.Rect(
-                    (self.event_container.get_relative_rect()[2] - button_padding, y - 10), (button_size, button_size)),
-                    ids=ev.cats_involved, container=self.event_container, layer_starting_height=2,
-                    object_id="#events_cat_button", manager=MANAGER))
-
-                y += 68 / 1600 * screen_y
-                i += 1
-            else:
-                print("Incorrectly formatted event:", ev.text, type(ev))
+        scroll_top = 0
+        if self.scroll_height.get(self.event_display_type):
+            scroll_top = min(self.scroll_height[self.event_display_type] * (y + 15),
+                             max(0, y + 15 - self.events_container_y))
+        self.event_container.scrollable_container.set_relative_position((0, -int(scroll_top)))
 
         # Set scrolling container length
         # This is a hack-y solution, but it was the easiest way to have the shading go all the way across the box
         self.event_container.set_scrollable_area_dimensions((box_length, y + 15))
 
-        if self.event_container.vert_scroll_bar:
-            for ele in self.involved_cat_buttons:
-                ele.set_relative_position((ele.get_relative_rect()[0] - 20, ele.get_relative_rect()[1]))
-
         if self.event_container.horiz_scroll_bar:
             self.event_container.set_dimensions((box_length, self.events_container_y + 20))
             self.event_container.horiz_scroll_bar.hide()
         else:
             self.event_container.set_dimensions((box_length, self.events_container_y))
-        # Set the scroll bar to the last position it was at
-        if self.scroll_height.get(self.event_display_type):
-            self.event_container.vert_scroll_bar.set_scroll_from_start_percentage(
-                self.scroll_height[self.event_display_type])
+
+        self.update_event_rows()
+
+    def add_shown_events(self, events):
+        """ Adds the events to the end of the shown list. """
+        for ev in events:
+            if isinstance(ev.text, str):  # Check to make sure text is a string.
+                self.shown_events.append(ev)
+                self.event_positions.append(self.events_height)
+                # the height of the text box, and 68 for the cats button
+                self.events_height += self.get_event_height(ev.text) + 68 / 1600 * screen_y
+            else:
+                print("Incorrectly formatted event:", ev.text, type(ev))
+
+    def add_archived_moon(self):
+        """ Adds the events of the next earlier moon with events of the shown type to the end of the list, under
+        a heading with the moon. """
+        archive = game.get_event_archive(game.clan.name)
+        while True:
+            found = archive.find(event_type=self.archive_types.get(self.event_display_type),
+                                 before_moon=self.archive_before_moon, limit=1)
+            if not found:
+                self.archive_done = True
+                return
+            moon = found[0][0]
+            self.archive_before_moon = moon
+            events = [ev for _, ev in found if "interaction" not in ev.types]
+            if events:
+                break
+
+        self.add_shown_events([Single_Event(f"<b>Clan age: {moon} moon{'' if moon == 1 else 's'}</b>")] + events)
+        self.event_container.set_scrollable_area_dimensions((self.event_container.get_relative_rect()[2],
+                                                             self.events_height + 15))
+
+    def get_event_height(self, text):
+        """ Returns the height of the text box of an event, measured once with a hidden text box. """
+        if text not in self.event_heights:
+            self.measure_box.set_text(text)
+            self.event_heights[text] = self.measure_box.get_relative_rect()[3]
+        return self.event_heights[text]
+
+    def get_scroll_top(self):
+        """ Returns how far down the list of events is scrolled. """
+        return -self.event_container.scrollable_container.get_relative_rect()[1]
+
+    def update_event_rows(self):
+        """ Gives the rows of widgets to the events in and near the visible part of the list. Rows which still show
+        a visible event are left as they are, rows are only made if there aren't enough for the visible events. """
+        scroll_top = self.get_scroll_top()
+        self.shown_scroll_top = scroll_top
+        # events half a screen above and below are ready too, so they don't pop in while scrolling
+        margin = self.events_container_y / 2
+        while not self.archive_done and self.events_height < scroll_top + self.events_container_y + margin:
+            self.add_archived_moon()
+        first = max(bisect.bisect_right(self.event_positions, scroll_top - margin) - 1, 0)
+        last = bisect.bisect_left(self.event_positions, scroll_top + self.events_container_y + margin)
+        visible = range(first, last)
+
+        shown_rows = set()
+        free_rows = []
+        for row in self.event_rows:
+            if row["index"] is not None and row["index"] in visible:
+                shown_rows.add(row["index"])
+            else:
+                free_rows.append(row)
+
+        for i in visible:
+            if i in shown_rows:
+                continue
+            row = free_rows.pop() if free_rows else self.make_event_row()
+            self.fill_event_row(row, i)
+
+        for row in free_rows:
+            self.hide_event_row(row)
+
+    def make_event_row(self):
+        """ Makes the widgets of one event: the text, the shading and the involved cats button. """
+        box_length = self.event_container.get_relative_rect()[2]
+        padding = 70 / 1400 * screen_y
+        button_size = 68 / 1600 * screen_x
+
+        text = pygame_gui.elements.UITextBox("",
+                                             pygame.Rect((0, 0), (box_length - 20, -1)),
+                                             object_id=get_text_box_theme("#text_box_30_horizleft"),
+                                             container=self.event_container,
+                                             starting_height=2,
+                                             manager=MANAGER)
+        text.disable()
+
+        if game.settings["dark mode"]:
+            shading_image = image_cache.load_image("resources/images/shading_dark.png")
+        else:
+            shading_image = image_cache.load_image("resources/images/shading.png")
+        shading = pygame_gui.elements.UIImage(pygame.Rect((0, 0), (box_length + 100, padding)), shading_image,
+                                              container=self.event_container, manager=MANAGER)
+        shading.disable()
+
+        button = IDImageButton(pygame.Rect((0, 0), (button_size, button_size)),
+                               container=self.event_container, layer_starting_height=2,
+                               object_id="#events_cat_button", manager=MANAGER)
+        self.involved_cat_buttons.append(button)
+
+        row = {"index": None, "text": text, "shading": shading, "button": button,
+               "elements": (text, shading, button)}
+        self.event_rows.append(row)
+        return row
+
+    def fill_event_row(self, row, i):
+        """ Moves the row to the i-th shown event and shows that event in it. """
+        if self.open_involved_cat_button == row["button"]:
+            self.close_cat_buttons()
+
+        ev = self.shown_events[i]
+        y = self.event_positions[i]
+        text_height = self.get_event_height(ev.text)
+        row["index"] = i
+
+        if row["text"].html_text != ev.text:
+            row["text"].set_text(ev.text)
+        row["text"].set_relative_position((0, y))
+        row["text"].show()
+
+        if i % 2 == 0:
+            box_length = self.event_container.get_relative_rect()[2]
+            padding = 70 / 1400 * screen_y
+            row["shading"].set_dimensions((box_length + 100, text_height + padding))
+            row["shading"].set_relative_position((0, y))
+            row["shading"].show()
+        else:
+            row["shading"].hide()
+
+        button_padding = 80 / 1400 * screen_x
+        if self.event_container.vert_scroll_bar:
+            button_padding += 20
+        button = row["button"]
+        button.ids = ev.cats_involved
+        if button.ids:
+            button.enable()
+        else:
+            button.disable()
+        button.set_relative_position((self.event_container.get_relative_rect()[2] - button_padding,
+                                      y + text_height - 10))
+        button.show()
+
+    def hide_event_row(self, row):
+        if self.open_involved_cat_button == row["button"]:
+            self.close_cat_buttons()
+        row["index"] = None
+        for ele in row["elements"]:
+            ele.hide()
+
+    def close_cat_buttons(self):
+        """ Closes the cat profile buttons of the open involved cat button. """
+        self.open_involved_cat_button = None
+        for ele in self.cat_profile_buttons:
+            ele.kill()
+        self.cat_profile_buttons = []
 
     def make_cat_buttons(self, button_pressed):
         """ Makes the buttons that take you to the profile. """
@@ -663,23 +812,20 @@ class EventsScreen(Screens):
 
         # If the button pressed does have its cat profile buttons open, just close the buttons.
         else:
-            self.open_involved_cat_button = None
-            for ele in self.cat_profile_buttons:
-                ele.kill()
-            self.cat_profile_buttons = []
+            self.close_cat_buttons()
 
     def update_display_events_lists(self):
         """
         Categorize events from game.cur_events_list into display categories for screen
         """
 
-        self.all_events = [x for x in game.cur_events_list if "interaction" not in x.types]
-        self.ceremony_events = [x for x in game.cur_events_list if "ceremony" in x.types]
-        self.birth_death_events = [x for x in game.cur_events_list if "birth_death" in x.types]
-        self.relation_events = [x for x in game.cur_events_list if "relation" in x.types]
-        self.health_events = [x for x in game.cur_events_list if "health" in x.types]
-        self.other_clans_events = [x for x in game.cur_events_list if "other_clans" in x.types]
-        self.misc_events = [x for x in game.cur_events_list if "misc" in x.types]
+        self.all_events = game.cur_events_list.without_type("interaction")
+        self.ceremony_events = game.cur_events_list.of_type("ceremony")
+        self.birth_death_events = game.cur_events_list.of_type("birth_death")
+        self.relation_events = game.cur_events_list.of_type("relation")
+        self.health_events = game.cur_events_list.of_type("health")
+        self.other_clans_events = game.cur_events_list.of_type("other_clans")
+        self.misc_events = game.cur_events_list.of_type("misc")
 
     def make_events_container(self):
         """ In its own function so that there is only one place the box size is set"""
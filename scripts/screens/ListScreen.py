@@ -4,6 +4,7 @@ import pygame_gui
 
 from .Screens import Screens
 from scripts.cat.cats import Cat
+from scripts.cat.cat_index import CLAN, OUTSIDE, STARCLAN, DARK_FOREST, UNKNOWN_RESIDENCE
 from scripts.game_structure.image_button import UISpriteButton, UIImageButton
 from scripts.utility import get_text_box_theme, scale, shorten_text_to_fit
 from scripts.game_structure.game_essentials import game, screen, screen_x, screen_y, MANAGER
@@ -493,26 +494,22 @@ class ListScreen(Screens):
     def get_your_clan_cats(self):
         self.current_group = 'clan'
         self.death_status = 'living'
-        self.full_cat_list = []
-        for the_cat in Cat.all_cats_list:
-            if not the_cat.dead and not the_cat.outside:
-                self.full_cat_list.append(the_cat)
+        self.full_cat_list = list(Cat.index.cats(CLAN))
 
     def get_cotc_cats(self):
         self.current_group = 'cotc'
         self.death_status = 'living'
         self.full_cat_list = []
-        for the_cat in Cat.all_cats_list:
-            if not the_cat.dead and the_cat.outside and not the_cat.driven_out:
+        for the_cat in Cat.index.cats(OUTSIDE):
+            if not the_cat.driven_out:
                 self.full_cat_list.append(the_cat)
 
     def get_sc_cats(self):
         self.current_group = 'sc'
         self.death_status = 'dead'
         self.full_cat_list = []
-        for the_cat in Cat.all_cats_list:
-            if the_cat.dead and the_cat.ID != game.clan.instructor.ID and not the_cat.outside and not the_cat.df and \
-                    not the_cat.faded:
+        for the_cat in Cat.index.cats(STARCLAN):
+            if the_cat.ID != game.clan.instructor.ID and not the_cat.faded:
                 self.full_cat_list.append(the_cat)
 
     def get_df_cats(self):
@@ -520,16 +517,15 @@ class ListScreen(Screens):
         self.death_status = 'dead'
         self.full_cat_list = []
 
-        for the_cat in Cat.all_cats_list:
-            if the_cat.dead and the_cat.ID != game.clan.instructor.ID and the_cat.df and \
-                    not the_cat.faded:
+        for the_cat in Cat.index.cats(DARK_FOREST):
+            if the_cat.ID != game.clan.instructor.ID and not the_cat.faded:
                 self.full_cat_list.append(the_cat)
 
     def get_ur_cats(self):
         self.current_group = 'ur'
         self.death_status = 'dead'
         self.full_cat_list = []
-        for the_cat in Cat.all_cats_list:
+        for the_cat in Cat.index.cats(UNKNOWN_RESIDENCE):
             if the_cat.ID in game.clan.unknown_cats and not the_cat.faded and not the_cat.driven_out:
                 self.full_cat_list.append(the_cat)
 
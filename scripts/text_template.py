@@ -0,0 +1,154 @@
+"""
+Compiled versions of the texts given to process_text.
+
+A text is split once into literal parts and pronoun tags, like "{PRONOUN/m_c/subject}" or "{VERB/m_c/were/was}".
+The names, like "m_c" or "(mentor)", depend on the keys of the cat dict a text is used with, so the literal parts are
+split again into text and names once for every set of keys. After that, putting in the names and pronouns of the cats
+is a single join.
+
+Tags which are neither a PRONOUN nor a VERB tag are found when the text is compiled, see TextTemplate.malformed_tags.
+
+The compiled texts are kept in a cache, see "text_template_cache_size" in the event_generation section of
+game_config.json. Texts which already had names put in by other replacements only share their template with the
+same text.
+"""
+import logging
+import re
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from scripts.game_structure.game_essentials import game
+
+logger = logging.getLogger(__name__)
+
+TAG_PATTERN = re.compile(r"\{(.*?)\}")
+
+# kinds of the parts of a template, a literal part is just the string
+NAME = 0
+TAG = 1
+
+# keys of a cat dict: the pattern finding the names
+_name_patterns: Dict[Tuple[str, ...], re.Pattern] = {}
+
+
+def render_tag(inner_details: List[str], tag: str, cat_dict: dict, raise_exception=False) -> str:
+    """Returns the replacement of a pronoun or verb tag. inner_details is the tag split at "/", tag is the tag
+    without the braces. If raise_exception is False, a broken tag is replaced with "error1" or "error2"."""
+    try:
+        d = cat_dict[inner_details[1]][1]
+        if inner_details[0].upper() == "PRONOUN":
+            pro = d[inner_details[2]]
+            if inner_details[-1] == "CAP":
+                pro = pro.capitalize()
+            return pro
+        elif inner_details[0].upper() == "VERB":
+            return inner_details[d["conju"] + 1]
+
+        if raise_exception:
+            raise KeyError(f"Pronoun tag: {tag} is not properly"
+                           "indicated as a PRONOUN or VERB tag.")
+
+        print("Failed to find pronoun:", tag)
+        return "error1"
+    except (KeyError, IndexError) as e:
+        if raise_exception:
+            raise
+
+        logger.exception("Failed to find pronoun: " + tag)
+        print("Failed to find pronoun:", tag)
+        return "error2"
+
+
+def get_name_pattern(keys: Tuple[str, ...]):
+    """Returns the pattern which finds the names in a text, for the keys of a cat dict."""
+    if keys not in _name_patterns:
+        # a name which is right next to a brace isn't replaced
+        _name_patterns[keys] = re.compile("|".join(r'(?<!\{)' + re.escape(key) + r'(?!\})' for key in keys))
+    return _name_patterns[keys]
+
+
+class TextTemplate():
+    """A text split into literal parts and pronoun tags."""
+
+    def __init__(self, text: str):
+        self.text = text
+        # literal strings and (TAG, inner details, tag) in the order of the text
+        self.parts = []
+        # the tags which are neither PRONOUN nor VERB tags
+        self.malformed_tags: List[str] = []
+        # the keys of a cat dict: the parts with the names split out of the literal parts
+        self._parts_by_keys: Dict[Tuple[str, ...], list] = {}
+
+        literal = ""
+        position = 0
+        for match in TAG_PATTERN.finditer(text):
+            literal += text[position:match.start()]
+            position = match.end()
+            # protection for the "insert" sometimes used, it's kept as it is
+            if match.group(0) == "{insert}":
+                literal += match.group(0)
+                continue
+            if literal:
+                self.parts.append(literal)
+                literal = ""
+            inner_details = match.group(1).split("/")
+            if inner_details[0].upper() not in ("PRONOUN", "VERB"):
+                self.malformed_tags.append(match.group(1))
+            self.parts.append((TAG, inner_details, match.group(1)))
+        literal += text[position:]
+        if literal:
+            self.parts.append(literal)
+
+    def _get_parts(self, keys: Tuple[str, ...]) -> list:
+        parts = self._parts_by_keys.get(keys)
+        if parts is not None:
+            return parts
+
+        parts = []
+        name_pattern = get_name_pattern(keys) if keys else None
+        for part in self.parts:
+            if not isinstance(part, str) or name_pattern is None:
+                parts.append(part)
+                continue
+            position = 0
+            for match in name_pattern.finditer(part):
+                if match.start() > position:
+                    parts.append(part[position:match.start()])
+                parts.append((NAME, match.group(0)))
+                position = match.end()
+            if position < len(part):
+                parts.append(part[position:])
+        self._parts_by_keys[keys] = parts
+        return parts
+
+    def render(self, cat_dict: dict, raise_exception=False) -> str:
+        """Returns the text with the names and pronouns of the cats in cat_dict put in."""
+        pieces = []
+        for part in self._get_parts(tuple(cat_dict)):
+            if isinstance(part, str):
+                pieces.append(part)
+            elif part[0] == NAME:
+                pieces.append(cat_dict[part[1]][0])
+            else:
+                pieces.append(render_tag(part[1], part[2], cat_dict, raise_exception))
+        return "".join(pieces)
+
+
+# text: its template, the most recently used last
+_templates: Dict[str, TextTemplate] = OrderedDict()
+
+
+def compile_text(text: str) -> TextTemplate:
+    """Returns the template of the text, from the cache if it was compiled before."""
+    template = _templates.get(text)
+    if template is not None:
+        _templates.move_to_end(text)
+        return template
+
+    template = TextTemplate(text)
+    if template.malformed_tags:
+        print(f"WARNING: the pronoun tags {template.malformed_tags} are neither PRONOUN nor VERB tags, in: {text}")
+    _templates[text] = template
+    while len(_templates) > game.config["event_generation"]["text_template_cache_size"]:
+        _templates.popitem(last=False)
+    return template
@@ -12,17 +12,22 @@ import pygame
 import ujson
 import logging
 from sys import exit as sys_exit
+from collections import OrderedDict
 from typing import Dict
 
 logger = logging.getLogger(__name__)
 from scripts.game_structure import image_cache
+from scripts.game_structure.font_cache import get_text_width
 
+from scripts.cat.cat_index import CLAN, OUTSIDE
 from scripts.cat.history import History
 from scripts.cat.names import names
 from scripts.cat.pelts import Pelt
 from scripts.cat.sprites import sprites
+from scripts.cat.sprite_cache import sprite_cache, SpriteCache
 
 from scripts.game_structure.game_essentials import game, screen_x, screen_y
+from scripts.text_template import compile_text, render_tag
 
 
 # ---------------------------------------------------------------------------- #
@@ -33,39 +38,30 @@ def get_alive_clan_queens(living_cats):
     living_kits = [cat for cat in living_cats if not (cat.dead or cat.outside) and cat.status in ["kitten", "newborn"]]
 
     queen_dict = {}
-    for cat in living_kits.copy():
-        parents = cat.get_parents()
+    # the kits without a living parent in the Clan
+    kits_without_queen = []
+    for cat in living_kits:
         # Fetch parent object, only alive and not outside.
-        parents = [cat.fetch_cat(i) for i in parents if
-                   cat.fetch_cat(i) and not (cat.fetch_cat(i).dead or cat.fetch_cat(i).outside)]
+        parents = [cat.fetch_cat(i) for i in cat.get_parents()]
+        parents = [parent for parent in parents if parent and not (parent.dead or parent.outside)]
         if not parents:
+            kits_without_queen.append(cat)
             continue
 
         if len(parents) == 1 or len(parents) > 2 or \
                 all(i.gender == "male" for i in parents) or \
                 parents[0].gender == "female":
-            if parents[0].ID in queen_dict:
-                queen_dict[parents[0].ID].append(cat)
-                living_kits.remove(cat)
-            else:
-                queen_dict[parents[0].ID] = [cat]
-                living_kits.remove(cat)
+            queen_dict.setdefault(parents[0].ID, []).append(cat)
         elif len(parents) == 2:
-            if parents[1].ID in queen_dict:
-                queen_dict[parents[1].ID].append(cat)
-                living_kits.remove(cat)
-            else:
-                queen_dict[parents[1].ID] = [cat]
-                living_kits.remove(cat)
-    return queen_dict, living_kits
+            queen_dict.setdefault(parents[1].ID, []).append(cat)
+    return queen_dict, kits_without_queen
 
 
 def get_alive_kits(Cat):
     """
     returns a list of IDs for all living kittens in the clan
     """
-    alive_kits = [i for i in Cat.all_cats.values() if
-                  i.age in ['kitten', 'newborn'] and not i.dead and not i.outside]
+    alive_kits = [i for i in Cat.index.cats(CLAN) if i.age in ['kitten', 'newborn']]
 
     return alive_kits
 
@@ -76,9 +72,7 @@ def get_med_cats(Cat, working=True) -> list:
 
     set working to False if you want all meds and med apps regardless of their work status
     """
-    all_cats = Cat.all_cats.values()
-    possible_med_cats = [i for i in all_cats if
-                         i.status in ['medicine cat apprentice', 'medicine cat'] and not (i.dead or i.outside)]
+    possible_med_cats = Cat.index.with_status('medicine cat apprentice', 'medicine cat')
 
     if working:
         possible_med_cats = [i for i in possible_med_cats if not i.not_working()]
@@ -93,32 +87,20 @@ def get_living_cat_count(Cat):
     """
     TODO: DOCS
     """
-    count = 0
-    for the_cat in Cat.all_cats.values():
-        if the_cat.dead:
-            continue
-        count += 1
-    return count
+    return Cat.index.count(CLAN) + Cat.index.count(OUTSIDE)
 
 
 def get_living_clan_cat_count(Cat):
     """
     TODO: DOCS
     """
-    count = 0
-    for the_cat in Cat.all_cats.values():
-        if the_cat.dead or the_cat.exiled or the_cat.outside:
-            continue
-        count += 1
-    return count
+    return Cat.index.count(CLAN)
 
 
 def get_cats_same_age(cat, range=10):  # pylint: disable=redefined-builtin
     """Look for all cats in the Clan and returns a list of cats, which are in the same age range as the given cat."""
     cats = []
-    for inter_cat in cat.all_cats.values():
-        if inter_cat.dead or inter_cat.outside or inter_cat.exiled:
-            continue
+    for inter_cat in cat.index.cats(CLAN):
         if inter_cat.ID == cat.ID:
             continue
 
@@ -137,9 +119,7 @@ def get_cats_same_age(cat, range=10):  # pylint: disable=redefined-builtin
 def get_free_possible_mates(cat):
     """Returns a list of available cats, which are possible mates for the given cat."""
     cats = []
-    for inter_cat in cat.all_cats.values():
-        if inter_cat.dead or inter_cat.outside or inter_cat.exiled:
-            continue
+    for inter_cat in cat.index.cats(CLAN):
         if inter_cat.ID == cat.ID:
             continue
 
@@ -601,6 +581,13 @@ def get_amount_of_cats_with_relation_value_towards(cat, value, all_cats):
     :param all_cats: list of cats which has to be checked
     """
 
+    relations = [inter_cat.relationships[cat.ID] for inter_cat in all_cats if cat.ID in inter_cat.relationships]
+
+    # if all relationships are stored in the same matrix, the values can be counted at once
+    matrix = relations[0].matrix if relations else None
+    if matrix is not None and all(relation.matrix is matrix for relation in relations):
+        return matrix.count_values_above(relations, value)
+
     # collect all true or false if the value is reached for the cat or not
     # later count or sum can be used to get the amount of cats
     # this will be handled like this, because it is easier / shorter to check
@@ -614,12 +601,7 @@ def get_amount_of_cats_with_relation_value_towards(cat, value, all_cats):
         "trust": []
     }
 
-    for inter_cat in all_cats:
-        if cat.ID in inter_cat.relationships:
-            relation = inter_cat.relationships[cat.ID]
-        else:
-            continue
-
+    for relation in relations:
         relation_dict['romantic_love'].append(relation.romantic_love >= value)
         relation_dict['platonic_like'].append(relation.platonic_like >= value)
         relation_dict['dislike'].append(relation.dislike >= value)
@@ -717,7 +699,7 @@ def change_relationship_values(cats_to: list,
                   " /Trust: " + str(trust)) if changed else print("No relationship change")'''
 
             if log and isinstance(log, str):
-                rel.log.append(log)
+                rel.add_log(log)
 
 
 # ---------------------------------------------------------------------------- #
@@ -747,31 +729,7 @@ def pronoun_repl(m, cat_pronouns_dict, raise_exception=False):
     if m.group(0) == "{insert}":
         return m.group(0)
 
-    inner_details = m.group(1).split("/")
-
-    try:
-        d = cat_pronouns_dict[inner_details[1]][1]
-        if inner_details[0].upper() == "PRONOUN":
-            pro = d[inner_details[2]]
-            if inner_details[-1] == "CAP":
-                pro = pro.capitalize()
-            return pro
-        elif inner_details[0].upper() == "VERB":
-            return inner_details[d["conju"] + 1]
-
-        if raise_exception:
-            raise KeyError(f"Pronoun tag: {m.group(1)} is not properly"
-                           "indicated as a PRONOUN or VERB tag.")
-
-        print("Failed to find pronoun:", m.group(1))
-        return "error1"
-    except (KeyError, IndexError) as e:
-        if raise_exception:
-            raise
-
-        logger.exception("Failed to find pronoun: " + m.group(1))
-        print("Failed to find pronoun:", m.group(1))
-        return "error2"
+    return render_tag(m.group(1).split("/"), m.group(1), cat_pronouns_dict, raise_exception)
 
 
 def name_repl(m, cat_dict):
@@ -780,13 +738,9 @@ def name_repl(m, cat_dict):
 
 
 def process_text(text, cat_dict, raise_exception=False):
-    """ Add the correct name and pronouns into a string. """
-    adjust_text = re.sub(r"\{(.*?)\}", lambda x: pronoun_repl(x, cat_dict, raise_exception),
-                         text)
-
-    name_patterns = [r'(?<!\{)' + re.escape(l) + r'(?!\})' for l in cat_dict]
-    adjust_text = re.sub("|".join(name_patterns), lambda x: name_repl(x, cat_dict), adjust_text)
-    return adjust_text
+    """ Add the correct name and pronouns into a string. The text is compiled into a template the first time it's
+    used, see scripts/text_template.py. """
+    return compile_text(text).render(cat_dict, raise_exception)
 
 
 def adjust_list_text(list_of_items):
@@ -1153,6 +1107,11 @@ def ceremony_text_adjust(Cat,
     return adjust_text, random_living_parent, random_dead_parent
 
 
+# (name, length limit, font type, font size): the shortened name, the most recently used last
+_shortened_texts = OrderedDict()
+SHORTENED_TEXTS_CACHE_SIZE = 2048
+
+
 def shorten_text_to_fit(name, length_limit, font_size=None, font_type="resources/fonts/NotoSans-Medium.ttf"):
     length_limit = length_limit // 2 if not game.settings['fullscreen'] else length_limit
     # Set the font size based on fullscreen settings if not provided
@@ -1160,15 +1119,19 @@ def shorten_text_to_fit(name, length_limit, font_size=None, font_type="resources
     if font_size is None:
         font_size = 30
     font_size = font_size // 2 if not game.settings['fullscreen'] else font_size
-    # Create the font object
-    font = pygame.font.Font(font_type, font_size)
+
+    # the same names are shortened again every time a page is shown
+    key = (name, length_limit, font_type, font_size)
+    if key in _shortened_texts:
+        _shortened_texts.move_to_end(key)
+        return _shortened_texts[key]
 
     # Add dynamic name lengths by checking the actual width of the text
     total_width = 0
     short_name = ''
+    ellipsis_width = get_text_width(font_type, font_size, "...")
     for index, character in enumerate(name):
-        char_width = font.size(character)[0]
-        ellipsis_width = font.size("...")[0]
+        char_width = get_text_width(font_type, font_size, character)
 
         # Check if the current character is the last one and its width is less than or equal to ellipsis_width
         if index == len(name) - 1 and char_width <= ellipsis_width:
@@ -1183,6 +1146,9 @@ def shorten_text_to_fit(name, length_limit, font_size=None, font_type="resources
     if len(short_name) < len(name):
         short_name += '...'
 
+    _shortened_texts[key] = short_name
+    while len(_shortened_texts) > SHORTENED_TEXTS_CACHE_SIZE:
+        _shortened_texts.popitem(last=False)
     return short_name
 
 
@@ -1209,15 +1175,14 @@ def scale_dimentions(dim):
 
 
 def update_sprite(cat):
+    """Puts the sprite of the cat together ahead of time. Cat.sprite does this by itself the first time the
+    sprite is shown, so this is only needed to avoid doing it later."""
     # First, check if the cat is faded.
     if cat.faded:
         # Don't update the sprite if the cat is faded.
         return
 
-    # apply
-    cat.sprite = generate_sprite(cat)
-    # update class dictionary
-    cat.all_cats[cat.ID] = cat
+    generate_sprite(cat)
 
 
 def clan_symbol_sprite(clan, return_string=False):
@@ -1282,36 +1247,54 @@ def generate_sprite(cat, life_state=None, scars_hidden=False, acc_hidden=False,
     # setting the cat_sprite (bc this makes things much easier)
     if not no_not_working and cat.not_working() and age != 'newborn' and game.config['cat_sprites']['sick_sprites']:
         if age in ['kitten', 'adolescent']:
-            cat_sprite = str(37)
+            cat_sprite = 37
         else:
-            cat_sprite = str(36)
+            cat_sprite = 36
     elif cat.pelt.paralyzed and age != 'newborn':
         if age in ['kitten', 'adolescent']:
-            cat_sprite = str(32)
+            cat_sprite = 32
         else:
             if cat.pelt.length == 'long':
-                cat_sprite = str(31)
+                cat_sprite = 31
             else:
-                cat_sprite = str(30)
+                cat_sprite = 30
     else:
         if age == 'elder' and not game.config['fun']['all_cats_are_newborn']:
             age = 'senior'
 
         if game.config['fun']['all_cats_are_newborn']:
-            cat_sprite = str(cat.pelt.cat_sprites['newborn'])
+            cat_sprite = cat.pelt.cat_sprites['newborn']
         else:
-            cat_sprite = str(cat.pelt.cat_sprites[age])
+            cat_sprite = cat.pelt.cat_sprites[age]
+
+    # stage of the fading fog, None if it isn't applied
+    fade_stage = None
+    if cat.pelt.opacity <= 97 and not cat.prevent_fading and game.clan.clan_settings["fading"] and dead:
+        fade_stage = "0"
+        if 80 >= cat.pelt.opacity > 45:
+            # Stage 1
+            fade_stage = "1"
+        elif cat.pelt.opacity <= 45:
+            # Stage 2
+            fade_stage = "2"
+
+    # cats which look the same share one sprite
+    sprite_key = SpriteCache.make_key(cat.pelt, str(cat_sprite), dead, cat.df, game.settings['shaders'] and not dead,
+                                      fade_stage, scars_hidden, acc_hidden)
+    cached_sprite = sprite_cache.get(sprite_key)
+    if cached_sprite is not None:
+        return cached_sprite
 
     new_sprite = pygame.Surface((sprites.size, sprites.size), pygame.HWSURFACE | pygame.SRCALPHA)
 
     # generating the sprite
     try:
         if cat.pelt.name not in ['Tortie', 'Calico']:
-            new_sprite.blit(sprites.sprites[cat.pelt.get_sprites_name() + cat.pelt.colour + cat_sprite], (0, 0))
+            new_sprite.blit(sprites.get_sprite(cat.pelt.get_sprites_name() + cat.pelt.colour, cat_sprite), (0, 0))
         else:
             # Base Coat
             new_sprite.blit(
-                sprites.sprites[cat.pelt.tortiebase + cat.pelt.colour + cat_sprite],
+                sprites.get_sprite(cat.pelt.tortiebase + cat.pelt.colour, cat_sprite),
                 (0, 0))
 
             # Create the patch image
@@ -1320,8 +1303,8 @@ def generate_sprite(cat, life_state=None, scars_hidden=False, acc_hidden=False,
             else:
                 tortie_pattern = cat.pelt.tortiepattern
 
-            patches = sprites.sprites[tortie_pattern + cat.pelt.tortiecolour + cat_sprite].copy()
-            patches.blit(sprites.sprites["tortiemask" + cat.pelt.pattern + cat_sprite], (0, 0),
+            patches = sprites.get_sprite(tortie_pattern + cat.pelt.tortiecolour, cat_sprite).copy()
+            patches.blit(sprites.get_sprite("tortiemask" + cat.pelt.pattern, cat_sprite), (0, 0),
                          special_flags=pygame.BLEND_RGBA_MULT)
 
             # Add patches onto cat.
@@ -1339,7 +1322,7 @@ def generate_sprite(cat, life_state=None, scars_hidden=False, acc_hidden=False,
 
         # draw white patches
         if cat.pelt.white_patches is not None:
-            white_patches = sprites.sprites['white' + cat.pelt.white_patches + cat_sprite].copy()
+            white_patches = sprites.get_sprite('white' + cat.pelt.white_patches, cat_sprite).copy()
 
             # Apply tint to white patches.
             if cat.pelt.white_patches_tint != "none" and cat.pelt.white_patches_tint in sprites.white_patches_tints[
@@ -1353,7 +1336,7 @@ def generate_sprite(cat, life_state=None, scars_hidden=False, acc_hidden=False,
         # draw vit & points
 
         if cat.pelt.points:
-            points = sprites.sprites['white' + cat.pelt.points + cat_sprite].copy()
+            points = sprites.get_sprite('white' + cat.pelt.points, cat_sprite).copy()
             if cat.pelt.white_patches_tint != "none" and cat.pelt.white_patches_tint in sprites.white_patches_tints[
                 "tint_colours"]:
                 tint = pygame.Surface((sprites.size, sprites.size)).convert_alpha()
@@ -1362,97 +1345,88 @@ def generate_sprite(cat, life_state=None, scars_hidden=False, acc_hidden=False,
             new_sprite.blit(points, (0, 0))
 
         if cat.pelt.vitiligo:
-            new_sprite.blit(sprites.sprites['white' + cat.pelt.vitiligo + cat_sprite], (0, 0))
+            new_sprite.blit(sprites.get_sprite('white' + cat.pelt.vitiligo, cat_sprite), (0, 0))
 
         # draw eyes
         if cat.pelt.eye_colour2 != None:
-            eyes = sprites.sprites["eyes" + cat.pelt.eye_colour + cat_sprite].copy().convert_alpha()
+            eyes = sprites.get_sprite("eyes" + cat.pelt.eye_colour, cat_sprite).copy().convert_alpha()
             new_sprite.blit(eyes, (0, 0))
-            second_eye = sprites.sprites["eyes" + cat.pelt.eye_colour2 + cat_sprite].copy().convert_alpha()
-            second_eye.blit(sprites.sprites["eyes2" + cat.pelt.eye_pattern + cat_sprite], (0, 0),
+            second_eye = sprites.get_sprite("eyes" + cat.pelt.eye_colour2, cat_sprite).copy().convert_alpha()
+            second_eye.blit(sprites.get_sprite("eyes2" + cat.pelt.eye_pattern, cat_sprite), (0, 0),
                             special_flags=pygame.BLEND_RGBA_MULT)
             new_sprite.blit(second_eye, (0, 0))
         else:
-            eyes = sprites.sprites['eyes' + cat.pelt.eye_colour + cat_sprite].copy()
+            eyes = sprites.get_sprite('eyes' + cat.pelt.eye_colour, cat_sprite).copy()
             new_sprite.blit(eyes, (0, 0))
 
         #scars1
         if not scars_hidden:
             for scar in cat.pelt.scars:
                 if scar in cat.pelt.scars1:
-                    new_sprite.blit(sprites.sprites['scars' + scar + cat_sprite], (0, 0))
+                    new_sprite.blit(sprites.get_sprite('scars' + scar, cat_sprite), (0, 0))
                 if scar in cat.pelt.scars3:
-                    new_sprite.blit(sprites.sprites['scars' + scar + cat_sprite], (0, 0))
+                    new_sprite.blit(sprites.get_sprite('scars' + scar, cat_sprite), (0, 0))
 
         # draw line art
         if game.settings['shaders'] and not dead:
-            new_sprite.blit(sprites.sprites['shaders' + cat_sprite], (0, 0), special_flags=pygame.BLEND_RGB_MULT)
-            new_sprite.blit(sprites.sprites['lighting' + cat_sprite], (0, 0))
+            new_sprite.blit(sprites.get_sprite('shaders', cat_sprite), (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+            new_sprite.blit(sprites.get_sprite('lighting', cat_sprite), (0, 0))
 
         if not dead:
-            new_sprite.blit(sprites.sprites['lines' + cat_sprite], (0, 0))
+            new_sprite.blit(sprites.get_sprite('lines', cat_sprite), (0, 0))
         elif cat.df:
-            new_sprite.blit(sprites.sprites['lineartdf' + cat_sprite], (0, 0))
+            new_sprite.blit(sprites.get_sprite('lineartdf', cat_sprite), (0, 0))
         elif dead:
-            new_sprite.blit(sprites.sprites['lineartdead' + cat_sprite], (0, 0))
+            new_sprite.blit(sprites.get_sprite('lineartdead', cat_sprite), (0, 0))
         # draw skin and scars2
         blendmode = pygame.BLEND_RGBA_MIN
-        new_sprite.blit(sprites.sprites['skin' + cat.pelt.skin + cat_sprite], (0, 0))
+        new_sprite.blit(sprites.get_sprite('skin' + cat.pelt.skin, cat_sprite), (0, 0))
 
         if not scars_hidden:
             for scar in cat.pelt.scars:
                 if scar in cat.pelt.scars2:
-                    new_sprite.blit(sprites.sprites['scars' + scar + cat_sprite], (0, 0), special_flags=blendmode)
+                    new_sprite.blit(sprites.get_sprite('scars' + scar, cat_sprite), (0, 0), special_flags=blendmode)
 
         # draw accessories
         if not acc_hidden:
             if cat.pelt.accessory in cat.pelt.plant_accessories:
-                new_sprite.blit(sprites.sprites['acc_herbs' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_herbs' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.wild_accessories:
-                new_sprite.blit(sprites.sprites['acc_wild' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_wild' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.collars:
-                new_sprite.blit(sprites.sprites['collars' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('collars' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.living_accessories:
-                new_sprite.blit(sprites.sprites['acc_moss' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_moss' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.plant2_accessories:
-                new_sprite.blit(sprites.sprites['acc_moss' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_moss' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.wild2_accessories:
-                new_sprite.blit(sprites.sprites['acc_moss' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_moss' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.beach_accessories:
-                new_sprite.blit(sprites.sprites['acc_moss' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_moss' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.mountain_accessories:
-                new_sprite.blit(sprites.sprites['acc_moss' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_moss' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.plains_accessories:
-                new_sprite.blit(sprites.sprites['acc_moss' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_moss' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.forest_accessories:
-                new_sprite.blit(sprites.sprites['acc_moss' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_moss' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.special_accessories:
-                new_sprite.blit(sprites.sprites['acc_moss' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_moss' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.dog_collars:
-                new_sprite.blit(sprites.sprites['dogcollars' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('dogcollars' + cat.pelt.accessory, cat_sprite), (0, 0))
             elif cat.pelt.accessory in cat.pelt.kitty_accessories:
-                new_sprite.blit(sprites.sprites['acc_kitty' + cat.pelt.accessory + cat_sprite], (0, 0))
+                new_sprite.blit(sprites.get_sprite('acc_kitty' + cat.pelt.accessory, cat_sprite), (0, 0))
 
         # Apply fading fog
-        if cat.pelt.opacity <= 97 and not cat.prevent_fading and game.clan.clan_settings["fading"] and dead:
-
-            stage = "0"
-            if 80 >= cat.pelt.opacity > 45:
-                # Stage 1
-                stage = "1"
-            elif cat.pelt.opacity <= 45:
-                # Stage 2
-                stage = "2"
-
-            new_sprite.blit(sprites.sprites['fademask' + stage + cat_sprite],
+        if fade_stage is not None:
+            new_sprite.blit(sprites.get_sprite('fademask' + fade_stage, cat_sprite),
                             (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
 
             if cat.df:
-                temp = sprites.sprites['fadedf' + stage + cat_sprite].copy()
+                temp = sprites.get_sprite('fadedf' + fade_stage, cat_sprite).copy()
                 temp.blit(new_sprite, (0, 0))
                 new_sprite = temp
             else:
-                temp = sprites.sprites['fadestarclan' + stage + cat_sprite].copy()
+                temp = sprites.get_sprite('fadestarclan' + fade_stage, cat_sprite).copy()
                 temp.blit(new_sprite, (0, 0))
                 new_sprite = temp
 
@@ -1460,6 +1434,8 @@ def generate_sprite(cat, life_state=None, scars_hidden=False, acc_hidden=False,
         if cat.pelt.reverse:
             new_sprite = pygame.transform.flip(new_sprite, True, False)
 
+        sprite_cache.put(sprite_key, new_sprite)
+
     except (TypeError, KeyError):
         logger.exception("Failed to load sprite")
 
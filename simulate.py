@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Skips moons without opening the game window, and reports how fast it was.
+
+Examples:
+    python simulate.py --moons 50 --cats 100 --seed 1
+    python simulate.py --moons 20 --load MyClan --profile
+
+A generated Clan is created in the saves folder and deleted again afterwards. With --load, a copy of the Clan is
+used, so the save itself isn't changed. See scripts/housekeeping/simulation.py.
+"""
+import argparse
+import os
+import sys
+
+# has to be set before pygame is imported, so no display is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+directory = os.path.dirname(os.path.abspath(__file__))
+os.chdir(directory)
+sys.path.insert(0, directory)
+
+from scripts.housekeeping.datadir import setup_data_dir  # pylint: disable=wrong-import-position
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Skips moons without the game window.")
+    parser.add_argument("--moons", type=int, default=20, help="number of moons to skip")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the random numbers")
+    parser.add_argument("--cats", type=int, default=30, help="number of cats of a generated Clan")
+    parser.add_argument("--load", default=None, help="name of a saved Clan to copy instead of generating one")
+    parser.add_argument("--name", default=None, help="name of the simulated Clan")
+    parser.add_argument("--mode", default="expanded", choices=("classic", "expanded", "cruel season"),
+                        help="game mode of a generated Clan")
+    parser.add_argument("--keep", action="store_true", help="don't delete the simulated Clan afterwards")
+    parser.add_argument("--profile", action="store_true", help="export a profile of the moon skips")
+    parser.add_argument("--output", default=None, help="write the report as JSON to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    setup_data_dir()
+
+    import ujson
+    from scripts.cat.sprites import sprites
+    from scripts.housekeeping.simulation import run_simulation
+
+    sprites.load_all()
+    report = run_simulation(args.moons, seed=args.seed, size=args.cats, load=args.load, name=args.name,
+                            game_mode=args.mode, keep=args.keep, profile=args.profile)
+
+    text = ujson.dumps(report, indent=4)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as write_file:
+            write_file.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,12 @@ from copy import deepcopy
 import unittest
 from unittest.mock import patch
 
+import pygame
+
 from scripts.cat.cats import Cat
+from scripts.cat.cat_index import CatIndex, CLAN, OUTSIDE, STARCLAN
+from scripts.cat.sprite_atlas import SpriteAtlas, SpriteGroup
+from scripts.cat.sprite_cache import SpriteCache
 from scripts.cat_relations.relationship import Relationship
 
 import os
@@ -400,3 +405,203 @@ class TestUpdateMentor(unittest.TestCase):
         self.assertFalse(app.ID in mentor.apprentice)
         self.assertTrue(app.ID in mentor.former_apprentices)
         self.assertIsNone(app.mentor)
+
+
+class TestSpriteCache(unittest.TestCase):
+
+    def test_same_look_same_key(self):
+        # given
+        pelt1 = Cat().pelt
+        pelt2 = deepcopy(pelt1)
+
+        # then
+        self.assertEqual(SpriteCache.make_key(pelt1, "8", False, False, True, None, False, False),
+                         SpriteCache.make_key(pelt2, "8", False, False, True, None, False, False))
+        self.assertNotEqual(SpriteCache.make_key(pelt1, "8", False, False, True, None, False, False),
+                            SpriteCache.make_key(pelt1, "8", True, False, False, None, False, False))
+
+        # when
+        pelt2.reverse = not pelt2.reverse
+
+        # then
+        self.assertNotEqual(SpriteCache.make_key(pelt1, "8", False, False, True, None, False, False),
+                            SpriteCache.make_key(pelt2, "8", False, False, True, None, False, False))
+
+    def test_least_recently_used_is_dropped(self):
+        # given
+        cache = SpriteCache(max_size=2)
+        cache.put(("a",), "sprite a")
+        cache.put(("b",), "sprite b")
+
+        # when
+        cache.get(("a",))
+        cache.put(("c",), "sprite c")
+
+        # then
+        self.assertEqual(cache.get(("a",)), "sprite a")
+        self.assertIsNone(cache.get(("b",)))
+        self.assertEqual(cache.get(("c",)), "sprite c")
+
+
+class TestSpriteAtlas(unittest.TestCase):
+
+    def setUp(self):
+        # a sheet with two groups of 3x2 sprites of 2x2 pixels, every sprite has its own colour
+        self.sheet = pygame.Surface((12, 4), pygame.SRCALPHA)
+        for index in range(12):
+            self.sheet.fill((index, 0, 0, 255), (index % 6 * 2, index // 6 * 2, 2, 2))
+        self.atlas = SpriteAtlas()
+        self.atlas.add_group("lines", SpriteGroup(self.sheet, 0, 0, 3, 2, 2))
+        self.atlas.add_group("lines1", SpriteGroup(self.sheet, 6, 0, 3, 2, 2))
+
+    def test_sprite_by_group_and_pose(self):
+        # when
+        sprite = self.atlas.get_sprite("lines1", 4)
+
+        # then
+        self.assertIs(sprite.get_parent(), self.sheet)
+        self.assertEqual(sprite.get_at((0, 0)).r, 10)
+        self.assertIs(sprite, self.atlas.get_sprite("lines1", 4))
+        with self.assertRaises(KeyError):
+            self.atlas.get_sprite("lines", 6)
+
+    def test_sprite_by_full_name(self):
+        # then
+        self.assertIs(self.atlas["lines5"], self.atlas.get_sprite("lines", 5))
+        self.assertIs(self.atlas["lines12"], self.atlas.get_sprite("lines1", 2))
+        self.assertNotIn("lines6", self.atlas)
+        self.assertNotIn("lines05", self.atlas)
+        self.assertEqual(len(self.atlas), 12)
+        self.assertIn("lines15", list(self.atlas))
+
+
+class TestCatIndex(unittest.TestCase):
+
+    def test_dead_cat_changes_group(self):
+        # given
+        test_cat = Cat(status="warrior")
+        self.assertIn(test_cat, Cat.index.cats(CLAN))
+
+        # when
+        test_cat.dead = True
+
+        # then
+        self.assertNotIn(test_cat, Cat.index.cats(CLAN))
+        self.assertIn(test_cat, Cat.index.cats(STARCLAN))
+        self.assertNotIn(test_cat, Cat.index.with_status("warrior"))
+
+    def test_exiled_cat_changes_group(self):
+        # given
+        test_cat = Cat(status="warrior")
+
+        # when
+        test_cat.exiled = True
+
+        # then
+        self.assertNotIn(test_cat, Cat.index.cats(CLAN))
+        self.assertIn(test_cat, Cat.index.cats(OUTSIDE))
+
+    def test_status_change(self):
+        # given
+        test_cat = Cat(status="warrior")
+
+        # when
+        test_cat.status = "medicine cat"
+
+        # then
+        self.assertNotIn(test_cat, Cat.index.with_status("warrior"))
+        self.assertIn(test_cat, Cat.index.with_status("medicine cat"))
+
+    def test_removed_cat(self):
+        # given
+        test_cat = Cat(status="warrior")
+
+        # when
+        del Cat.all_cats[test_cat.ID]
+        test_cat.status = "elder"
+
+        # then
+        self.assertNotIn(test_cat, Cat.index.cats(CLAN))
+        self.assertNotIn(test_cat, Cat.index.with_status("elder"))
+
+    def test_sample_excludes_cat(self):
+        # given
+        index = CatIndex()
+        cat1 = Cat(status="warrior")
+        cat2 = Cat(status="warrior")
+        index.update(cat1)
+        index.update(cat2)
+
+        # then
+        for _ in range(20):
+            self.assertIs(index.sample(CLAN, exclude=cat1), cat2)
+
+    def test_sample_after_removal(self):
+        # given
+        index = CatIndex()
+        cats = [Cat(status="warrior") for _ in range(3)]
+        for cat in cats:
+            index.update(cat)
+
+        # when
+        index.remove(cats[0].ID)
+
+        # then
+        self.assertEqual(2, index.count(CLAN))
+        for _ in range(20):
+            self.assertIn(index.sample(CLAN), cats[1:])
+        self.assertIsNone(index.sample(STARCLAN))
+
+
+class TestFamilyGraph(unittest.TestCase):
+
+    def test_family_is_found(self):
+        # given
+        grand_parent = Cat()
+        parent = Cat(parent1=grand_parent.ID)
+        aunt = Cat(parent1=grand_parent.ID)
+        kit = Cat(parent1=parent.ID)
+        cousin = Cat(parent1=aunt.ID)
+
+        # then
+        self.assertTrue(parent.is_parent(kit))
+        self.assertTrue(kit.is_cousin(cousin))
+        self.assertTrue(parent.is_sibling(aunt))
+        self.assertTrue(grand_parent.is_grandparent(kit))
+
+    def test_changed_parent_moves_edge(self):
+        # given
+        parent = Cat()
+        other_parent = Cat()
+        kit = Cat(parent1=parent.ID)
+
+        # when
+        kit.parent1 = other_parent.ID
+
+        # then
+        self.assertNotIn(kit.ID, Cat.family_graph.get_children(parent.ID))
+        self.assertEqual([kit.ID], Cat.family_graph.get_children(other_parent.ID))
+
+    def test_adoptive_parent(self):
+        # given
+        parent = Cat()
+        kit = Cat()
+
+        # when
+        kit.adoptive_parents.append(parent.ID)
+        kit.update_family_graph()
+
+        # then
+        self.assertIn(kit.ID, parent.get_children())
+
+    def test_inheritance_follows_new_kit(self):
+        # given
+        parent = Cat()
+        self.assertEqual([], list(parent.get_children()))
+
+        # when
+        kit = Cat(parent1=parent.ID)
+
+        # then
+        self.assertIn(kit.ID, parent.get_children())
+        self.assertTrue(parent.is_related(kit, True))
@@ -0,0 +1,52 @@
+import unittest
+
+from scripts.event_class import EventList, Single_Event
+
+
+class TestEventList(unittest.TestCase):
+    def test_events_by_type_keep_list_order(self):
+        # given
+        events = EventList()
+        first = Single_Event("first", "health", ["1"])
+        second = Single_Event("second", ["health", "misc"], ["2"])
+        third = Single_Event("third", "misc", ["1", "2"])
+
+        # when
+        events.append(first)
+        events.append(third)
+        events.insert(1, second)
+
+        # then
+        self.assertEqual([first, second, third], events)
+        self.assertEqual([first, second], events.of_type("health"))
+        self.assertEqual([second, third], events.of_type("misc"))
+        self.assertEqual([first, third], events.involving("1"))
+        self.assertEqual([first], events.without_type("misc"))
+        self.assertEqual([], events.of_type("ceremony"))
+
+    def test_indexes_follow_other_changes(self):
+        # given
+        events = EventList([Single_Event("first", "health", ["1"]), Single_Event("second", "misc", ["1"])])
+        self.assertEqual(2, len(events.involving("1")))
+
+        # when
+        removed = events.pop(0)
+        events.insert(0, Single_Event("new", "misc"))
+
+        # then
+        self.assertEqual([], events.of_type("health"))
+        self.assertEqual(["new", "second"], [event.text for event in events.of_type("misc")])
+        self.assertNotIn(removed, events.involving("1"))
+
+    def test_clear(self):
+        # given
+        events = EventList([Single_Event("first", "health", ["1"])])
+
+        # when
+        events.clear()
+        events.append(Single_Event("second", "misc"))
+
+        # then
+        self.assertEqual([], events.of_type("health"))
+        self.assertEqual([], events.involving("1"))
+        self.assertEqual(1, len(events.of_type("misc")))
@@ -3,6 +3,7 @@ import unittest
 from scripts.cat.cats import Cat
 from scripts.cat_relations.relationship import Relationship
 from scripts.patrol.patrol import PatrolEvent, Patrol
+from scripts.patrol.patrol_catalog import PatrolCatalog
 from scripts.clan import Clan
 
 import os
@@ -501,3 +502,41 @@ class TestRelationshipConstraintPatrols(unittest.TestCase):
         patrol.add_patrol_cats([cat1, cat2], test_clan)
         self.assertTrue(patrol._filter_relationship(con_patrol_event))
         self.assertFalse(patrol._filter_relationship(con_patrol_event2))
+
+
+class TestPatrolCatalog(unittest.TestCase):
+
+    def test_catalog_is_cached(self):
+        # given
+        catalog = PatrolCatalog.get_catalog("forest", "greenleaf")
+
+        # then
+        self.assertIs(catalog, PatrolCatalog.get_catalog("Forest", "Greenleaf"))
+        self.assertIsNot(catalog, PatrolCatalog.get_catalog("forest", "leaf-bare"))
+
+    def test_candidates_fit_patrol(self):
+        # given
+        catalog = PatrolCatalog.get_catalog("forest", "greenleaf")
+
+        # when
+        candidates = catalog.candidates(["hunting", "hunting_szn", "hunting_gen"], 1, "forest", "camp1",
+                                        "greenleaf")
+
+        # then
+        self.assertTrue(candidates)
+        for patrol in candidates:
+            self.assertTrue(patrol.min_cats <= 1 <= patrol.max_cats)
+            self.assertTrue("forest" in patrol.biome or "any" in patrol.biome)
+            self.assertTrue("greenleaf" in patrol.season or "any" in patrol.season)
+            self.assertTrue("camp1" in patrol.camp or "any" in patrol.camp)
+
+    def test_candidates_keep_file_order(self):
+        # given
+        catalog = PatrolCatalog.get_catalog("forest", "greenleaf")
+        all_patrols = catalog.candidates(PatrolCatalog.GROUPS, 3, "forest", "camp1", "greenleaf")
+
+        # when
+        positions = [catalog.patrols.index(patrol) for patrol in all_patrols]
+
+        # then
+        self.assertEqual(positions, sorted(positions))
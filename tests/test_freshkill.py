@@ -417,3 +417,27 @@ class FreshkillPile(unittest.TestCase):
         self.assertEqual(freshkill_pile.nutrition_info[injured_cat.ID].percentage, 100)
         self.assertEqual(freshkill_pile.nutrition_info[sick_cat.ID].percentage, 100)
         self.assertLess(freshkill_pile.nutrition_info[healthy_cat.ID].percentage, 70)
+
+    def test_food_needed_once_per_feeding(self) -> None:
+        # given
+        class CountingPile(Freshkill_Pile):
+            calls = 0
+
+            def amount_food_needed(self):
+                CountingPile.calls += 1
+                return super().amount_food_needed()
+
+        living_cats = []
+        for _ in range(5):
+            warrior = Cat()
+            warrior.status = "warrior"
+            living_cats.append(warrior)
+        freshkill_pile = CountingPile()
+
+        # when
+        freshkill_pile.feed_cats(living_cats)
+
+        # then
+        self.assertEqual(CountingPile.calls, 1)
+        self.assertEqual(freshkill_pile.total_amount,
+                         self.amount - 5 * self.prey_requirement["warrior"])
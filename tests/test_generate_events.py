@@ -0,0 +1,110 @@
+import os
+import random
+import tempfile
+import unittest
+
+import ujson
+
+from scripts.cat.cats import Cat
+from scripts.clan import Clan
+from scripts.events_module.generate_events import GenerateEvents, ShortEvent, ShortEventCatalog
+from scripts.game_structure.game_essentials import game
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class TestShortEventCatalog(unittest.TestCase):
+    def setUp(self):
+        self.old_clan = game.clan
+        game.clan = Clan(name="test")
+        game.clan.game_mode = "expanded"
+        game.clan.current_season = "Newleaf"
+        self.cat = Cat(status="warrior")
+
+    def tearDown(self):
+        game.clan = self.old_clan
+
+    def test_war_events_need_a_war(self):
+        # given
+        peace_event = ShortEvent(tags=["Newleaf"])
+        war_event = ShortEvent(tags=["Newleaf", "war"])
+        catalog = ShortEventCatalog([peace_event, war_event])
+
+        # when
+        candidates = catalog.candidates(self.cat, None, war=False, war_event=False, murder=False,
+                                        murder_reveal=False)
+
+        # then
+        self.assertEqual([peace_event], candidates)
+
+    def test_all_lives_events_are_kept_out_of_season(self):
+        # given
+        leaf_bare_event = ShortEvent(tags=["Leaf-bare"])
+        all_lives_event = ShortEvent(tags=["Leaf-bare", "all_lives"])
+        catalog = ShortEventCatalog([leaf_bare_event, all_lives_event])
+
+        # when
+        candidates = catalog.candidates(self.cat, None, war=False, war_event=False, murder=False,
+                                        murder_reveal=False)
+
+        # then
+        self.assertEqual([all_lives_event], candidates)
+
+    def test_required_trait(self):
+        # given
+        trait = self.cat.personality.trait
+        fitting_event = ShortEvent(tags=["Newleaf", "skill_trait_required"], cat_trait=[trait])
+        other_event = ShortEvent(tags=["Newleaf", "skill_trait_required"], cat_trait=[f"not {trait}"])
+        catalog = ShortEventCatalog([fitting_event, other_event])
+
+        # when
+        candidates = catalog.candidates(self.cat, None, war=False, war_event=False, murder=False,
+                                        murder_reveal=False)
+
+        # then
+        self.assertEqual([fitting_event], candidates)
+
+    def test_elders_roll_like_the_full_scan(self):
+        # given
+        trait = self.cat.personality.trait
+        catalog = ShortEventCatalog([
+            ShortEvent(tags=["Newleaf", "multi_death"]),
+            ShortEvent(tags=["Newleaf", "skill_trait_required"], cat_trait=[f"not {trait}"]),
+            ShortEvent(tags=["Newleaf"]),
+            ShortEvent(tags=["Newleaf", "old_age"]),
+        ])
+        self.cat.moons = game.config["death_related"]["old_age_death_start"] + 20
+
+        for seed in range(20):
+            # when
+            results = []
+            for events in (catalog, list(catalog)):
+                random.seed(seed)
+                final_events = GenerateEvents.filter_possible_short_events(events, self.cat, None, False, None,
+                                                                           None, False)
+                results.append((final_events, random.random()))
+
+            # then
+            self.assertEqual(results[1], results[0])
+
+
+class TestEventFileCache(unittest.TestCase):
+    def test_changed_file_is_read_again(self):
+        # given
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/events.json"
+            with open(path, 'w') as write_file:
+                write_file.write(ujson.dumps(["old"]))
+            self.assertEqual(["old"], GenerateEvents._load_file(path))
+
+            # when
+            with open(path, 'w') as write_file:
+                write_file.write(ujson.dumps(["new", "longer"]))
+            unchanged = GenerateEvents._load_file(path)
+            GenerateEvents.check_resources()
+
+            # then
+            self.assertEqual(["old"], unchanged)
+            self.assertEqual(["new", "longer"], GenerateEvents._load_file(path))
+            GenerateEvents.clear_loaded_events()
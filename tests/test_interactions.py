@@ -4,6 +4,7 @@ from scripts.cat.skills import SkillPath, Skill
 
 from scripts.cat_relations.interaction import (
     Single_Interaction, 
+    InteractionCatalog,
     rel_fulfill_rel_constraints,
     cats_fulfill_single_interaction_constraints
 )
@@ -223,3 +224,35 @@ class SingleInteractionCatConstraints(unittest.TestCase):
 
             self.assertTrue(cats_fulfill_single_interaction_constraints(clan, clan, clan_to_all, game_mode))
             self.assertTrue(cats_fulfill_single_interaction_constraints(clan, clan, all_to_clan, game_mode))
+
+
+class TestInteractionCatalog(unittest.TestCase):
+    def test_same_as_single_checks(self):
+        # given
+        warrior = Cat()
+        warrior.status = "warrior"
+        medicine = Cat()
+        medicine.status = "medicine cat"
+        rel = Relationship(warrior, medicine)
+        rel.platonic_like = 40
+
+        no_constraint = Single_Interaction("no_constraint")
+        warrior_to_medicine = Single_Interaction("warrior_to_medicine")
+        warrior_to_medicine.main_status_constraint = ["warrior"]
+        warrior_to_medicine.random_status_constraint = ["medicine cat"]
+        medicine_to_all = Single_Interaction("medicine_to_all")
+        medicine_to_all.main_status_constraint = ["medicine cat"]
+        high_platonic = Single_Interaction("high_platonic", relationship_constraint=["platonic_50"])
+        low_platonic = Single_Interaction("low_platonic", relationship_constraint=["platonic_30"])
+        interactions = [no_constraint, warrior_to_medicine, medicine_to_all, high_platonic, low_platonic]
+
+        # when
+        catalog = InteractionCatalog(interactions)
+
+        # then
+        self.assertEqual([no_constraint, warrior_to_medicine, low_platonic], catalog.candidates(rel, "expanded"))
+        self.assertEqual(
+            [interaction for interaction in interactions
+             if cats_fulfill_single_interaction_constraints(warrior, medicine, interaction, "expanded")
+             and rel_fulfill_rel_constraints(rel, interaction.relationship_constraint, interaction.id)],
+            catalog.candidates(rel, "expanded"))
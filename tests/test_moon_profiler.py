@@ -0,0 +1,68 @@
+import unittest
+
+import os
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+from scripts.cat.cats import Cat
+from scripts.housekeeping.moon_profiler import MoonProfiler
+
+
+class FakeEvents():
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def one_moon(self):
+        self.profiler.mark_phase("cats")
+        self.one_moon_cat()
+        self.one_moon_cat()
+        self.profiler.mark_phase("herbs")
+        self.herb_gather()
+
+    def one_moon_cat(self):
+        pass
+
+    def herb_gather(self):
+        pass
+
+
+for handler in MoonProfiler.EVENT_HANDLERS:
+    if not hasattr(FakeEvents, handler):
+        setattr(FakeEvents, handler, lambda self: None)
+
+
+class TestMoonProfiler(unittest.TestCase):
+
+    def test_phases_are_nested(self):
+        # given
+        profiler = MoonProfiler()
+        events = FakeEvents(profiler)
+
+        # when
+        profiler.start(events)
+        events.one_moon()
+        events.one_moon()
+        profiler.stop()
+
+        # then
+        self.assertEqual(profiler.moons, 2)
+        self.assertEqual(profiler.stats[("one_moon", "cats", "one_moon_cat")][0], 4)
+        self.assertEqual(profiler.stats[("one_moon", "herbs", "herb_gather")][0], 2)
+        self.assertIn("one_moon;cats;one_moon_cat ", profiler.get_collapsed_stacks())
+        self.assertEqual(profiler.get_report()["phases"][0]["path"], ["one_moon"])
+
+    def test_stop_removes_wrappers(self):
+        # given
+        profiler = MoonProfiler()
+        events = FakeEvents(profiler)
+        sort_cats = Cat.__dict__["sort_cats"]
+
+        # when
+        profiler.start(events)
+        profiler.stop()
+        events.one_moon()
+
+        # then
+        self.assertIs(Cat.__dict__["sort_cats"], sort_cats)
+        self.assertNotIn("one_moon", events.__dict__)
+        self.assertEqual(profiler.moons, 0)
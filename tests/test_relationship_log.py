@@ -0,0 +1,70 @@
+import os
+import unittest
+
+from scripts.cat.cats import Cat
+from scripts.cat_relations.relationship import Relationship
+from scripts.cat_relations.relationship_log import RelationshipLog
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class TestRelationshipLog(unittest.TestCase):
+    def setUp(self):
+        self.cat = Cat()
+        self.other_cat = Cat()
+
+    def test_entries_are_kept_as_text(self):
+        # given
+        log = RelationshipLog(self.cat, self.other_cat, limit=0)
+        text = f"They shared a mouse. (low positive effect) - {self.cat.name} was 12 moons old"
+
+        # when
+        log.append(text)
+        log.append("Something else happened.")
+
+        # then
+        self.assertEqual([text, "Something else happened."], list(log))
+        self.assertEqual(text, log[0])
+        self.assertEqual("low positive", log.get_effect(0))
+        self.assertEqual([text, "Something else happened."], log.get_save_list())
+
+    def test_old_entries_are_spilled(self):
+        # given
+        log = RelationshipLog(self.cat, self.other_cat, limit=2)
+
+        # when
+        for i in range(2, 7):
+            log.append(f"entry {i} - {self.cat.name} was {i} moons old")
+
+        # then
+        self.assertEqual([f"entry {i} - {self.cat.name} was {i} moons old" for i in (5, 6)], list(log))
+        self.assertEqual([f"entry {i} - {self.cat.name} was {i} moons old" for i in (2, 3, 4)], log.take_spilled())
+        self.assertEqual([], log.spilled)
+
+    def test_entries_keep_the_old_name(self):
+        # given
+        log = RelationshipLog(self.cat, self.other_cat, limit=1)
+        texts = [f"They shared a mouse. (neutral effect) - {self.cat.name} was {moons} moons old" for moons in (3, 4)]
+        for text in texts:
+            log.append(text)
+
+        # when
+        self.cat.name.prefix = "Renamed"
+        self.cat.status = "apprentice"
+
+        # then
+        self.assertEqual(texts[1:], log.get_save_list())
+        self.assertEqual(texts[:1], log.take_spilled())
+
+    def test_saved_log_is_loaded(self):
+        # given
+        saved = [f"They shared a mouse. (neutral effect) - {self.cat.name} was 1 moon old",
+                 "An old entry - Oldname was 3 moons old"]
+
+        # when
+        relationship = Relationship(self.cat, self.other_cat, log=saved)
+
+        # then
+        self.assertEqual([f"They shared a mouse. (neutral effect) - {self.cat.name} was 1 moon old",
+                          "An old entry - Oldname was 3 moons old"], list(relationship.log))
@@ -1,9 +1,22 @@
 import unittest
 import os
 import shutil
+import tempfile
 
 from scripts.housekeeping.datadir import get_save_dir
 from scripts.game_structure.game_essentials import Game
+from scripts.cat.cats import Cat
+from scripts.cat_relations.relationship import Relationship
+from scripts.game_structure.clan_storage import (
+    JsonClanStorage,
+    SqliteClanStorage,
+    SQLITE_FILE_NAME,
+    convert_clan_storage
+)
+from scripts.game_structure.event_archive import EventArchive
+from scripts.event_class import Single_Event
+from scripts.cat.history import History
+from scripts.cat.history_store import HistoryStore
 
 os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
@@ -134,3 +147,196 @@ class MigrateSave(unittest.TestCase):
 
                 self.assertEqual(curclan, clan_name, "Save " + str(i) + " not migrated correctly")
                 self.assertNotIn('clanlist.txt', file_list, "Save " + str(i) + " not migrated correctly")
+
+
+class ClanStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.clan_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.clan_dir)
+
+    def test_convert_both_ways(self):
+        # given
+        json_storage = JsonClanStorage(self.clan_dir, Game.safe_save)
+        json_storage.write("relationships", {"1": [{"cat_to_id": "2"}], "2": [{"cat_to_id": "1"}]})
+        json_storage.write("conditions", {"1": {"injuries": {}}})
+
+        # when
+        sqlite_storage = convert_clan_storage(json_storage, SqliteClanStorage(self.clan_dir))
+
+        # then
+        self.assertFalse(os.path.exists(self.clan_dir + "/relationships"))
+        self.assertTrue(os.path.exists(self.clan_dir + "/" + SQLITE_FILE_NAME))
+        self.assertEqual(sqlite_storage.read("relationships", "2"), [{"cat_to_id": "1"}])
+        self.assertEqual(sqlite_storage.read("conditions", "1"), {"injuries": {}})
+        self.assertIsNone(sqlite_storage.read("history", "1"))
+
+        # when
+        json_storage = convert_clan_storage(sqlite_storage, JsonClanStorage(self.clan_dir, Game.safe_save))
+
+        # then
+        self.assertFalse(os.path.exists(self.clan_dir + "/" + SQLITE_FILE_NAME))
+        self.assertEqual(json_storage.read_all("relationships"),
+                         {"1": [{"cat_to_id": "2"}], "2": [{"cat_to_id": "1"}]})
+
+    def test_single_file_writes_changed_rows(self):
+        # given
+        storage = SqliteClanStorage(self.clan_dir)
+        with storage.batch():
+            storage.write("relationships", {"1": [], "2": [], "3": []})
+            storage.write("history", {"1": {"died_by": []}})
+
+        # when
+        storage.write("relationships", {"1": [], "2": [{"cat_to_id": "1"}]}, replace=True)
+        storage.write("conditions", {}, delete_ids=["1"])
+
+        # then
+        file_stamp = os.stat(storage.path).st_mtime_ns
+        storage.write("relationships", {"1": [], "2": [{"cat_to_id": "1"}]}, replace=True)
+        self.assertEqual(os.stat(storage.path).st_mtime_ns, file_stamp)
+        self.assertEqual(SqliteClanStorage(self.clan_dir).read_all("relationships"),
+                         {"1": [], "2": [{"cat_to_id": "1"}]})
+        self.assertEqual(SqliteClanStorage(self.clan_dir).read("history", "1"), {"died_by": []})
+
+    def test_safe_save_skips_unchanged_file(self):
+        # given
+        path = self.clan_dir + "/herbs.json"
+        Game.safe_save(path, {"moss": 2})
+        file_stamp = os.stat(path).st_mtime_ns
+
+        # when
+        Game.safe_save(path, {"moss": 2})
+
+        # then
+        self.assertEqual(os.stat(path).st_mtime_ns, file_stamp)
+
+        # when
+        os.remove(path)
+        Game.safe_save(path, {"moss": 2})
+
+        # then
+        with open(path, 'r') as read_file:
+            self.assertIn("moss", read_file.read())
+
+    def test_prefetched_rows_are_read(self):
+        # given
+        storage = JsonClanStorage(self.clan_dir, Game.safe_save)
+        storage.write("relationships", {"1": [{"cat_to_id": "2"}], "2": [{"cat_to_id": "1"}]})
+
+        # when
+        storage.prefetch("relationships", ["1", "2", "3"])
+
+        # then
+        self.assertEqual(storage.read("relationships", "1"), [{"cat_to_id": "2"}])
+        self.assertIsNone(storage.read("relationships", "3"))
+
+        # when
+        storage.write("relationships", {"2": []})
+
+        # then
+        self.assertEqual(storage.read("relationships", "2"), [])
+
+
+class DirtyTracking(unittest.TestCase):
+
+    def test_relationship_change_marks_cat(self):
+        # given
+        cat1 = Cat()
+        cat2 = Cat()
+        relationship = Relationship(cat1, cat2, platonic_like=10)
+        cat1.relationships_changed = False
+
+        # when
+        relationship.platonic_like = 10
+        relationship.mates = False
+
+        # then
+        self.assertFalse(cat1.relationships_changed)
+
+        # when
+        relationship.platonic_like += 5
+
+        # then
+        self.assertTrue(cat1.relationships_changed)
+
+        # when
+        cat1.relationships_changed = False
+        relationship.add_log("test")
+
+        # then
+        self.assertTrue(cat1.relationships_changed)
+
+
+class HistoryStoreTest(unittest.TestCase):
+
+    def test_only_unchanged_histories_are_evicted(self):
+        # given
+        store = HistoryStore()
+        changed_cat = Cat()
+        unchanged_cat = Cat()
+        for cat in (changed_cat, unchanged_cat):
+            cat.history = History()
+            store.saved(cat, cat.history.make_dict(cat))
+
+        # when
+        changed_cat.history.died_by.append({"involved": None, "text": "died", "moon": 3})
+
+        # then
+        self.assertTrue(store.is_changed(changed_cat, changed_cat.history.make_dict(changed_cat)))
+        self.assertFalse(store.is_changed(unchanged_cat, unchanged_cat.history.make_dict(unchanged_cat)))
+
+        # when
+        store.evict({changed_cat.ID: changed_cat, unchanged_cat.ID: unchanged_cat}, 0)
+
+        # then
+        self.assertIsNotNone(changed_cat.history)
+        self.assertIsNone(unchanged_cat.history)
+        self.assertEqual(len(store), 1)
+
+
+class EventArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clan_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.clan_dir)
+
+    def test_find_saved_events(self):
+        # given
+        archive = EventArchive(self.clan_dir, Game.safe_save, moons_per_segment=2)
+        archive.add_moon(1, [Single_Event("first", "health", ["1"]), Single_Event("second", "misc", ["2"])])
+        archive.add_moon(2, [Single_Event("third", "misc", ["1"])])
+        archive.add_moon(3, [Single_Event("fourth", "health", ["2"])])
+
+        # when
+        archive.save()
+        archive = EventArchive(self.clan_dir, Game.safe_save)
+
+        # then
+        self.assertEqual(archive.get_moons(), [1, 2, 3])
+        self.assertEqual([event.text for event in archive.get_moon(1)], ["first", "second"])
+        self.assertEqual([(moon, event.text) for moon, event in archive.find(cat_id="1")],
+                         [(2, "third"), (1, "first")])
+        self.assertEqual([(moon, event.text) for moon, event in archive.find(event_type="health", limit=1)],
+                         [(3, "fourth")])
+        self.assertEqual([event.text for _, event in archive.find(event_type="misc", before_moon=2)], ["second"])
+
+    def test_moons_of_reloaded_save_are_replaced(self):
+        # given
+        archive = EventArchive(self.clan_dir, Game.safe_save, moons_per_segment=2)
+        for moon in (1, 2, 3):
+            archive.add_moon(moon, [Single_Event(f"old {moon}", "misc", ["1"])])
+        archive.save()
+
+        # when
+        archive.add_moon(2, [Single_Event("new 2", "health")])
+        archive.save()
+
+        # then
+        archive = EventArchive(self.clan_dir, Game.safe_save)
+        self.assertEqual(archive.get_moons(), [1, 2])
+        self.assertEqual([event.text for event in archive.get_moon(2)], ["new 2"])
+        self.assertEqual([moon for moon, _ in archive.find(cat_id="1")], [1])
@@ -0,0 +1,59 @@
+import os
+import unittest
+
+from scripts.cat.cats import Cat
+from scripts.text_template import TextTemplate, compile_text
+from scripts.utility import process_text
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class TestTextTemplate(unittest.TestCase):
+    def setUp(self):
+        self.plural = Cat.default_pronouns[0]
+        self.singular = Cat.default_pronouns[1]
+
+    def test_names_and_pronouns(self):
+        # given
+        cat_dict = {"m_c": ("Firepaw", self.plural), "r_c": ("Graypaw", self.singular)}
+        text = "m_c and r_c hunt. {PRONOUN/m_c/subject/CAP} {VERB/m_c/catch/catches} a mouse, " \
+               "r_c {VERB/r_c/catch/catches} nothing."
+
+        # when
+        result = process_text(text, cat_dict)
+
+        # then
+        self.assertEqual("Firepaw and Graypaw hunt. They catch a mouse, Graypaw catches nothing.", result)
+
+    def test_template_is_reused(self):
+        # given
+        text = "{PRONOUN/m_c/subject/CAP} {VERB/m_c/purr/purrs}."
+
+        # when
+        template = compile_text(text)
+
+        # then
+        self.assertIs(template, compile_text(text))
+        self.assertEqual("They purr.", template.render({"m_c": ("Firepaw", self.plural)}))
+        self.assertEqual("p_l purrs.", TextTemplate("p_l {VERB/m_c/purr/purrs}.").render(
+            {"m_c": ("Firepaw", self.singular)}))
+
+    def test_names_next_to_braces_and_insert(self):
+        # given
+        cat_dict = {"m_c": ("Firepaw", self.plural)}
+
+        # when
+        result = process_text("{insert} m_c{insert} {m_c", cat_dict)
+
+        # then
+        self.assertEqual("{insert} Firepaw{insert} {m_c", result)
+
+    def test_malformed_tags_are_found(self):
+        # when
+        template = TextTemplate("m_c {PRONUN/m_c/subject} {PRONOUN/m_c/object}")
+
+        # then
+        self.assertEqual(["PRONUN/m_c/subject"], template.malformed_tags)
+        with self.assertRaises(KeyError):
+            template.render({"m_c": ("Firepaw", self.plural)}, raise_exception=True)
@@ -144,3 +144,35 @@ class TestFamilyThoughts(unittest.TestCase):
         # when
 
         # then
+
+
+class TestThoughtPool(unittest.TestCase):
+
+    def test_pool_fits_clan(self):
+        # given
+        cat = Cat(status="warrior", moons=40)
+        files = Thoughts.get_thought_files(cat)
+
+        # when
+        pool = Thoughts.get_thought_pool(files, "Forest", "Newleaf", "camp2")
+
+        # then
+        self.assertTrue(pool)
+        self.assertIs(pool, Thoughts.get_thought_pool(files, "Forest", "Newleaf", "camp2"))
+        for thought in pool:
+            self.assertTrue(Thoughts.thought_fulfill_clan_constraints(thought, "Forest", "Newleaf", "camp2"))
+
+    def test_pooled_thoughts_match_all_constraints(self):
+        # given
+        main_cat = Cat(status="warrior", moons=40)
+        other_cat = Cat(status="warrior", moons=40)
+
+        # when
+        thoughts = Thoughts.load_thoughts(main_cat, other_cat, "expanded", "Forest", "Newleaf", "camp2")
+
+        # then
+        all_thoughts = []
+        for path in Thoughts.get_thought_files(main_cat):
+            all_thoughts.extend(Thoughts._load_file(path))
+        self.assertEqual(thoughts, Thoughts.create_thoughts(all_thoughts, main_cat, other_cat, "expanded",
+                                                             "Forest", "Newleaf", "camp2"))
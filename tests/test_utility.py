@@ -2,12 +2,15 @@ import unittest
 
 from scripts.cat.cats import Cat
 from scripts.cat_relations.relationship import Relationship
+from scripts.cat_relations.relationship_matrix import RelationshipMatrix
 from scripts.utility import (
     get_highest_romantic_relation,
     get_personality_compatibility,
     get_amount_of_cats_with_relation_value_towards,
-    get_alive_clan_queens
+    get_alive_clan_queens,
+    shorten_text_to_fit
 )
+from scripts.game_structure.game_essentials import game
 
 import os
 os.environ["SDL_VIDEODRIVER"] = "dummy"
@@ -131,6 +134,38 @@ class TestCountRelation(unittest.TestCase):
         self.assertEqual(relation_dict["jealousy"], 2)
         self.assertEqual(relation_dict["trust"], 0)
 
+    @unittest.skipUnless(RelationshipMatrix.available(), "numpy is not installed")
+    def test_2_cats_jealousy_matrix_store(self):
+        # given
+        Relationship.matrix_store = RelationshipMatrix(capacity=2)
+        cat1 = Cat()
+        cat2 = Cat()
+        cat3 = Cat()
+        cat4 = Cat()
+
+        relation_1_2 = Relationship(cat_from=cat1, cat_to=cat2)
+        relation_3_2 = Relationship(cat_from=cat3, cat_to=cat2)
+        relation_4_2 = Relationship(cat_from=cat4, cat_to=cat2, mates=True)
+        cat1.relationships[cat2.ID] = relation_1_2
+        cat3.relationships[cat2.ID] = relation_3_2
+        cat4.relationships[cat2.ID] = relation_4_2
+        Relationship.matrix_store = None
+
+        # when
+        relation_1_2.jealousy += 20
+        relation_3_2.jealousy += 120
+        relation_4_2.jealousy += 10
+
+        # then
+        relation_dict = get_amount_of_cats_with_relation_value_towards(cat2, 20, [cat1, cat2, cat3, cat4])
+
+        self.assertEqual(relation_3_2.jealousy, 100)
+        self.assertTrue(relation_4_2.mates)
+        self.assertFalse(relation_1_2.mates)
+        self.assertEqual(relation_dict["romantic_love"], 0)
+        self.assertEqual(relation_dict["jealousy"], 2)
+        self.assertEqual(relation_dict["trust"], 0)
+
 
 class TestHighestRomance(unittest.TestCase):
     def test_exclude_mate(self):
@@ -337,3 +372,32 @@ class TestGetQueens(unittest.TestCase):
         # then
         living_cats = [self.test_cat1, self.test_cat2, self.test_cat3, self.test_cat4, self.test_cat5, self.test_cat6]
         self.assertEqual([self.test_cat2.ID], list(get_alive_clan_queens(living_cats)[0].keys()))
+
+
+class TestShortenTextToFit(unittest.TestCase):
+    def setUp(self):
+        import pygame
+        pygame.font.init()
+        game.settings['fullscreen'] = False
+
+    def test_long_name_is_shortened(self):
+        # when
+        short_name = shorten_text_to_fit("Longwhiskerfeatherstripe", 150, 30)
+
+        # then
+        self.assertTrue(short_name.endswith("..."))
+        self.assertLess(len(short_name), len("Longwhiskerfeatherstripe") + 3)
+        self.assertEqual("Fire", shorten_text_to_fit("Fire", 150, 30))
+
+    def test_shortened_name_is_kept(self):
+        # given
+        short_name = shorten_text_to_fit("Longwhiskerfeatherstripe", 120, 30)
+
+        # when
+        game.settings['fullscreen'] = True
+        fullscreen_name = shorten_text_to_fit("Longwhiskerfeatherstripe", 120, 30)
+        game.settings['fullscreen'] = False
+
+        # then
+        self.assertEqual(short_name, shorten_text_to_fit("Longwhiskerfeatherstripe", 120, 30))
+        self.assertEqual(fullscreen_name, shorten_text_to_fit("Longwhiskerfeatherstripe", 240, 60))